@@ -29,10 +29,14 @@ Key features
 - Balance check — "Check SMS Balance" button in Settings fetches the
   current AT account balance without leaving Odoo.
 - Delivery webhook — ``POST /sms/africastalking/delivery`` with optional
-  Bearer-token auth; updates ``delivery_status`` on receipt.
+  Bearer-token auth; callbacks are staged and applied to
+  ``delivery_status`` in bulk by a cron every minute.
 - SMS Templates — ``sms.at.template`` with ``{{first_name}}``,
   ``{{last_name}}``, ``{{email}}``, ``{{phone}}`` merge tokens linked to
   mailing lists.
+- SMS Campaigns — sending a template creates an ``sms.at.campaign`` that
+  renders and queues messages in the background, with progress counters
+  and pause / resume / cancel.
 
 Multi-tenant support
 ---------------------
@@ -63,6 +67,7 @@ in the \*456# promotional inbox.  Register a Sender ID in your AT dashboard
         "views/res_config_settings_views.xml",
         "views/sms_sms_views.xml",
         "views/sms_at_template_views.xml",
+        "views/sms_at_campaign_views.xml",
         "views/sms_at_analytics_views.xml",
         "views/menus.xml",
     ],
@@ -0,0 +1,16 @@
+# benchmarks/__init__.py
+
+"""
+benchmarks
+==========
+
+Load-testing tools for the Africa's Talking dispatch path.
+
+* :mod:`.at_standin`     - local stand-in for the AT messaging / user API.
+* :mod:`.bench_client`   - drives the AT clients against the stand-in
+  (no Odoo needed).
+* :mod:`.bench_dispatch` - drives ``sms.sms._at_dispatch_all`` from an Odoo
+  shell and reports DB query counts.
+
+Not imported by the add-on itself.
+"""
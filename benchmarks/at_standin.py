@@ -0,0 +1,390 @@
+# benchmarks/at_standin.py
+
+"""
+benchmarks/at_standin.py
+=========================
+
+Local stand-in for the Africa's Talking ``version1/messaging`` and
+``version1/user`` endpoints, for load tests that must not hit the real API.
+
+Responses use the same envelopes as AT (``SMSMessageData`` / ``UserData``),
+so :class:`~services.AfricasTalkingClient` parses them unchanged.  Point a
+client at it with ``base_url=server.url``, or point the whole add-on at it
+by setting the ``sms_africastalking.api_base_url`` system parameter.
+
+Behaviour is controlled by :class:`StandInConfig`:
+
+* fixed latency plus uniform jitter per request;
+* a random share of requests answered with HTTP 500;
+* periodic bursts of consecutive 5xx responses;
+* a weighted mix of per-recipient statuses (``Success``,
+  ``InvalidPhoneNumber``, ...).
+
+Run standalone from the add-on root::
+
+    python -m benchmarks.at_standin --port 8765 --latency-ms 150 \\
+        --status Success=0.98 --status InvalidPhoneNumber=0.02
+
+Pure standard library — no Odoo imports.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import threading
+import time
+import urllib.parse
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+#: AT per-recipient ``statusCode`` for each status the stand-in can return.
+RECIPIENT_STATUS_CODES: dict[str, int] = {
+    "Processed": 100,
+    "Success": 101,
+    "Queued": 102,
+    "RiskHold": 401,
+    "InvalidSenderId": 402,
+    "InvalidPhoneNumber": 403,
+    "UnsupportedNumberType": 404,
+    "InsufficientBalance": 405,
+    "UserInBlacklist": 406,
+    "CouldNotRoute": 407,
+    "InternalServerError": 500,
+    "GatewayError": 501,
+    "RejectedByGateway": 502,
+}
+
+# Statuses that AT bills for.
+_BILLED_STATUSES = frozenset({"Processed", "Success", "Queued"})
+
+
+@dataclass
+class StandInConfig:
+    """
+    Behaviour of a :class:`StandInServer`.
+
+    Attributes
+    ----------
+    latency_ms:
+        Base service time of every request.
+    jitter_ms:
+        Uniform jitter added to (or subtracted from) *latency_ms*.
+    error_rate:
+        Share of messaging requests, ``0.0`` - ``1.0``, answered with HTTP
+        500 at random.
+    burst_every, burst_length:
+        Every *burst_every* messaging requests, the next *burst_length* are
+        answered with *burst_status*.  ``0`` disables bursts.
+    burst_status:
+        HTTP status returned during a burst.
+    recipient_statuses:
+        Relative weights of the per-recipient statuses returned on success;
+        keys must be in :data:`RECIPIENT_STATUS_CODES`.
+    cost:
+        Cost reported for each billed recipient.
+    balance:
+        Balance returned by ``version1/user``.
+    api_key:
+        When set, any other ``ApiKey`` header is answered with HTTP 401.
+    seed:
+        Seed of the random generator behind errors and statuses.
+    """
+
+    latency_ms: float = 150.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    burst_every: int = 0
+    burst_length: int = 0
+    burst_status: int = 503
+    recipient_statuses: dict[str, float] = field(
+        default_factory=lambda: {"Success": 1.0}
+    )
+    cost: str = "KES 0.8000"
+    balance: str = "KES 1000000.0000"
+    api_key: str = ""
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        unknown = set(self.recipient_statuses) - set(RECIPIENT_STATUS_CODES)
+        if unknown:
+            raise ValueError(f"Unknown recipient status(es): {sorted(unknown)}")
+        if not any(weight > 0 for weight in self.recipient_statuses.values()):
+            raise ValueError("recipient_statuses needs at least one positive weight.")
+
+
+@dataclass
+class StandInStats:
+    """Counters of what a :class:`StandInServer` has answered."""
+
+    requests: int = 0
+    recipients: int = 0
+    server_errors: int = 0
+    balance_requests: int = 0
+
+
+class _StandInHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Benchmarks open many connections at once; the default backlog of 5
+    # would serialise them in the kernel and skew the latency figures.
+    request_queue_size = 1024
+
+    def __init__(self, address, config: StandInConfig) -> None:
+        super().__init__(address, _StandInHandler)
+        self.config = config
+        self.stats = StandInStats()
+        self.lock = threading.Lock()
+        self.rng = random.Random(config.seed)
+        self._statuses = list(config.recipient_statuses)
+        self._weights = [config.recipient_statuses[s] for s in self._statuses]
+
+    def next_messaging_request(self, recipients: int) -> tuple[int, int, list[str]]:
+        """Account one messaging call; return ``(seq, http_status, statuses)``."""
+        config = self.config
+        with self.lock:
+            self.stats.requests += 1
+            seq = self.stats.requests
+            in_burst = (
+                config.burst_every > 0
+                and (seq - 1) % config.burst_every < config.burst_length
+            )
+            if in_burst:
+                http_status = config.burst_status
+            elif config.error_rate and self.rng.random() < config.error_rate:
+                http_status = 500
+            else:
+                http_status = 201
+            if http_status >= 500:
+                self.stats.server_errors += 1
+                return seq, http_status, []
+            self.stats.recipients += recipients
+            statuses = self.rng.choices(self._statuses, self._weights, k=recipients)
+        return seq, http_status, statuses
+
+    def service_time(self) -> float:
+        config = self.config
+        jitter = self.rng.uniform(-config.jitter_ms, config.jitter_ms) if config.jitter_ms else 0.0
+        return max(config.latency_ms + jitter, 0.0) / 1000.0
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: _StandInHTTPServer
+
+    def log_message(self, format, *args) -> None:  # noqa: A002 - stdlib signature
+        pass
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        form = urllib.parse.parse_qs(self.rfile.read(length).decode("utf-8"))
+        path = urllib.parse.urlsplit(self.path).path.rstrip("/")
+        if path != "/version1/messaging":
+            self._reply(404, "Not Found")
+            return
+        if not self._authorised():
+            return
+
+        username = (form.get("username") or [""])[0]
+        message = (form.get("message") or [""])[0]
+        numbers = [n for n in (form.get("to") or [""])[0].split(",") if n]
+        if not username or not message or not numbers:
+            self._reply(400, "Missing required parameter: username, to or message.")
+            return
+
+        seq, http_status, statuses = self.server.next_messaging_request(len(numbers))
+        time.sleep(self.server.service_time())
+        if http_status >= 500:
+            self._reply(http_status, "The service is temporarily unavailable.")
+            return
+
+        cost = self.server.config.cost
+        recipients = []
+        billed = 0
+        for index, (number, status) in enumerate(zip(numbers, statuses)):
+            is_billed = status in _BILLED_STATUSES
+            billed += is_billed
+            recipients.append(
+                {
+                    "number": number,
+                    "status": status,
+                    "statusCode": RECIPIENT_STATUS_CODES[status],
+                    "messageId": f"ATXid_standin_{seq:08d}_{index:04d}" if is_billed else "",
+                    "cost": cost if is_billed else "0",
+                    "messageParts": 1,
+                }
+            )
+        self._reply(
+            http_status,
+            {
+                "SMSMessageData": {
+                    "Message": f"Sent to {billed}/{len(numbers)}",
+                    "Recipients": recipients,
+                }
+            },
+        )
+
+    def do_GET(self) -> None:
+        parts = urllib.parse.urlsplit(self.path)
+        if parts.path.rstrip("/") != "/version1/user":
+            self._reply(404, "Not Found")
+            return
+        if not self._authorised():
+            return
+        if not urllib.parse.parse_qs(parts.query).get("username"):
+            self._reply(400, "Missing required parameter: username.")
+            return
+        with self.server.lock:
+            self.server.stats.balance_requests += 1
+        time.sleep(self.server.service_time())
+        self._reply(200, {"UserData": {"balance": self.server.config.balance}})
+
+    def _authorised(self) -> bool:
+        expected = self.server.config.api_key
+        if expected and self.headers.get("ApiKey") != expected:
+            self._reply(401, "The supplied authentication is invalid.")
+            return False
+        return True
+
+    def _reply(self, status: int, payload) -> None:
+        if isinstance(payload, str):
+            body, content_type = payload.encode("utf-8"), "text/plain"
+        else:
+            body, content_type = json.dumps(payload).encode("utf-8"), "application/json"
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class StandInServer:
+    """
+    Threaded stand-in AT server, usable as a context manager::
+
+        with StandInServer(StandInConfig(latency_ms=100)) as server:
+            client = AfricasTalkingClient("bench", "key", base_url=server.url)
+
+    Parameters
+    ----------
+    config:
+        Server behaviour; defaults to :class:`StandInConfig` defaults.
+    host, port:
+        Listening address; port ``0`` picks a free port.
+    """
+
+    def __init__(
+        self,
+        config: StandInConfig | None = None,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self._httpd = _StandInHTTPServer((host, port), config or StandInConfig())
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        """Base URL to pass as the client's ``base_url``."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def config(self) -> StandInConfig:
+        return self._httpd.config
+
+    @property
+    def stats(self) -> StandInStats:
+        return self._httpd.stats
+
+    def start(self) -> "StandInServer":
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="at_standin", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+# ---------------------------------------------------------------------------
+#  Command line
+# ---------------------------------------------------------------------------
+
+
+def _parse_status_weights(values: list[str]) -> dict[str, float]:
+    weights: dict[str, float] = {}
+    for value in values:
+        name, _, weight = value.partition("=")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+def add_config_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the :class:`StandInConfig` options to *parser*."""
+    group = parser.add_argument_group("stand-in server")
+    group.add_argument("--latency-ms", type=float, default=150.0)
+    group.add_argument("--jitter-ms", type=float, default=0.0)
+    group.add_argument("--error-rate", type=float, default=0.0,
+                       help="share of calls answered with HTTP 500")
+    group.add_argument("--burst-every", type=int, default=0,
+                       help="start a 5xx burst every N calls (0 = never)")
+    group.add_argument("--burst-length", type=int, default=0,
+                       help="consecutive 5xx responses per burst")
+    group.add_argument("--burst-status", type=int, default=503)
+    group.add_argument("--status", action="append", default=[], metavar="NAME=WEIGHT",
+                       help="per-recipient status mix, e.g. Success=0.98 (repeatable)")
+    group.add_argument("--seed", type=int, default=0)
+
+
+def config_from_args(args: argparse.Namespace) -> StandInConfig:
+    """Build a :class:`StandInConfig` from :func:`add_config_arguments` options."""
+    return StandInConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        burst_every=args.burst_every,
+        burst_length=args.burst_length,
+        burst_status=args.burst_status,
+        recipient_statuses=_parse_status_weights(args.status) or {"Success": 1.0},
+        seed=args.seed,
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_config_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server = StandInServer(config_from_args(args), host=args.host, port=args.port)
+    print(f"AT stand-in listening on {server.url}  (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stats = server.stats
+        print(
+            f"\n{stats.requests} messaging call(s), {stats.recipients} recipient(s), "
+            f"{stats.server_errors} 5xx, {stats.balance_requests} balance call(s)."
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+# benchmarks/bench_client.py
+
+"""
+benchmarks/bench_client.py
+===========================
+
+Throughput benchmark of the AT clients against :mod:`.at_standin`.
+
+Sends 1k / 10k / 100k recipients in ``AT_BATCH_LIMIT`` chunks with the
+threaded :class:`~services.AfricasTalkingClient` and/or the
+:class:`~services.AsyncAfricasTalkingClient`, and reports messages/sec and
+p50 / p99 chunk latency.  No Odoo needed; run from the add-on root::
+
+    python -m benchmarks.bench_client
+    python -m benchmarks.bench_client --sizes 10000 --engine asyncio \\
+        --max-in-flight 16 --latency-ms 300 --burst-every 20 --burst-length 2
+
+Chunks are dispatched the same way ``sms.sms._at_dispatch_all`` does it:
+a thread pool capped at the connection-pool size, or ``send_many`` on an
+event loop.  For the full ORM path, see :mod:`.bench_dispatch`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from ..services import (
+        AT_BATCH_LIMIT,
+        AfricasTalkingClient,
+        AsyncAfricasTalkingClient,
+        ATError,
+        ConnectionPool,
+    )
+    from ..services.http_pool import DEFAULT_MAX_PER_HOST
+except ImportError:  # run from the add-on root: python -m benchmarks.bench_client
+    from services import (
+        AT_BATCH_LIMIT,
+        AfricasTalkingClient,
+        AsyncAfricasTalkingClient,
+        ATError,
+        ConnectionPool,
+    )
+    from services.http_pool import DEFAULT_MAX_PER_HOST
+
+from .at_standin import StandInServer, add_config_arguments, config_from_args
+from .report import BenchResult, format_results, instrument_send
+
+DEFAULT_SIZES: tuple[int, ...] = (1_000, 10_000, 100_000)
+
+_USERNAME = "bench"
+_API_KEY = "bench-key"
+
+
+def make_numbers(count: int) -> list[str]:
+    """*count* distinct, valid Kenyan E.164 numbers."""
+    return [f"+2547{i:08d}" for i in range(count)]
+
+
+def make_chunks(numbers: list[str], message: str) -> list[tuple[list[str], str]]:
+    return [
+        (numbers[i : i + AT_BATCH_LIMIT], message)
+        for i in range(0, len(numbers), AT_BATCH_LIMIT)
+    ]
+
+
+def bench_threads(base_url: str, recipients: int, max_in_flight: int) -> BenchResult:
+    """Send *recipients* numbers with the threaded client."""
+    workers = max(min(max_in_flight, DEFAULT_MAX_PER_HOST), 1)
+    client = AfricasTalkingClient(
+        _USERNAME,
+        _API_KEY,
+        base_url=base_url,
+        pool=ConnectionPool(max_per_host=workers),
+    )
+    latencies: list[float] = []
+    instrument_send(client, latencies)
+    chunks = make_chunks(make_numbers(recipients), "Benchmark message")
+
+    def _one(chunk: tuple[list[str], str]):
+        try:
+            return client.send(*chunk)
+        except ATError as exc:
+            return exc
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        outcomes = list(executor.map(_one, chunks))
+    elapsed = time.perf_counter() - start
+
+    return BenchResult(
+        label=f"threads x{workers}",
+        recipients=recipients,
+        elapsed=elapsed,
+        chunk_latencies=latencies,
+        failed_chunks=sum(isinstance(o, ATError) for o in outcomes),
+    )
+
+
+def bench_asyncio(base_url: str, recipients: int, max_in_flight: int) -> BenchResult:
+    """Send *recipients* numbers with the asyncio client."""
+    chunks = make_chunks(make_numbers(recipients), "Benchmark message")
+    latencies: list[float] = []
+
+    async def _run():
+        async with AsyncAfricasTalkingClient(_USERNAME, _API_KEY, base_url=base_url) as client:
+            instrument_send(client, latencies)
+            return await client.send_many(chunks, max_in_flight=max_in_flight)
+
+    start = time.perf_counter()
+    outcomes = asyncio.run(_run())
+    elapsed = time.perf_counter() - start
+
+    return BenchResult(
+        label=f"asyncio x{max_in_flight}",
+        recipients=recipients,
+        elapsed=elapsed,
+        chunk_latencies=latencies,
+        failed_chunks=sum(isinstance(o, ATError) for o in outcomes),
+    )
+
+
+_ENGINES = {"threads": bench_threads, "asyncio": bench_asyncio}
+
+
+def main(argv: list[str] | None = None) -> list[BenchResult]:
+    parser = argparse.ArgumentParser(description="AT client throughput benchmark.")
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(s) for s in DEFAULT_SIZES),
+        help="comma-separated recipient counts (default: %(default)s)",
+    )
+    parser.add_argument("--engine", choices=[*_ENGINES, "both"], default="both")
+    parser.add_argument("--max-in-flight", type=int, default=4)
+    parser.add_argument("--verbose", action="store_true", help="show client logging")
+    add_config_arguments(parser)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.CRITICAL)
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    engines = list(_ENGINES) if args.engine == "both" else [args.engine]
+
+    results: list[BenchResult] = []
+    with StandInServer(config_from_args(args)) as server:
+        for size in sizes:
+            for engine in engines:
+                result = _ENGINES[engine](server.url, size, args.max_in_flight)
+                result.label = f"{result.label} / {size}"
+                results.append(result)
+        stats = server.stats
+
+    print(format_results(results))
+    print(
+        f"\nstand-in: {stats.requests} call(s), {stats.recipients} recipient(s), "
+        f"{stats.server_errors} 5xx"
+    )
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+# benchmarks/bench_dispatch.py
+
+"""
+benchmarks/bench_dispatch.py
+=============================
+
+End-to-end benchmark of ``sms.sms._at_dispatch_all`` against
+:mod:`.at_standin`, including the claim query and every ORM write.
+
+Reports messages/sec, p50 / p99 chunk latency and the number of SQL queries
+issued per run.  Needs a database with this add-on installed - use a scratch
+database: any records already queued there are dispatched (to the stand-in)
+as part of the run.  Everything is rolled back afterwards::
+
+    $ odoo-bin shell -d scratch_db --no-http
+    >>> from odoo.addons.sms_africastalking_provider.benchmarks import bench_dispatch
+    >>> bench_dispatch.run(env)
+    >>> bench_dispatch.run(env, sizes=(10_000,), engine="asyncio", max_in_flight=16)
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+
+from odoo.tools import SQL
+
+from ..services import (
+    AT_BATCH_LIMIT,
+    AT_RETRY_MAX_ATTEMPTS,
+    AfricasTalkingClient,
+    AsyncAfricasTalkingClient,
+)
+from .at_standin import StandInConfig, StandInServer
+from .report import BenchResult, format_results, instrument_send
+
+DEFAULT_SIZES: tuple[int, ...] = (1_000, 10_000, 100_000)
+
+# Per-record INFO logging would dominate the timings.
+_QUIET_LOGGERS = ("odoo.addons.sms_africastalking_provider",)
+
+
+def run(
+    env,
+    sizes: tuple[int, ...] = DEFAULT_SIZES,
+    *,
+    engine: str = "threads",
+    max_in_flight: int = 4,
+    distinct_bodies: int = 1,
+    config: StandInConfig | None = None,
+) -> list[BenchResult]:
+    """
+    Queue *size* records for each of *sizes* and dispatch them batch by
+    batch, as the queue cron does.
+
+    Parameters
+    ----------
+    env:
+        Odoo environment (``env`` in ``odoo-bin shell``).
+    engine:
+        ``"threads"`` or ``"asyncio"``, as the ``dispatch_engine`` setting.
+    max_in_flight:
+        Concurrent AT calls per batch.
+    distinct_bodies:
+        Number of different message bodies, to measure personalised sends.
+    config:
+        Stand-in server behaviour.
+
+    Returns
+    -------
+    list[BenchResult]
+        One result per size; the table is also printed.
+    """
+    results: list[BenchResult] = []
+    levels = {name: logging.getLogger(name).level for name in _QUIET_LOGGERS}
+    for name in _QUIET_LOGGERS:
+        logging.getLogger(name).setLevel(logging.WARNING)
+    try:
+        with StandInServer(config) as server:
+            for size in sizes:
+                results.append(
+                    _run_one(env, server, size, engine, max_in_flight, distinct_bodies)
+                )
+    finally:
+        for name, level in levels.items():
+            logging.getLogger(name).setLevel(level)
+
+    print(format_results(results))
+    return results
+
+
+def _run_one(
+    env,
+    server: StandInServer,
+    size: int,
+    engine: str,
+    max_in_flight: int,
+    distinct_bodies: int,
+) -> BenchResult:
+    SmsSms = env["sms.sms"]
+    cr = env.cr
+    cr.execute(SQL("SAVEPOINT sms_at_bench"))
+    try:
+        SmsSms.create(
+            [
+                {
+                    "number": f"+2547{i:08d}",
+                    "body": f"Benchmark message {i % max(distinct_bodies, 1)}",
+                    "state": "queued",
+                }
+                for i in range(size)
+            ]
+        )
+        env.flush_all()
+
+        client_class = AsyncAfricasTalkingClient if engine == "asyncio" else AfricasTalkingClient
+        client = client_class("bench", "bench-key", base_url=server.url)
+        latencies: list[float] = []
+        instrument_send(client, latencies)
+
+        dispatched = 0
+        errors_before = server.stats.server_errors
+        queries_before = cr.sql_log_count
+        start = time.perf_counter()
+        while True:
+            batch = SmsSms._at_claim_queued(AT_BATCH_LIMIT)
+            if not batch:
+                break
+            SmsSms._at_dispatch_all(
+                batch,
+                client,
+                max_in_flight=max_in_flight,
+                max_attempts=AT_RETRY_MAX_ATTEMPTS,
+            )
+            env.flush_all()
+            dispatched += len(batch)
+        elapsed = time.perf_counter() - start
+        queries = cr.sql_log_count - queries_before
+        failed = server.stats.server_errors - errors_before
+    finally:
+        cr.execute(SQL("ROLLBACK TO SAVEPOINT sms_at_bench"))
+        env.invalidate_all()
+
+    return BenchResult(
+        label=f"{engine} x{max_in_flight} / {size}",
+        recipients=dispatched,
+        elapsed=elapsed,
+        chunk_latencies=latencies,
+        failed_chunks=failed,
+        queries=queries,
+    )
@@ -0,0 +1,158 @@
+# benchmarks/bench_encoding.py
+
+"""
+benchmarks/bench_encoding.py
+=============================
+
+Micro-benchmark of :func:`services.sms_encoding.analyse` and
+:func:`~services.sms_encoding.analyse_many`.
+
+Times the table-driven ``analyse`` against the original two-pass reference
+(kept here as :func:`reference_analyse`) on typical SMS bodies - plain
+ASCII, ASCII with extension characters, accented GSM-7 text and UCS-2 - and
+checks that both return identical :class:`~services.SmsStats` first.  Then
+measures a personalised campaign of ``--campaign`` bodies one ``analyse``
+call at a time versus a single ``analyse_many``.  No Odoo needed; run from
+the add-on root::
+
+    python -m benchmarks.bench_encoding
+    python -m benchmarks.bench_encoding --number 100000 --campaign 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import timeit
+
+try:
+    from ..services.sms_encoding import (
+        _GSM7_ALL,
+        _GSM7_EXTENDED,
+        SmsStats,
+        analyse,
+        analyse_many,
+    )
+except ImportError:  # run from the add-on root: python -m benchmarks.bench_encoding
+    from services.sms_encoding import (
+        _GSM7_ALL,
+        _GSM7_EXTENDED,
+        SmsStats,
+        analyse,
+        analyse_many,
+    )
+
+#: Representative bodies, keyed by label.
+SAMPLES: dict[str, str] = {
+    "ascii-short": "Hi Jane, your pledge of KES 5,000 was received. Thank you!",
+    "ascii-long": (
+        "Dear Jane, thank you for registering for the Strathmore Annual "
+        "Conference. Your ticket number is 48213. Doors open at 8:00am; "
+        "please bring your ID. Reply STOP to opt out."
+    ),
+    "ascii-extended": "Use code [SU-2024] for {10%} off ~ today only | details: su.ac/p^",
+    "gsm7-accented": "Félicitations Zoé! Ünser Café öffnet um 9 Uhr. Prix: 5€ ¿Qué tal? ñ",
+    "ucs2": "Habari Jane 🎉 karibu kwenye mkutano wetu — tuonane kesho!",
+}
+
+
+def reference_analyse(body: str) -> SmsStats:
+    """The original two-pass implementation, kept as the correctness oracle."""
+    if not body:
+        return SmsStats(encoding="gsm7", units=0, segments=0, chars=0)
+    chars = len(body)
+    if all(ch in _GSM7_ALL for ch in body):
+        units = sum(2 if ch in _GSM7_EXTENDED else 1 for ch in body)
+        segments = 1 if units <= 160 else -(-units // 153)
+        return SmsStats(encoding="gsm7", units=units, segments=segments, chars=chars)
+    segments = 1 if chars <= 70 else -(-chars // 67)
+    return SmsStats(encoding="ucs2", units=chars, segments=segments, chars=chars)
+
+
+def check_equivalence(rounds: int = 20_000, seed: int = 0) -> int:
+    """
+    Compare :func:`analyse` with :func:`reference_analyse`.
+
+    Covers every BMP codepoint alone and *rounds* random bodies mixing
+    ASCII, GSM-7 basic / extension and non-GSM characters.
+
+    Returns
+    -------
+    int
+        Number of bodies checked.
+
+    Raises
+    ------
+    AssertionError
+        On the first body where the two disagree.
+    """
+    bodies = [chr(cp) for cp in range(0x10000) if not 0xD800 <= cp <= 0xDFFF]
+    bodies += list(SAMPLES.values())
+    rng = random.Random(seed)
+    alphabet = sorted(_GSM7_ALL) + [chr(cp) for cp in range(128)] + list("ïœ—…🎉中ا")
+    for _ in range(rounds):
+        bodies.append("".join(rng.choices(alphabet, k=rng.randint(0, 400))))
+    for body in bodies:
+        expected, got = reference_analyse(body), analyse(body)
+        assert got == expected, f"{body!r}: {got} != {expected}"
+    batch = analyse_many(bodies)
+    for i, body in enumerate(bodies):
+        stats = analyse(body)
+        got = (batch.encodings[i], batch.units[i], batch.segments[i])
+        expected = (stats.encoding == "ucs2", stats.units, stats.segments)
+        assert got == expected, f"analyse_many {body!r}: {got} != {expected}"
+    return len(bodies)
+
+
+def make_campaign(count: int, distinct_names: int = 2_000) -> list[str]:
+    """*count* personalised bodies drawn from *distinct_names* first names."""
+    names = [f"Name{i}" for i in range(distinct_names)]
+    return [
+        f"Hi {names[i % distinct_names]}, your pledge to the SU Annual Fund "
+        f"is due on Friday. Pay via M-Pesa paybill 123456. Thank you!"
+        for i in range(count)
+    ]
+
+
+def main(argv: list[str] | None = None) -> dict[str, tuple[float, float]]:
+    parser = argparse.ArgumentParser(description="sms_encoding.analyse micro-benchmark.")
+    parser.add_argument("--number", type=int, default=20_000, help="Calls per sample.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repeats (best is kept).")
+    parser.add_argument(
+        "--campaign", type=int, default=100_000, help="Bodies in the batch benchmark."
+    )
+    args = parser.parse_args(argv)
+
+    checked = check_equivalence()
+    print(f"Identical SmsStats on {checked:,} bodies.\n")
+
+    results: dict[str, tuple[float, float]] = {}
+    header = f"{'sample':<16}{'chars':>7}{'enc':>6}{'reference µs':>15}{'analyse µs':>13}{'speed-up':>10}"
+    print(header)
+    print("-" * len(header))
+    for label, body in SAMPLES.items():
+        timings = []
+        for func in (reference_analyse, analyse):
+            best = min(timeit.repeat(lambda: func(body), number=args.number, repeat=args.repeat))
+            timings.append(best / args.number * 1e6)
+        ref_us, new_us = timings
+        results[label] = (ref_us, new_us)
+        print(
+            f"{label:<16}{len(body):>7}{analyse(body).encoding:>6}"
+            f"{ref_us:>15.2f}{new_us:>13.2f}{ref_us / new_us:>9.1f}x"
+        )
+
+    bodies = make_campaign(args.campaign)
+    per_body = min(timeit.repeat(lambda: [analyse(b) for b in bodies], number=1, repeat=3))
+    batched = min(timeit.repeat(lambda: analyse_many(bodies), number=1, repeat=3))
+    results["campaign"] = (per_body, batched)
+    print(
+        f"\nCampaign of {len(bodies):,} bodies: analyse() loop {per_body * 1e3:.1f} ms, "
+        f"analyse_many() {batched * 1e3:.1f} ms ({per_body / batched:.1f}x), "
+        f"{analyse_many(bodies).total_segments:,} segments."
+    )
+    return results
+
+
+if __name__ == "__main__":
+    main()
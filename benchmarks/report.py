@@ -0,0 +1,118 @@
+# benchmarks/report.py
+
+"""
+benchmarks/report.py
+=====================
+
+Timing helpers and result table shared by the benchmark scripts.
+
+Pure standard library — no Odoo imports.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import math
+import time
+from dataclasses import dataclass, field
+
+
+@dataclass
+class BenchResult:
+    """Outcome of one benchmark run."""
+
+    label: str
+    recipients: int
+    elapsed: float
+    chunk_latencies: list[float] = field(default_factory=list)
+    failed_chunks: int = 0
+    queries: int | None = None
+
+    @property
+    def chunks(self) -> int:
+        return len(self.chunk_latencies)
+
+    @property
+    def msgs_per_sec(self) -> float:
+        return self.recipients / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def p50(self) -> float:
+        return percentile(self.chunk_latencies, 50)
+
+    @property
+    def p99(self) -> float:
+        return percentile(self.chunk_latencies, 99)
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of *values* (``0.0`` when empty).
+
+    Examples
+    --------
+    >>> percentile([0.1, 0.2, 0.3, 0.4], 50)
+    0.2
+    >>> percentile([0.1, 0.2, 0.3, 0.4], 99)
+    0.4
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def instrument_send(client, latencies: list[float]) -> None:
+    """
+    Record the wall time of every ``client.send()`` call in *latencies*.
+
+    Works for both the threaded and the asyncio client; the wrapper is
+    installed on the instance only.
+    """
+    send = client.send
+
+    if asyncio.iscoroutinefunction(send):
+
+        @functools.wraps(send)
+        async def timed_send(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await send(*args, **kwargs)
+            finally:
+                latencies.append(time.perf_counter() - start)
+
+    else:
+
+        @functools.wraps(send)
+        def timed_send(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return send(*args, **kwargs)
+            finally:
+                latencies.append(time.perf_counter() - start)
+
+    client.send = timed_send
+
+
+def format_results(results: list[BenchResult]) -> str:
+    """Render *results* as a fixed-width table."""
+    show_queries = any(r.queries is not None for r in results)
+    header = (
+        f"{'run':<28} {'recipients':>10} {'chunks':>6} {'failed':>6} "
+        f"{'elapsed s':>9} {'msgs/s':>9} {'p50 ms':>8} {'p99 ms':>8}"
+    )
+    if show_queries:
+        header += f" {'queries':>8}"
+    lines = [header, "-" * len(header)]
+    for r in results:
+        line = (
+            f"{r.label:<28} {r.recipients:>10} {r.chunks:>6} {r.failed_chunks:>6} "
+            f"{r.elapsed:>9.2f} {r.msgs_per_sec:>9.0f} "
+            f"{r.p50 * 1000:>8.1f} {r.p99 * 1000:>8.1f}"
+        )
+        if show_queries:
+            line += f" {r.queries if r.queries is not None else '-':>8}"
+        lines.append(line)
+    return "\n".join(lines)
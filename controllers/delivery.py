@@ -27,8 +27,16 @@ request must include::
 Requests that fail this check receive **HTTP 401**.  AT will retry failed
 callbacks automatically.
 
-Fields written on callback
---------------------------
+Buffered ingest
+---------------
+The callback is not applied in the request: it is appended to the
+``sms.at.delivery.report`` staging table with one ``INSERT`` and answered
+with 200 straight away.  The *Apply Delivery Reports* cron applies staged
+reports every minute with one set-based ``UPDATE`` per batch, so a burst of
+tens of thousands of callbacks costs one cheap insert each.
+
+Fields written when a report is applied
+---------------------------------------
 ``delivery_status``
     Unified delivery status field — written both at send time (by the cron)
     and here when the webhook confirms final delivery.
@@ -51,34 +59,9 @@ import logging
 from odoo import http
 from odoo.http import request
 
-_logger = logging.getLogger(__name__)
+from ..models.sms_at_delivery_report import DELIVERY_STATE_MAP
 
-# ---------------------------------------------------------------------------
-#  AT delivery-report status --> Odoo state
-# ---------------------------------------------------------------------------
-
-_STATUS_MAP: dict[str, str] = {
-    # Terminal success
-    "Delivered": "sent",
-    "Success": "sent",
-    # Still in transit — keep as sent
-    "Sent": "sent",
-    "Buffered": "sent",
-    # Terminal failures
-    "Failed": "error",
-    "Rejected": "error",
-    "UserInBlacklist": "error",
-    "NotNetworkSubscriber": "error",
-    "InvalidLinkId": "error",
-    "UserAccountSuspended": "error",
-    "NotSubscribedToProduct": "error",
-    "UserNotOnNet": "error",
-    "DeliveryFailure": "error",
-}
-
-_FAILURE_STATUSES: frozenset[str] = frozenset(
-    s for s, state in _STATUS_MAP.items() if state == "error"
-)
+_logger = logging.getLogger(__name__)
 
 
 class AfricasTalkingDeliveryController(http.Controller):
@@ -98,7 +81,7 @@ class AfricasTalkingDeliveryController(http.Controller):
     )
     def delivery_report(self, **post: str) -> http.Response:
         """
-        Process a single delivery-report callback from Africa's Talking.
+        Stage a single delivery-report callback from Africa's Talking.
 
         Returns HTTP 200 in all non-error cases; HTTP 401 when token
         validation fails (so AT retries with the correct token).
@@ -114,7 +97,7 @@ class AfricasTalkingDeliveryController(http.Controller):
         phone_number = (post.get("phoneNumber") or "").strip()
         failure_reason = (post.get("failureReason") or "").strip()
 
-        _logger.info(
+        _logger.debug(
             "AT delivery callback  id=%s  status=%s  phone=%s  failureReason=%s",
             at_message_id or "(empty)",
             at_status or "(empty)",
@@ -129,56 +112,18 @@ class AfricasTalkingDeliveryController(http.Controller):
             )
             return self._ok()
 
-        # ---- 4. Resolve Odoo state --------------------------------------
-        odoo_state = _STATUS_MAP.get(at_status)
-        if odoo_state is None:
+        if at_status not in DELIVERY_STATE_MAP:
             _logger.warning(
                 "AT delivery callback: unknown status %r for messageId=%s — "
-                "state not updated.",
+                "state will not be updated.",
                 at_status,
                 at_message_id,
             )
 
-        # ---- 5. Locate matching sms.sms records -------------------------
-        sms_records = (
-            request.env["sms.sms"]
-            .sudo()
-            .search([("at_message_id", "=", at_message_id)])
+        # ---- 4. Stage for the apply cron ---------------------------------
+        request.env["sms.at.delivery.report"].sudo()._stage(
+            at_message_id, at_status, failure_reason, phone_number
         )
-
-        if not sms_records:
-            _logger.warning(
-                "AT delivery callback: no sms.sms found for messageId=%s  "
-                "phone=%s — ignored (may have been deleted).",
-                at_message_id,
-                phone_number,
-            )
-            return self._ok()
-
-        # ---- 6. Batch write ----------------------------------------------
-        # delivery_status is the single unified field for AT status updates.
-        write_vals: dict = {"delivery_status": at_status}
-
-        if odoo_state:
-            write_vals["state"] = odoo_state
-
-        if at_status in _FAILURE_STATUSES:
-            write_vals["at_failure_reason"] = (failure_reason or at_status)[:255]
-            if odoo_state == "error":
-                write_vals["failure_type"] = "sms_server"
-        else:
-            write_vals["at_failure_reason"] = False  # clear on re-delivery
-
-        sms_records.write(write_vals)
-
-        _logger.info(
-            "AT delivery callback applied to %d record(s): "
-            "at_status=%r --> odoo_state=%r",
-            len(sms_records),
-            at_status,
-            odoo_state,
-        )
-
         return self._ok()
 
     # ------------------------------------------------------------------
@@ -2,5 +2,9 @@
 
 from . import res_config_settings
 from . import sms_sms
+from . import mailing_contact
 from . import sms_at_template
+from . import sms_at_campaign
 from . import sms_at_analytics
+from . import sms_at_rate_bucket
+from . import sms_at_delivery_report
@@ -0,0 +1,61 @@
+# models/mailing_contact.py
+
+"""
+models/mailing_contact.py
+==========================
+
+Extends ``mailing.contact`` with ``at_mobile_e164``: the contact's mobile
+normalised to E.164, stored and indexed.
+
+Campaigns deduplicate recipients on this column in SQL, so
+``+254 712 345 678``, ``254712345678`` and ``+254712345678`` on three lists
+are one recipient, billed once.  The value is recomputed whenever ``mobile``
+changes, and for national-format numbers whenever the default country
+calling code setting changes.
+"""
+
+from __future__ import annotations
+
+from odoo import api, fields, models
+
+from ..services.phone_normalizer import normalize_many
+
+
+class MailingContact(models.Model):
+    """Add the normalised mobile used as the campaign dedup key."""
+
+    _inherit = "mailing.contact"
+
+    at_mobile_e164 = fields.Char(
+        string="Mobile (E.164)",
+        compute="_compute_at_mobile_e164",
+        store=True,
+        index=True,
+        help=(
+            "Mobile number normalised to E.164, used to send each number "
+            "only once per SMS campaign.  Empty when the number is invalid."
+        ),
+    )
+
+    @api.depends("mobile")
+    def _compute_at_mobile_e164(self) -> None:
+        """Normalise the whole batch in one bulk (memoised) pass."""
+        country = self.env["res.config.settings"]._get_at_credentials()[
+            "default_country_code"
+        ]
+        numbers, _errors = normalize_many(self.mapped("mobile"), default_country=country)
+        for contact, number in zip(self, numbers):
+            contact.at_mobile_e164 = number or False
+
+    @api.model
+    def _at_recompute_mobile_e164(self) -> None:
+        """
+        Recompute the normalised mobile of contacts whose number is not in
+        international format, after the default country code changed.
+        """
+        contacts = self.with_context(active_test=False).search(
+            [("mobile", "!=", False), "!", ("mobile", "=like", "+%")]
+        )
+        if contacts:
+            self.env.add_to_compute(self._fields["at_mobile_e164"], contacts)
+            contacts.flush_recordset(["at_mobile_e164"])
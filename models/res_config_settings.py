@@ -22,11 +22,45 @@ System-parameter keys
     Optional secret for authenticating delivery callbacks.
 ``sms_africastalking.request_timeout``
     Per-request HTTP timeout in seconds (default 30).
+``sms_africastalking.max_in_flight``
+    Maximum concurrent AT API calls during one dispatch run (default 4).
+``sms_africastalking.dispatch_engine``
+    How concurrent calls are issued: ``"threads"`` (default) or ``"asyncio"``.
+``sms_africastalking.drain_time_budget``
+    Seconds the queue cron keeps claiming batches before yielding
+    (default 45; ``0`` = one batch per run).
+``sms_africastalking.rate_recipients_per_sec``
+    Recipient budget for AT calls (default 1000; ``0`` = unlimited).
+``sms_africastalking.rate_requests_per_sec``
+    API-call budget for AT calls (default 10; ``0`` = unlimited).
+``sms_africastalking.rate_coordinate_workers``
+    Stored as ``"True"`` to share the rate budget across all workers
+    through Postgres.
+``sms_africastalking.retry_max_attempts``
+    Maximum delivery attempts for retryable AT failures (default 5;
+    ``1`` disables automatic retries).
+``sms_africastalking.default_country_code``
+    Calling code (digits, e.g. ``254``) used to expand numbers stored in
+    national format (``0712...``); empty = such numbers are rejected.
+``sms_africastalking.transliterate_gsm7``
+    Stored as ``"True"`` to replace Unicode lookalikes (smart quotes,
+    dashes, ...) with GSM-7 characters when that saves segments.
+``sms_africastalking.api_base_url``
+    Technical override of the AT API root, e.g. ``http://127.0.0.1:8765``
+    to load-test against ``benchmarks/at_standin.py``.  Not exposed in the
+    settings form; empty = the real AT endpoints.
 """
 
 from odoo import _, api, fields, models
 from odoo.exceptions import UserError
 
+from ..services.africastalking_client import (
+    AT_DEFAULT_RECIPIENTS_PER_SEC,
+    AT_DEFAULT_REQUESTS_PER_SEC,
+    AT_RETRY_MAX_ATTEMPTS,
+)
+from ..services.phone_normalizer import clean_country_code
+
 # ---------------------------------------------------------------------------
 #  System-parameter key constants
 # ---------------------------------------------------------------------------
@@ -38,8 +72,22 @@ PARAM_SENDER_ID = "sms_africastalking.sender_id"
 PARAM_SANDBOX = "sms_africastalking.sandbox"
 PARAM_WEBHOOK_TOKEN = "sms_africastalking.webhook_token"
 PARAM_REQUEST_TIMEOUT = "sms_africastalking.request_timeout"
+PARAM_MAX_IN_FLIGHT = "sms_africastalking.max_in_flight"
+PARAM_DISPATCH_ENGINE = "sms_africastalking.dispatch_engine"
+PARAM_DRAIN_TIME_BUDGET = "sms_africastalking.drain_time_budget"
+PARAM_RATE_RECIPIENTS = "sms_africastalking.rate_recipients_per_sec"
+PARAM_RATE_REQUESTS = "sms_africastalking.rate_requests_per_sec"
+PARAM_RATE_COORDINATE = "sms_africastalking.rate_coordinate_workers"
+PARAM_RETRY_MAX_ATTEMPTS = "sms_africastalking.retry_max_attempts"
+PARAM_API_BASE_URL = "sms_africastalking.api_base_url"
+PARAM_TRANSLITERATE = "sms_africastalking.transliterate_gsm7"
+PARAM_DEFAULT_COUNTRY_CODE = "sms_africastalking.default_country_code"
 
 _DEFAULT_TIMEOUT = 30
+_DEFAULT_MAX_IN_FLIGHT = 4
+_MAX_IN_FLIGHT_CAP = 64
+_MAX_IN_FLIGHT_THREADS = 16
+_DEFAULT_DRAIN_TIME_BUDGET = 45
 
 
 class ResConfigSettings(models.TransientModel):
@@ -128,6 +176,126 @@ class ResConfigSettings(models.TransientModel):
         ),
     )
 
+    at_max_in_flight = fields.Integer(
+        string="Concurrent API Calls",
+        config_parameter=PARAM_MAX_IN_FLIGHT,
+        default=_DEFAULT_MAX_IN_FLIGHT,
+        help=(
+            f"Maximum number of Africa's Talking API calls the queue cron keeps "
+            f"in flight at once.  Each call carries up to 1 000 recipients of one "
+            f"message body, so personalised campaigns benefit most.  "
+            f"Set to 1 for strictly sequential dispatch.  "
+            f"Default: {_DEFAULT_MAX_IN_FLIGHT}, maximum: {_MAX_IN_FLIGHT_CAP} "
+            f"({_MAX_IN_FLIGHT_THREADS} with the thread engine)."
+        ),
+    )
+    at_dispatch_engine = fields.Selection(
+        selection=[
+            ("threads", "Worker threads"),
+            ("asyncio", "asyncio (single thread)"),
+        ],
+        string="Dispatch Engine",
+        config_parameter=PARAM_DISPATCH_ENGINE,
+        default="threads",
+        help=(
+            "How concurrent Africa's Talking calls are issued.\n\n"
+            "Worker threads: one thread per in-flight call, over the shared "
+            f"keep-alive pool (at most {_MAX_IN_FLIGHT_THREADS} in flight).\n\n"
+            "asyncio: a single dispatcher thread keeps all calls in flight "
+            "on an event loop; suited to high concurrency settings."
+        ),
+    )
+
+    at_drain_time_budget = fields.Integer(
+        string="Queue Drain Time Budget (s)",
+        config_parameter=PARAM_DRAIN_TIME_BUDGET,
+        default=_DEFAULT_DRAIN_TIME_BUDGET,
+        help=(
+            f"How long one run of the queue cron keeps dispatching batches of "
+            f"1 000 messages before yielding.  When work remains after the "
+            f"budget is spent, the cron immediately re-schedules itself.  "
+            f"Set to 0 to process a single batch per run.  "
+            f"Default: {_DEFAULT_DRAIN_TIME_BUDGET}s."
+        ),
+    )
+
+    at_rate_recipients_per_sec = fields.Integer(
+        string="Recipients per Second",
+        config_parameter=PARAM_RATE_RECIPIENTS,
+        default=int(AT_DEFAULT_RECIPIENTS_PER_SEC),
+        help=(
+            "Maximum recipients submitted to Africa's Talking per second, "
+            "shared by every dispatch thread in a worker.  0 = unlimited.  "
+            f"Default: {int(AT_DEFAULT_RECIPIENTS_PER_SEC)}."
+        ),
+    )
+    at_rate_requests_per_sec = fields.Integer(
+        string="API Calls per Second",
+        config_parameter=PARAM_RATE_REQUESTS,
+        default=int(AT_DEFAULT_REQUESTS_PER_SEC),
+        help=(
+            "Maximum Africa's Talking API calls per second.  0 = unlimited.  "
+            f"Default: {int(AT_DEFAULT_REQUESTS_PER_SEC)}."
+        ),
+    )
+    at_rate_coordinate_workers = fields.Boolean(
+        string="Share Rate Limit Across Workers",
+        config_parameter=PARAM_RATE_COORDINATE,
+        help=(
+            "When enabled the rate limits above apply to the whole database "
+            "rather than to each worker process: every API call reserves its "
+            "budget in a shared Postgres row, updated atomically.  "
+            "Enable when several cron workers or Odoo nodes dispatch SMS."
+        ),
+    )
+
+    at_retry_max_attempts = fields.Integer(
+        string="Maximum Send Attempts",
+        config_parameter=PARAM_RETRY_MAX_ATTEMPTS,
+        default=AT_RETRY_MAX_ATTEMPTS,
+        help=(
+            "When an Africa's Talking call fails with a temporary error "
+            "(HTTP 5xx, timeout, network failure) the affected messages are "
+            "re-queued automatically with exponential backoff, up to this "
+            "many attempts in total.  Set to 1 to disable automatic retries.  "
+            f"Default: {AT_RETRY_MAX_ATTEMPTS}."
+        ),
+    )
+
+    at_default_country_code = fields.Char(
+        string="Default Country Calling Code",
+        config_parameter=PARAM_DEFAULT_COUNTRY_CODE,
+        help=(
+            "Calling code used for phone numbers stored in national format, "
+            "e.g. 254 for Kenya: 0712 345 678 is then sent to +254712345678.  "
+            "Leave empty to reject numbers without a country code."
+        ),
+    )
+
+    at_transliterate_gsm7 = fields.Boolean(
+        string="Convert Lookalike Characters to GSM-7",
+        config_parameter=PARAM_TRANSLITERATE,
+        help=(
+            "A single curly quote, en dash or accented letter outside the "
+            "GSM-7 alphabet makes a message Unicode (UCS-2), which halves the "
+            "characters per SMS part.  When enabled, such characters are "
+            "replaced by their plain equivalents at dispatch time whenever "
+            "this makes the message use fewer parts.  Messages with emoji "
+            "or non-Latin scripts are sent unchanged."
+        ),
+    )
+
+    # ------------------------------------------------------------------
+    #  Settings persistence
+    # ------------------------------------------------------------------
+    def set_values(self) -> None:
+        get = self.env["ir.config_parameter"].sudo().get_param
+        previous_country = clean_country_code(get(PARAM_DEFAULT_COUNTRY_CODE, ""))
+        super().set_values()
+        if clean_country_code(self.at_default_country_code) != previous_country:
+            # National-format mobiles expand differently now.
+            self.env["mailing.contact"].sudo()._at_recompute_mobile_e164()
+
     # ------------------------------------------------------------------
     #  Balance check button action
     # ------------------------------------------------------------------
@@ -169,6 +337,7 @@ class ResConfigSettings(models.TransientModel):
                 api_key=creds["api_key"],
                 sandbox=creds["sandbox"],
                 timeout=creds["request_timeout"],
+                base_url=creds.get("api_base_url", ""),
             )
             balance = client.get_balance()
         except ATError as exc:
@@ -208,7 +377,12 @@ class ResConfigSettings(models.TransientModel):
         dict
             Keys: ``provider`` (str), ``username`` (str), ``api_key`` (str),
             ``sender_id`` (str), ``sandbox`` (bool), ``webhook_token`` (str),
-            ``request_timeout`` (int).
+            ``request_timeout`` (int), ``max_in_flight`` (int),
+            ``dispatch_engine`` (str),
+            ``drain_time_budget`` (int), ``rate_recipients_per_sec`` (int),
+            ``rate_requests_per_sec`` (int), ``rate_coordinate_workers`` (bool),
+            ``retry_max_attempts`` (int), ``default_country_code`` (str,
+            digits only), ``transliterate_gsm7`` (bool), ``api_base_url`` (str).
         """
         get = self.env["ir.config_parameter"].sudo().get_param
 
@@ -223,6 +397,24 @@ class ResConfigSettings(models.TransientModel):
         except (TypeError, ValueError):
             timeout = _DEFAULT_TIMEOUT
 
+        max_in_flight_raw = get(PARAM_MAX_IN_FLIGHT, str(_DEFAULT_MAX_IN_FLIGHT))
+        try:
+            max_in_flight = min(max(int(max_in_flight_raw), 1), _MAX_IN_FLIGHT_CAP)
+        except (TypeError, ValueError):
+            max_in_flight = _DEFAULT_MAX_IN_FLIGHT
+
+        budget_raw = get(PARAM_DRAIN_TIME_BUDGET, str(_DEFAULT_DRAIN_TIME_BUDGET))
+        try:
+            drain_time_budget = max(int(budget_raw), 0)
+        except (TypeError, ValueError):
+            drain_time_budget = _DEFAULT_DRAIN_TIME_BUDGET
+
+        def _non_negative_int(key: str, default: int) -> int:
+            try:
+                return max(int(get(key, str(default))), 0)
+            except (TypeError, ValueError):
+                return default
+
         return {
             "provider": get(PARAM_PROVIDER, "africastalking") or "africastalking",
             "username": get(PARAM_USERNAME, "") or "",
@@ -231,4 +423,20 @@ class ResConfigSettings(models.TransientModel):
             "sandbox": sandbox,
             "webhook_token": get(PARAM_WEBHOOK_TOKEN, "") or "",
             "request_timeout": timeout,
+            "max_in_flight": max_in_flight,
+            "dispatch_engine": get(PARAM_DISPATCH_ENGINE, "threads") or "threads",
+            "drain_time_budget": drain_time_budget,
+            "rate_recipients_per_sec": _non_negative_int(
+                PARAM_RATE_RECIPIENTS, int(AT_DEFAULT_RECIPIENTS_PER_SEC)
+            ),
+            "rate_requests_per_sec": _non_negative_int(
+                PARAM_RATE_REQUESTS, int(AT_DEFAULT_REQUESTS_PER_SEC)
+            ),
+            "rate_coordinate_workers": get(PARAM_RATE_COORDINATE, "False") == "True",
+            "retry_max_attempts": max(
+                _non_negative_int(PARAM_RETRY_MAX_ATTEMPTS, AT_RETRY_MAX_ATTEMPTS), 1
+            ),
+            "default_country_code": clean_country_code(get(PARAM_DEFAULT_COUNTRY_CODE, "")),
+            "transliterate_gsm7": get(PARAM_TRANSLITERATE, "False") == "True",
+            "api_base_url": (get(PARAM_API_BASE_URL, "") or "").strip(),
         }
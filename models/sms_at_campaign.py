@@ -0,0 +1,424 @@
+# models/sms_at_campaign.py
+
+
+"""
+models/sms_at_campaign.py
+==========================
+
+``sms.at.campaign`` - one send of an ``sms.at.template`` to its mailing
+lists, executed in the background.
+
+Clicking *Send to Lists* on a template only creates a campaign: a snapshot
+of the template body and target lists.  The campaign cron then pages the
+eligible contacts' distinct E.164 mobile numbers
+(``mailing.contact.at_mobile_e164``, one projected SQL query per batch),
+renders and creates ``sms.sms`` records batch by batch (committing after
+each batch) and hands them to the AT queue.
+
+Progress counters
+-----------------
+``rendered_count``  distinct mobile numbers processed so far
+``queued_count``    ``sms.sms`` records created
+``sent_count``      records sent by AT (live, from ``sms.sms``)
+``failed_count``    records in error (live, from ``sms.sms``)
+
+Pausing a campaign stops both rendering and the dispatch of its records that
+are still queued; resuming continues from the saved mobile-number cursor.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any
+
+from odoo import _, api, fields, models
+from odoo.exceptions import UserError
+from odoo.tools import SQL
+
+from ..services.template_render import body_digest, compile_template, contact_columns
+from .sms_at_template import mailing_contact_domain
+
+_logger = logging.getLogger(__name__)
+
+#: Contacts rendered and turned into ``sms.sms`` records per batch.
+CAMPAIGN_BATCH_SIZE: int = 1_000
+
+#: Seconds one cron run may spend before re-triggering itself.
+CAMPAIGN_TIME_BUDGET: float = 45.0
+
+_CAMPAIGN_CRON_XMLID = "sms_africastalking_provider.ir_cron_sms_at_campaign"
+
+
+class SmsAtCampaign(models.Model):
+    """Background send of a template to its mailing lists."""
+
+    _name = "sms.at.campaign"
+    _description = "Africa's Talking SMS Campaign"
+    _order = "id desc"
+
+    # ------------------------------------------------------------------
+    #  Fields
+    # ------------------------------------------------------------------
+
+    name = fields.Char(string="Campaign", required=True)
+    template_id = fields.Many2one(
+        comodel_name="sms.at.template",
+        string="Template",
+        required=True,
+        ondelete="restrict",
+        readonly=True,
+    )
+    body = fields.Text(
+        string="Message Body",
+        required=True,
+        readonly=True,
+        help="Snapshot of the template body taken when the campaign was created.",
+    )
+    mailing_list_ids = fields.Many2many(
+        comodel_name="mailing.list",
+        relation="sms_at_campaign_mailing_list_rel",
+        column1="campaign_id",
+        column2="list_id",
+        string="Target Mailing Lists",
+        readonly=True,
+    )
+    state = fields.Selection(
+        selection=[
+            ("draft", "Draft"),
+            ("running", "Running"),
+            ("paused", "Paused"),
+            ("done", "Done"),
+            ("cancel", "Cancelled"),
+        ],
+        default="draft",
+        required=True,
+        readonly=True,
+        copy=False,
+        index=True,
+    )
+    mobile_cursor = fields.Char(
+        string="Last Mobile Processed",
+        readonly=True,
+        copy=False,
+        help=(
+            "Contacts are rendered in normalised mobile-number order; "
+            "rendering resumes after this number."
+        ),
+    )
+    date_start = fields.Datetime(string="Started", readonly=True, copy=False)
+    date_done = fields.Datetime(string="Finished", readonly=True, copy=False)
+
+    sms_ids = fields.One2many(
+        comodel_name="sms.sms",
+        inverse_name="at_campaign_id",
+        string="Messages",
+        readonly=True,
+    )
+
+    # Progress counters
+    rendered_count = fields.Integer(
+        string="Contacts Rendered",
+        readonly=True,
+        copy=False,
+        help="Distinct mobile numbers rendered so far.",
+    )
+    queued_count = fields.Integer(
+        string="Messages Queued",
+        readonly=True,
+        copy=False,
+        help="SMS records created and handed to the dispatch queue.",
+    )
+    sent_count = fields.Integer(string="Sent", compute="_compute_sms_counts")
+    failed_count = fields.Integer(string="Failed", compute="_compute_sms_counts")
+
+    # ------------------------------------------------------------------
+    #  Computed fields
+    # ------------------------------------------------------------------
+
+    def _compute_sms_counts(self) -> None:
+        """Count sent / failed messages with one grouped query."""
+        counts: dict[tuple[int, str], int] = {}
+        if self.ids:
+            groups = self.env["sms.sms"].sudo()._read_group(
+                [("at_campaign_id", "in", self.ids), ("state", "in", ("sent", "error"))],
+                ["at_campaign_id", "state"],
+                ["__count"],
+            )
+            counts = {(campaign.id, state): count for campaign, state, count in groups}
+        for campaign in self:
+            campaign.sent_count = counts.get((campaign.id, "sent"), 0)
+            campaign.failed_count = counts.get((campaign.id, "error"), 0)
+
+    # ------------------------------------------------------------------
+    #  Actions
+    # ------------------------------------------------------------------
+
+    def action_start(self) -> None:
+        """Start (or resume) rendering in the background."""
+        for campaign in self:
+            if campaign.state not in ("draft", "paused"):
+                raise UserError(
+                    _("Only draft or paused campaigns can be started.")
+                )
+        self.write({"state": "running"})
+        self.filtered(lambda c: not c.date_start).write(
+            {"date_start": fields.Datetime.now()}
+        )
+        self._trigger_cron()
+        # Paused records may have been held back in the dispatch queue.
+        self.env["sms.sms"].sudo()._at_trigger_queue_cron()
+
+    def action_pause(self) -> None:
+        """Stop rendering and hold this campaign's queued messages."""
+        if self.filtered(lambda c: c.state != "running"):
+            raise UserError(_("Only running campaigns can be paused."))
+        self.write({"state": "paused"})
+
+    def action_cancel(self) -> None:
+        """
+        Stop the campaign and mark its messages not yet dispatched as
+        ``canceled`` (the ``sms.sms`` state; the campaign itself uses
+        ``cancel``).
+        """
+        if self.filtered(lambda c: c.state in ("done", "cancel")):
+            raise UserError(_("Finished campaigns cannot be cancelled."))
+        self.write({"state": "cancel", "date_done": fields.Datetime.now()})
+        pending = self.env["sms.sms"].sudo().search(
+            [
+                ("at_campaign_id", "in", self.ids),
+                ("state", "in", ("outgoing", "queued")),
+            ]
+        )
+        pending.write({"state": "canceled"})
+        _logger.info(
+            "sms.at.campaign %s: cancelled, %d pending message(s) canceled.",
+            self.ids,
+            len(pending),
+        )
+
+    def action_view_messages(self) -> dict:
+        self.ensure_one()
+        return {
+            "type": "ir.actions.act_window",
+            "name": _("Messages"),
+            "res_model": "sms.sms",
+            "view_mode": "list,form",
+            "domain": [("at_campaign_id", "=", self.id)],
+            "context": {"search_default_group_state": 1},
+        }
+
+    # ------------------------------------------------------------------
+    #  Background rendering
+    # ------------------------------------------------------------------
+
+    def _trigger_cron(self) -> None:
+        cron = self.env.ref(_CAMPAIGN_CRON_XMLID, raise_if_not_found=False)
+        if cron:
+            cron.sudo()._trigger()
+
+    def _contact_domain(self) -> list:
+        self.ensure_one()
+        return mailing_contact_domain(self.mailing_list_ids.ids) + [
+            ("mobile", "!=", False)
+        ]
+
+    def _fetch_contact_batch(self, limit: int) -> list[tuple[int, str, str, str, str]]:
+        """
+        Return the next *limit* distinct recipients after ``mobile_cursor``.
+
+        Recipients are keyed by ``at_mobile_e164``, so the same number
+        written differently on several lists is sent once.  The page is
+        read straight off that indexed column (``at_mobile_e164 > cursor
+        ORDER BY at_mobile_e164``), so each batch walks the index from the
+        cursor and stops after *limit* keys instead of sorting every
+        eligible contact again.  Contacts whose mobile could not be
+        normalised are not paged; see :meth:`_fetch_unnormalised_contacts`.
+
+        Only ``id``, ``name``, ``email``, the trimmed ``mobile`` and the key
+        are fetched, with one SQL query and no ORM records.  ``DISTINCT ON``
+        keeps the lowest-id contact per key, so deduplication happens in
+        the database and pages by key never overlap.
+
+        Returns
+        -------
+        list[tuple]
+            ``(id, name, email, mobile, key)`` rows ordered by key.
+        """
+        self.ensure_one()
+        Contact = self.env["mailing.contact"].sudo()
+        Contact.flush_model(["mobile", "at_mobile_e164"])
+        query = Contact._search(
+            self._contact_domain() + [("at_mobile_e164", ">", self.mobile_cursor or "")],
+            limit=limit,
+            order="at_mobile_e164, id",
+        )
+        key = SQL.identifier(query.table, "at_mobile_e164")
+        self.env.cr.execute(
+            query.select(
+                SQL(
+                    "DISTINCT ON (%s) %s, %s, %s, btrim(%s), %s",
+                    key,
+                    SQL.identifier(query.table, "id"),
+                    SQL.identifier(query.table, "name"),
+                    SQL.identifier(query.table, "email"),
+                    SQL.identifier(query.table, "mobile"),
+                    key,
+                )
+            )
+        )
+        return self.env.cr.fetchall()
+
+    def _fetch_unnormalised_contacts(self) -> list[tuple[int, str, str, str, str]]:
+        """
+        Return the eligible contacts whose mobile has no E.164 form.
+
+        They are read once, when rendering starts, one row per distinct
+        trimmed mobile; their messages then fail at enqueue time with a
+        reason.  Same row shape as :meth:`_fetch_contact_batch`, keyed by
+        the trimmed mobile.
+        """
+        self.ensure_one()
+        Contact = self.env["mailing.contact"].sudo()
+        Contact.flush_model(["mobile", "at_mobile_e164"])
+        query = Contact._search(
+            self._contact_domain() + [("at_mobile_e164", "=", False)]
+        )
+        self.env.cr.execute(
+            SQL(
+                """
+                SELECT DISTINCT ON (c.mobile) c.id, c.name, c.email, c.mobile, c.mobile
+                  FROM (SELECT id, name, email, btrim(mobile) AS mobile
+                          FROM %(table)s
+                         WHERE id IN %(eligible)s) AS c
+                 WHERE c.mobile != ''
+              ORDER BY c.mobile, c.id
+                """,
+                table=SQL.identifier(Contact._table),
+                eligible=query.subselect(),
+            )
+        )
+        return self.env.cr.fetchall()
+
+    def _render_next_batch(self, limit: int = CAMPAIGN_BATCH_SIZE) -> bool:
+        """
+        Render and queue the next batch of distinct mobile numbers.
+
+        The first batch of a campaign also queues its contacts without a
+        normalised mobile, in the same transaction.
+
+        Returns
+        -------
+        bool
+            ``False`` once every contact has been processed.
+        """
+        self.ensure_one()
+        unnormalised = [] if self.rendered_count else self._fetch_unnormalised_contacts()
+        rows = self._fetch_contact_batch(limit)
+        if not rows and not unnormalised:
+            return False
+
+        queued = self._queue_rows(unnormalised + rows)
+        vals: dict[str, Any] = {
+            "rendered_count": self.rendered_count + len(unnormalised) + len(rows),
+            "queued_count": self.queued_count + queued,
+        }
+        if rows:
+            vals["mobile_cursor"] = rows[-1][4]
+        self.write(vals)
+        return bool(rows)
+
+    def _queue_rows(self, rows: list[tuple[int, str, str, str, str]]) -> int:
+        """
+        Render one message per contact row, create and enqueue them.
+
+        Returns
+        -------
+        int
+            Number of ``sms.sms`` records created.
+        """
+        if not rows:
+            return 0
+        _ids, names, emails, mobiles, keys = zip(*rows)
+
+        # Render the whole batch from columns with the compiled template.
+        template = compile_template(self.body)
+        columns = contact_columns(names, emails, mobiles, tokens=template.tokens)
+        if template.is_static or all(
+            len(set(column)) == 1 for column in columns.values()
+        ):
+            # Everyone in the batch gets the same text: render and digest it
+            # once, and tag every record with the shared digest so the
+            # dispatcher batches them without comparing bodies.
+            body = template.render({token: column[0] for token, column in columns.items()})
+            digest = body_digest(body)
+            sms_vals_list: list[dict[str, Any]] = [
+                {
+                    "number": key,
+                    "body": body,
+                    "state": "outgoing",
+                    "at_campaign_id": self.id,
+                    "at_body_digest": digest,
+                }
+                for key in keys
+            ]
+        else:
+            bodies = template.render_batch(columns, count=len(rows))
+            sms_vals_list = [
+                {
+                    "number": key,
+                    "body": body,
+                    "state": "outgoing",
+                    "at_campaign_id": self.id,
+                }
+                for key, body in zip(keys, bodies)
+            ]
+
+        # sudo() is required: mailing users don't have sms.sms create rights
+        sms_records = self.env["sms.sms"].sudo().create(sms_vals_list)
+
+        # Dispatch via the overridden _send() which routes to AT
+        sms_records._send()
+        return len(sms_records)
+
+    def _finish(self) -> None:
+        self.ensure_one()
+        now = fields.Datetime.now()
+        self.write({"state": "done", "date_done": now})
+        self.template_id.write({"last_sent": now})
+        _logger.info(
+            "sms.at.campaign '%s': rendering finished - %d message(s) queued "
+            "for %d contact(s).",
+            self.name,
+            self.queued_count,
+            self.rendered_count,
+        )
+
+    @api.model
+    def _cron_process_campaigns(self) -> None:
+        """
+        Cron-called method: advance every running campaign.
+
+        Each batch of :data:`CAMPAIGN_BATCH_SIZE` contacts is committed
+        together with the campaign's cursor and counters, so an interrupted
+        run resumes where it stopped and progress is visible immediately.
+        A campaign paused or cancelled meanwhile is left alone from its next
+        batch on.  After :data:`CAMPAIGN_TIME_BUDGET` seconds the job
+        re-triggers itself instead of holding the cron worker.
+        """
+        deadline = time.monotonic() + CAMPAIGN_TIME_BUDGET
+        auto_commit = not getattr(threading.current_thread(), "testing", False)
+
+        for campaign in self.search([("state", "=", "running")], order="id"):
+            while campaign.state == "running":
+                if not campaign._render_next_batch():
+                    campaign._finish()
+                if auto_commit:
+                    self.env.cr.commit()
+                # Keep the cache as small as the batch, and re-read the state
+                # in case the campaign was paused from the UI.
+                self.env.invalidate_all()
+                if campaign.state == "running" and time.monotonic() >= deadline:
+                    self._trigger_cron()
+                    return
@@ -0,0 +1,223 @@
+# models/sms_at_delivery_report.py
+
+"""
+models/sms_at_delivery_report.py
+=================================
+
+``sms.at.delivery.report`` - staging table for Africa's Talking
+delivery-report callbacks.
+
+The webhook only appends the raw callback here with a single ``INSERT`` and
+answers 200, so a storm of callbacks after a large campaign neither ties up
+HTTP workers nor updates ``sms.sms`` rows one by one.  The
+``ir_cron_sms_at_delivery_reports`` job then applies the staged reports in
+batches: one set-based ``UPDATE ... FROM`` joined on ``at_message_id`` (the
+latest report per message wins) and deletes them in the same statement.
+
+Like ``sms.at.rate.bucket`` the table is written with plain SQL only and has
+no views - it is internal bookkeeping.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+from odoo import api, fields, models
+from odoo.tools import SQL
+
+_logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------------------------
+#  AT delivery-report status --> Odoo state
+# ---------------------------------------------------------------------------
+
+DELIVERY_STATE_MAP: dict[str, str] = {
+    # Terminal success
+    "Delivered": "sent",
+    "Success": "sent",
+    # Still in transit — keep as sent
+    "Sent": "sent",
+    "Buffered": "sent",
+    # Terminal failures
+    "Failed": "error",
+    "Rejected": "error",
+    "UserInBlacklist": "error",
+    "NotNetworkSubscriber": "error",
+    "InvalidLinkId": "error",
+    "UserAccountSuspended": "error",
+    "NotSubscribedToProduct": "error",
+    "UserNotOnNet": "error",
+    "DeliveryFailure": "error",
+}
+
+DELIVERY_FAILURE_STATUSES: frozenset[str] = frozenset(
+    s for s, state in DELIVERY_STATE_MAP.items() if state == "error"
+)
+
+#: Staged reports applied per statement.
+REPORT_BATCH_SIZE: int = 5_000
+
+#: Seconds one cron run may spend before re-triggering itself.
+REPORT_TIME_BUDGET: float = 45.0
+
+_REPORT_CRON_XMLID = "sms_africastalking_provider.ir_cron_sms_at_delivery_reports"
+
+
+class SmsAtDeliveryReport(models.Model):
+    """One raw delivery-report callback waiting to be applied."""
+
+    _name = "sms.at.delivery.report"
+    _description = "Africa's Talking Delivery Report (staging)"
+    _order = "id"
+    _log_access = False
+
+    message_id = fields.Char(required=True, readonly=True)
+    status = fields.Char(readonly=True)
+    failure_reason = fields.Char(readonly=True)
+    phone_number = fields.Char(readonly=True)
+    received_at = fields.Datetime(readonly=True)
+
+    # ------------------------------------------------------------------
+    #  Ingest (webhook)
+    # ------------------------------------------------------------------
+
+    @api.model
+    def _stage(
+        self, message_id: str, status: str, failure_reason: str, phone_number: str
+    ) -> None:
+        """Append one callback; a single INSERT, no ORM and no lookup."""
+        self.env.cr.execute(
+            SQL(
+                """
+                INSERT INTO sms_at_delivery_report
+                       (message_id, status, failure_reason, phone_number, received_at)
+                VALUES (%s, %s, %s, %s, now() AT TIME ZONE 'UTC')
+                """,
+                message_id,
+                status,
+                failure_reason,
+                phone_number,
+            )
+        )
+
+    # ------------------------------------------------------------------
+    #  Apply (cron)
+    # ------------------------------------------------------------------
+
+    @api.model
+    def _apply_batch(self, limit: int = REPORT_BATCH_SIZE) -> tuple[int, int]:
+        """
+        Apply and delete up to *limit* staged reports.
+
+        The batch is claimed with ``FOR UPDATE SKIP LOCKED`` so concurrent
+        runs never apply the same rows.  Per message only the latest report
+        counts.  Field semantics match the former per-callback write:
+
+        * ``delivery_status`` <-- the AT status;
+        * ``state`` <-- mapped through :data:`DELIVERY_STATE_MAP` (unknown
+          statuses leave it unchanged);
+        * failure statuses set ``at_failure_reason`` (the AT reason, or the
+          status) and ``failure_type = 'sms_server'``; other statuses clear
+          ``at_failure_reason``.
+
+        Reports whose message id matches no ``sms.sms`` are dropped.
+
+        Returns
+        -------
+        tuple[int, int]
+            ``(reports consumed, sms.sms rows updated)``.
+        """
+        fnames = ["delivery_status", "state", "at_failure_reason", "failure_type"]
+        SmsSms = self.env["sms.sms"]
+        SmsSms.flush_model(["at_message_id", *fnames])
+        statuses = list(DELIVERY_STATE_MAP)
+        self.env.cr.execute(
+            SQL(
+                """
+                WITH batch AS (
+                    DELETE FROM sms_at_delivery_report
+                     WHERE id IN (SELECT id
+                                    FROM sms_at_delivery_report
+                                ORDER BY id
+                                   LIMIT %(limit)s
+                                     FOR UPDATE SKIP LOCKED)
+                 RETURNING id, message_id, status, failure_reason
+                ),
+                latest AS (
+                    SELECT DISTINCT ON (b.message_id)
+                           b.message_id,
+                           NULLIF(b.status, '') AS status,
+                           b.failure_reason,
+                           m.state,
+                           b.status = ANY(%(failures)s) AS failed
+                      FROM batch AS b
+                 LEFT JOIN unnest(%(statuses)s::varchar[], %(states)s::varchar[])
+                           AS m(status, state) ON m.status = b.status
+                  ORDER BY b.message_id, b.id DESC
+                ),
+                updated AS (
+                    UPDATE sms_sms AS s
+                       SET delivery_status = l.status,
+                           state = COALESCE(l.state, s.state),
+                           at_failure_reason = CASE
+                               WHEN l.failed
+                               THEN left(COALESCE(NULLIF(l.failure_reason, ''), l.status), 255)
+                           END,
+                           failure_type = CASE
+                               WHEN l.failed THEN 'sms_server'
+                               ELSE s.failure_type
+                           END,
+                           write_date = (now() AT TIME ZONE 'UTC')
+                      FROM latest AS l
+                     WHERE s.at_message_id = l.message_id
+                 RETURNING s.id
+                )
+                SELECT (SELECT count(*) FROM batch), (SELECT count(*) FROM updated)
+                """,
+                limit=limit,
+                failures=sorted(DELIVERY_FAILURE_STATUSES),
+                statuses=statuses,
+                states=[DELIVERY_STATE_MAP[s] for s in statuses],
+            )
+        )
+        consumed, updated = self.env.cr.fetchone()
+        if updated:
+            SmsSms.invalidate_model([*fnames, "write_date"])
+        return consumed, updated
+
+    @api.model
+    def _cron_apply_reports(self) -> None:
+        """
+        Cron-called method: apply staged delivery reports in batches.
+
+        Each batch is committed on its own, so a failure only loses that
+        batch's progress.  After :data:`REPORT_TIME_BUDGET` seconds with
+        work remaining the job re-triggers itself.
+        """
+        deadline = time.monotonic() + REPORT_TIME_BUDGET
+        auto_commit = not getattr(threading.current_thread(), "testing", False)
+        consumed_total = updated_total = 0
+
+        while True:
+            consumed, updated = self._apply_batch()
+            if auto_commit:
+                self.env.cr.commit()
+            consumed_total += consumed
+            updated_total += updated
+            if consumed < REPORT_BATCH_SIZE:
+                break
+            if time.monotonic() >= deadline:
+                cron = self.env.ref(_REPORT_CRON_XMLID, raise_if_not_found=False)
+                if cron:
+                    cron._trigger()
+                break
+
+        if consumed_total:
+            _logger.info(
+                "AT delivery reports: %d staged report(s) processed, "
+                "%d sms.sms record(s) updated.",
+                consumed_total,
+                updated_total,
+            )
@@ -0,0 +1,94 @@
+# models/sms_at_rate_bucket.py
+
+"""
+models/sms_at_rate_bucket.py
+=============================
+
+``sms.at.rate.bucket`` - shared token-bucket state for Africa's Talking
+rate limiting across Odoo workers.
+
+Each row holds the token balance of one bucket (e.g. ``"<username>:recipients"``).
+:class:`PgRateCoordinator` refills and draws from a row with a single
+``INSERT ... ON CONFLICT (key) DO UPDATE`` in its own short READ COMMITTED
+transaction.  The row lock taken by the upsert serialises concurrent
+callers on the latest balance, so every cron worker and every Odoo node
+draws from the same budget.
+
+The table is written with plain SQL only; there are no views and no user
+access - it is internal bookkeeping.
+"""
+
+from __future__ import annotations
+
+import logging
+
+from odoo import fields, models
+from odoo.tools import SQL
+
+_logger = logging.getLogger(__name__)
+
+
+class SmsAtRateBucket(models.Model):
+    """Token balance of one cross-worker rate-limit bucket."""
+
+    _name = "sms.at.rate.bucket"
+    _description = "Africa's Talking Rate-Limit Bucket"
+    _log_access = False
+
+    key = fields.Char(required=True, readonly=True)
+    tokens = fields.Float(readonly=True)
+    refreshed_at = fields.Float(
+        readonly=True,
+        help="Database clock (epoch seconds) at the last refill.",
+    )
+
+    _key_unique = models.Constraint(
+        "UNIQUE(key)",
+        "A rate-limit bucket key must be unique.",
+    )
+
+
+class PgRateCoordinator:
+    """
+    Coordinator for :class:`~services.rate_limiter.DispatchRateLimiter`
+    backed by ``sms.at.rate.bucket``.
+
+    Safe to call from dispatch threads: every call opens (and commits) its
+    own cursor on *registry* and never touches the caller's environment.
+    Time is read from the database clock so workers on different hosts
+    agree on refill intervals.
+    """
+
+    def __init__(self, registry) -> None:
+        self._registry = registry
+
+    def __call__(self, key: str, amount: float, rate: float, capacity: float) -> float:
+        with self._registry.cursor() as cr:
+            # Odoo cursors default to REPEATABLE READ, whose snapshot may
+            # predate a concurrent caller's commit: the upsert must see, and
+            # lock, the latest row version instead.
+            cr.execute(SQL("SET TRANSACTION ISOLATION LEVEL READ COMMITTED"))
+            cr.execute(
+                SQL(
+                    """
+                    INSERT INTO sms_at_rate_bucket AS b (key, tokens, refreshed_at)
+                    VALUES (%(key)s, %(capacity)s - %(amount)s,
+                            extract(epoch FROM clock_timestamp()))
+                    ON CONFLICT (key) DO UPDATE
+                       SET tokens = LEAST(
+                               %(capacity)s,
+                               b.tokens + (EXCLUDED.refreshed_at - b.refreshed_at) * %(rate)s
+                           ) - %(amount)s,
+                           refreshed_at = EXCLUDED.refreshed_at
+                    RETURNING b.tokens
+                    """,
+                    key=key,
+                    amount=amount,
+                    rate=rate,
+                    capacity=capacity,
+                )
+            )
+            tokens = cr.fetchone()[0]
+        if tokens >= 0:
+            return 0.0
+        return -tokens / rate
@@ -29,11 +29,15 @@ Correctness
 
 Performance
 ~~~~~~~~~~~
-* **O(n) deduplication** - the original used ``unique |= c`` inside a loop,
-  producing O(n²) record-set union operations for large lists.  The improved
-  version uses a ``dict`` keyed by mobile number.
-* **Single ``create()`` call** - all ``sms.sms`` records are created in one
-  batched ORM call instead of one per contact.
+* **Deduplication in SQL** - the original used ``unique |= c`` inside a
+  loop, producing O(n²) record-set union operations for large lists.
+  Campaigns now fetch only ``id, name, email, mobile`` with
+  ``DISTINCT ON`` the stored, indexed E.164 mobile, so duplicates never
+  leave the database, however the number was typed.
+* **Background campaigns** - *Send to Lists* creates an
+  ``sms.at.campaign`` and returns immediately; the campaign cron renders
+  and creates ``sms.sms`` records in fixed-size batches with a commit per
+  batch, so memory stays flat and web workers are never tied up.
 
 Preview
 ~~~~~~~
@@ -44,13 +48,12 @@ Preview
 from __future__ import annotations
 
 import logging
-import re
-from typing import Any
 
 from odoo import _, api, fields, models
 from odoo.exceptions import UserError, ValidationError
 
 from ..services.sms_encoding import SmsStats, analyse as analyse_sms
+from ..services.template_render import compile_template
 
 _logger = logging.getLogger(__name__)
 
@@ -58,9 +61,6 @@ _logger = logging.getLogger(__name__)
 #  Token configuration
 # ---------------------------------------------------------------------------
 
-#: Regex matching any ``{{token}}`` placeholder in a template body.
-_TOKEN_RE: re.Pattern = re.compile(r"\{\{\s*(\w+)\s*\}\}")
-
 #: Tokens the renderer can resolve, mapped to a human-readable description.
 SUPPORTED_TOKENS: dict[str, str] = {
     "first_name": "Contact's first name",
@@ -79,7 +79,7 @@ _PREVIEW_VALUES: dict[str, str] = {
 
 
 # ---------------------------------------------------------------------------
-#  Token renderer (standalone function - no Odoo dependency, easily tested)
+#  Token renderer (thin wrappers over services.template_render)
 # ---------------------------------------------------------------------------
 
 
@@ -109,11 +109,7 @@ def render_body(body: str, values: dict[str, str]) -> str:
     >>> render_body("Hi {{unknown}}!", {"first_name": "Jane"})
     'Hi {{unknown}}!'
     """
-    def _replacer(match: re.Match) -> str:
-        token = match.group(1).strip()
-        return values.get(token, match.group(0))
-
-    return _TOKEN_RE.sub(_replacer, body)
+    return compile_template(body).render(values)
 
 
 def contact_token_values(contact) -> dict[str, str]:
@@ -133,6 +129,11 @@ def contact_token_values(contact) -> dict[str, str]:
     -------
     dict[str, str]
         Ready-to-use values dict for :func:`render_body`.
+
+    See Also
+    --------
+    services.template_render.contact_columns
+        Columnar equivalent used by campaigns, without ORM records.
     """
     full_name: str = (getattr(contact, "name", "") or "").strip()
     parts = full_name.split(None, 1)  # split on first whitespace only
@@ -145,6 +146,20 @@ def contact_token_values(contact) -> dict[str, str]:
     }
 
 
+def mailing_contact_domain(list_ids: list[int]) -> list:
+    """
+    Domain of the opted-in ``mailing.contact`` records of *list_ids*.
+
+    Odoo 17+ removed the separate per-list subscription model.  Contacts
+    are now linked to lists via a direct Many2many (``list_ids``) and
+    ``opt_out`` is a plain Boolean field on ``mailing.contact`` itself.
+    """
+    return [
+        ("list_ids", "in", list_ids),
+        ("opt_out", "=", False),
+    ]
+
+
 # ---------------------------------------------------------------------------
 #  Model
 # ---------------------------------------------------------------------------
@@ -197,6 +212,21 @@ class SmsAtTemplate(models.Model):
         copy=False,
     )
 
+    campaign_ids = fields.One2many(
+        comodel_name="sms.at.campaign",
+        inverse_name="template_id",
+        string="Campaigns",
+        readonly=True,
+    )
+    campaign_count = fields.Integer(
+        string="Campaign Count",
+        compute="_compute_campaign_count",
+    )
+    campaign_running = fields.Boolean(
+        string="Campaign Running",
+        compute="_compute_campaign_count",
+    )
+
     # Computed summary fields
     char_count = fields.Integer(
         string="Characters",
@@ -239,6 +269,23 @@ class SmsAtTemplate(models.Model):
             tmpl.sms_segments = stats.segments
             tmpl.encoding = stats.encoding
 
+    def _compute_campaign_count(self) -> None:
+        """Count campaigns and flag templates with an unfinished one."""
+        groups = self.env["sms.at.campaign"]._read_group(
+            [("template_id", "in", self.ids)],
+            ["template_id", "state"],
+            ["__count"],
+        )
+        counts: dict[int, int] = {}
+        running: set[int] = set()
+        for template, state, count in groups:
+            counts[template.id] = counts.get(template.id, 0) + count
+            if state in ("running", "paused"):
+                running.add(template.id)
+        for tmpl in self:
+            tmpl.campaign_count = counts.get(tmpl.id, 0)
+            tmpl.campaign_running = tmpl.id in running
+
     # ------------------------------------------------------------------
     #  Validation
     # ------------------------------------------------------------------
@@ -253,7 +300,7 @@ class SmsAtTemplate(models.Model):
         """
         supported = set(SUPPORTED_TOKENS.keys())
         for tmpl in self:
-            found = {m.group(1).strip() for m in _TOKEN_RE.finditer(tmpl.body or "")}
+            found = compile_template(tmpl.body or "").tokens
             unknown = found - supported
             if unknown:
                 bad = ", ".join(f"{{{{{t}}}}}" for t in sorted(unknown))
@@ -273,7 +320,7 @@ class SmsAtTemplate(models.Model):
 
     def action_send_to_lists(self) -> dict:
         """
-        Render and dispatch this template to all eligible mailing-list contacts.
+        Start a background campaign sending this template to its lists.
 
         Eligibility
         -----------
@@ -288,17 +335,24 @@ class SmsAtTemplate(models.Model):
         Deduplication
         -------------
         If the same mobile number appears in multiple lists, the contact is
-        sent exactly one SMS (the first-seen record wins).
+        sent exactly one SMS (the contact with the lowest id wins).  Numbers
+        are compared in E.164 form (``mailing.contact.at_mobile_e164``), so
+        ``+254 712 345 678`` and ``254712345678`` are the same recipient.
+
+        Only the eligibility checks run in this request.  Rendering and
+        record creation are done by the ``sms.at.campaign`` cron, in
+        batches; the body and lists are snapshotted on the campaign.
 
         Returns
         -------
         dict
-            ``display_notification`` client action.
+            Window action opening the new campaign.
 
         Raises
         ------
         UserError
-            When no mailing lists are selected, or no eligible contacts exist.
+            When no mailing lists are selected, no eligible contacts exist,
+            or a campaign of this template is still running or paused.
         """
         self.ensure_one()
 
@@ -307,35 +361,24 @@ class SmsAtTemplate(models.Model):
                 _("Please select at least one mailing list before sending.")
             )
 
-        # ----------------------------------------------------------------
-        # Odoo 17+ removed the separate per-list subscription model.
-        # Contacts are now linked to lists via a direct Many2many (list_ids)
-        # and opt_out is a plain Boolean field on mailing.contact itself.
-        # ----------------------------------------------------------------
-        contacts = self.env["mailing.contact"].search(
-            [
-                ("list_ids", "in", self.mailing_list_ids.ids),
-                ("opt_out", "=", False),
-            ]
-        )
+        if self.campaign_running:
+            raise UserError(
+                _(
+                    "A campaign of this template is still running or paused. "
+                    "Finish or cancel it before starting a new one."
+                )
+            )
 
-        if not contacts:
+        Contact = self.env["mailing.contact"]
+        domain = mailing_contact_domain(self.mailing_list_ids.ids)
+        if not Contact.search_count(domain, limit=1):
             raise UserError(
                 _(
                     "No opted-in contacts found in the selected mailing list(s). "
                     "Make sure the lists contain contacts and none have opted out."
                 )
             )
-
-        # Collect unique contacts that have a mobile number
-        # Use a dict to deduplicate: mobile --> first contact record
-        mobile_to_contact: dict[str, Any] = {}
-        for contact in contacts:
-            mobile = (contact.mobile or "").strip()
-            if mobile and mobile not in mobile_to_contact:
-                mobile_to_contact[mobile] = contact
-
-        if not mobile_to_contact:
+        if not Contact.search_count(domain + [("mobile", "!=", False)], limit=1):
             raise UserError(
                 _(
                     "No opted-in contacts with a mobile number were found in the "
@@ -343,59 +386,37 @@ class SmsAtTemplate(models.Model):
                 )
             )
 
-        total = len(mobile_to_contact)
-        _logger.info(
-            "sms.at.template '%s': rendering for %d unique contact(s).",
-            self.name,
-            total,
+        campaign = self.env["sms.at.campaign"].create(
+            {
+                "name": f"{self.name} - {fields.Datetime.now():%Y-%m-%d %H:%M}",
+                "template_id": self.id,
+                "body": self.body,
+                "mailing_list_ids": [fields.Command.set(self.mailing_list_ids.ids)],
+            }
         )
-
-        # ----------------------------------------------------------------
-        # Render and bulk-create sms.sms records
-        # ----------------------------------------------------------------
-        sms_vals_list: list[dict] = []
-        for mobile, contact in mobile_to_contact.items():
-            rendered = render_body(self.body, contact_token_values(contact))
-            sms_vals_list.append(
-                {
-                    "number": mobile,
-                    "body": rendered,
-                    "state": "outgoing",
-                }
-            )
-
-        # sudo() is required: mailing users don't have sms.sms create rights
-        sms_records = self.env["sms.sms"].sudo().create(sms_vals_list)
-
-        # Dispatch via the overridden _send() which routes to AT
-        sms_records._send()
-
-        # Record timestamp on the template (sudo because mailing users may
-        # not have write access to the template's last_sent field)
-        self.sudo().write({"last_sent": fields.Datetime.now()})
-
-        sent_count = len(sms_records.filtered(lambda s: s.state == "sent"))
+        campaign.action_start()
 
         _logger.info(
-            "sms.at.template '%s': %d/%d dispatched successfully.",
-            self.name,
-            sent_count,
-            total,
+            "sms.at.template '%s': campaign %d started.", self.name, campaign.id
         )
 
         return {
-            "type": "ir.actions.client",
-            "tag": "display_notification",
-            "params": {
-                "title": _("Sent"),
-                "message": _(
-                    "%(sent)d / %(total)d SMS dispatched via Africa's Talking.",
-                    sent=sent_count,
-                    total=total,
-                ),
-                "type": "success" if sent_count == total else "warning",
-                "sticky": sent_count < total,
-            },
+            "type": "ir.actions.act_window",
+            "res_model": "sms.at.campaign",
+            "res_id": campaign.id,
+            "view_mode": "form",
+            "target": "current",
+        }
+
+    def action_view_campaigns(self) -> dict:
+        self.ensure_one()
+        return {
+            "type": "ir.actions.act_window",
+            "name": _("Campaigns"),
+            "res_model": "sms.at.campaign",
+            "view_mode": "list,form",
+            "domain": [("template_id", "=", self.id)],
+            "context": {"default_template_id": self.id},
         }
 
     # ------------------------------------------------------------------
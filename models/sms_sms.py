@@ -23,23 +23,43 @@ Key changes in v1.3
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import threading
+import time
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import timedelta
 from typing import Any
 
+from psycopg2.errors import SerializationFailure
+
 from odoo import _, api, fields, models
 from odoo.exceptions import UserError
+from odoo.tools import SQL
+from odoo.tools.sql import create_index
 
+from ..services.africastalking_async import AsyncAfricasTalkingClient
 from ..services.africastalking_client import (
     AT_BATCH_LIMIT,
+    AT_RETRY_MAX_ATTEMPTS,
     ATError,
     ATRecipientResult,
     AfricasTalkingClient,
+    backoff_delay,
 )
-from ..services.phone_normalizer import PhoneNormalizeError, normalize_e164
+from ..services.http_pool import DEFAULT_MAX_PER_HOST
+from ..services.phone_normalizer import PhoneError, normalize_many, try_normalize_e164
+from ..services.rate_limiter import DispatchRateLimiter, get_rate_limiter
+from ..services.sms_encoding import transliterate_gsm7
+from ..services.template_render import body_digest
+from .sms_at_rate_bucket import PgRateCoordinator
 
 _logger = logging.getLogger(__name__)
 
+_QUEUE_CRON_XMLID = "sms_africastalking_provider.ir_cron_sms_at_queue"
+
 
 class SmsSms(models.Model):
     """Extend sms.sms with Africa's Talking dispatch, cost tracking and retry."""
@@ -47,12 +67,12 @@ class SmsSms(models.Model):
     _inherit = "sms.sms"
 
     # ------------------------------------------------------------------
-    #  Extend state selection with 'queued'
+    #  Extend state selection with 'queued' and 'dispatching'
     # ------------------------------------------------------------------
 
     state = fields.Selection(
-        selection_add=[("queued", "Queued for AT")],
-        ondelete={"queued": "set default"},
+        selection_add=[("queued", "Queued for AT"), ("dispatching", "Dispatching")],
+        ondelete={"queued": "set default", "dispatching": "set default"},
     )
 
     # ------------------------------------------------------------------
@@ -99,6 +119,116 @@ class SmsSms(models.Model):
         ),
     )
 
+    at_retry_count = fields.Integer(
+        string="AT Retries",
+        readonly=True,
+        copy=False,
+        help=(
+            "Number of automatic retries already scheduled after temporary "
+            "Africa's Talking failures (HTTP 5xx, timeouts, network errors)."
+        ),
+    )
+    at_next_attempt = fields.Datetime(
+        string="Next Attempt",
+        readonly=True,
+        copy=False,
+        index=True,
+        help=(
+            "Earliest time the queue cron may dispatch this record again.  "
+            "Empty means immediately."
+        ),
+    )
+
+    at_campaign_id = fields.Many2one(
+        comodel_name="sms.at.campaign",
+        string="AT Campaign",
+        readonly=True,
+        copy=False,
+        index="btree_not_null",
+        ondelete="set null",
+        help="Template campaign this message was rendered for, if any.",
+    )
+
+    at_body_digest = fields.Char(
+        string="Body Digest",
+        readonly=True,
+        copy=False,
+        help=(
+            "SHA-1 of the message body, set on create and whenever the body "
+            "changes.  The queue claim and the dispatcher group messages by "
+            "it instead of by body."
+        ),
+    )
+
+    at_number_e164 = fields.Char(
+        string="E.164 Number",
+        readonly=True,
+        copy=False,
+        help=(
+            "The number normalised to E.164, set on create and whenever the "
+            "number changes; this is the value sent to Africa's Talking.  "
+            "Empty when the number is invalid."
+        ),
+    )
+
+    def init(self) -> None:
+        super().init()
+        # Serves the queue claim, which batches queued rows by digest.
+        create_index(
+            self.env.cr,
+            "sms_sms_at_body_digest_queued_index",
+            self._table,
+            ["at_body_digest", "id"],
+            where="state = 'queued'",
+        )
+
+    # ------------------------------------------------------------------
+    #  Body digest and E.164 number maintenance
+    # ------------------------------------------------------------------
+
+    @api.model_create_multi
+    def create(self, vals_list: list[dict]) -> "SmsSms":
+        # Bulk creates (campaigns, mass mailings) repeat the same body many
+        # times; hash each distinct body once per call.
+        digests: dict[str, str] = {}
+        for vals in vals_list:
+            body = vals.get("body")
+            if body and not vals.get("at_body_digest"):
+                digest = digests.get(body)
+                if digest is None:
+                    digest = digests[body] = body_digest(body)
+                vals["at_body_digest"] = digest
+
+        # Normalise every number of the call in one bulk pass.
+        to_normalise = [vals for vals in vals_list if "at_number_e164" not in vals]
+        numbers, _errors = normalize_many(
+            [vals.get("number") for vals in to_normalise],
+            default_country=self._at_default_country() if to_normalise else "",
+        )
+        for vals, number in zip(to_normalise, numbers):
+            vals["at_number_e164"] = number or False
+        return super().create(vals_list)
+
+    def write(self, vals: dict) -> bool:
+        if "body" in vals and "at_body_digest" not in vals:
+            vals = dict(
+                vals,
+                at_body_digest=body_digest(vals["body"]) if vals["body"] else False,
+            )
+        if "number" in vals and "at_number_e164" not in vals:
+            vals = dict(
+                vals,
+                at_number_e164=try_normalize_e164(
+                    vals["number"], self._at_default_country()
+                ) or False,
+            )
+        return super().write(vals)
+
+    @api.model
+    def _at_default_country(self) -> str:
+        """Calling code used to expand national-format numbers (may be empty)."""
+        return self.env["res.config.settings"]._get_at_credentials()["default_country_code"]
+
     # ------------------------------------------------------------------
     #  Core override: _send()
     # ------------------------------------------------------------------
@@ -161,7 +291,20 @@ class SmsSms(models.Model):
         if not pending:
             return
 
-        pending.write({"state": "queued", "at_failure_reason": False})
+        # ---- Fail invalid numbers now instead of at dispatch time ------
+        invalid = pending._at_check_numbers()
+        pending -= invalid
+        if not pending:
+            return
+
+        pending.write(
+            {
+                "state": "queued",
+                "at_failure_reason": False,
+                "at_retry_count": 0,
+                "at_next_attempt": False,
+            }
+        )
 
         _logger.info(
             "sms_africastalking: %d record(s) marked 'queued' "
@@ -170,6 +313,53 @@ class SmsSms(models.Model):
         )
         # The cron _process_africastalking_queue() will handle actual dispatch.
 
+    def _at_check_numbers(self) -> "SmsSms":
+        """
+        Mark records without a valid E.164 number as error.
+
+        Records that have no ``at_number_e164`` (invalid numbers, or records
+        created before the field existed) are normalised once more in bulk,
+        with the current default country code, so a resend picks up a newly
+        configured country;
+        numbers that turn out valid are stored, the others fail with one
+        write per failure class.
+
+        Returns
+        -------
+        SmsSms
+            The records marked as error.
+        """
+        missing = self.filtered(lambda s: not s.at_number_e164)
+        if not missing:
+            return self.browse()
+
+        numbers, errors = normalize_many(
+            missing.mapped("number"), default_country=self._at_default_country()
+        )
+        invalid_ids: dict[int, list[int]] = defaultdict(list)
+        for sms, number, error in zip(missing, numbers, errors):
+            if error:
+                invalid_ids[error].append(sms.id)
+            else:
+                sms.at_number_e164 = number
+
+        for error, ids in invalid_ids.items():
+            error = PhoneError(error)
+            _logger.warning(
+                "sms_africastalking: %d record(s) with invalid numbers (%s) "
+                "marked as error.",
+                len(ids),
+                error.code,
+            )
+            self.browse(ids).write(
+                {
+                    "state": "error",
+                    "failure_type": "sms_number_format",
+                    "at_failure_reason": error.description,
+                }
+            )
+        return self.browse([sms_id for ids in invalid_ids.values() for sms_id in ids])
+
     # ------------------------------------------------------------------
     #  Cron worker: _process_africastalking_queue()
     # ------------------------------------------------------------------
@@ -177,22 +367,30 @@ class SmsSms(models.Model):
     @api.model
     def _process_africastalking_queue(self) -> None:
         """
-        Cron-called method: fetch queued records and dispatch via AT.
+        Cron-called method: claim queued records and dispatch via AT.
 
         Designed to be called by the ``ir.cron`` entry in
-        ``data/sms_cron.xml`` (every minute).  Processes up to
-        :data:`~services.AT_BATCH_LIMIT` records per run so each cron
-        execution completes quickly.  The natural 60-second cadence of
-        the cron provides rate limiting without any ``time.sleep()``.
+        ``data/sms_cron.xml`` (every minute).  Records are processed in
+        batches of :data:`~services.AT_BATCH_LIMIT`.  In drain mode (the
+        default) the run keeps claiming batches until the queue is empty or
+        the configured time budget (``sms_africastalking.drain_time_budget``)
+        is spent; with a budget of ``0`` exactly one batch is processed.
+
+        Several cron workers (or Odoo nodes) may run this concurrently:
+        :meth:`_at_claim_queued` hands each of them a disjoint batch.
 
         Workflow
         --------
         1. Read credentials; skip silently if not configured.
-        2. Fetch at most ``AT_BATCH_LIMIT`` records with ``state='queued'``.
-        3. Build an :class:`~services.AfricasTalkingClient` and call
+        2. Build an :class:`~services.AfricasTalkingClient`.
+        3. Claim at most ``AT_BATCH_LIMIT`` records with ``state='queued'``,
+           moving them to ``state='dispatching'``, and call
            ``_at_dispatch_all()``.
-        4. Any record still ``queued`` after dispatch (unexpected) is
+        4. Any record still ``dispatching`` after dispatch (unexpected) is
            marked ``error`` to avoid getting stuck.
+        5. Commit, then repeat from 3 while the budget allows.  When the
+           budget runs out with work remaining, the cron re-triggers itself
+           instead of waiting for its next scheduled minute.
         """
         creds = self.env["res.config.settings"]._get_at_credentials()
 
@@ -205,10 +403,70 @@ class SmsSms(models.Model):
             )
             return
 
-        queued = self.search([("state", "=", "queued")], limit=AT_BATCH_LIMIT)
-        if not queued:
+        client_class = (
+            AsyncAfricasTalkingClient
+            if creds.get("dispatch_engine") == "asyncio"
+            else AfricasTalkingClient
+        )
+        client = client_class(
+            username=creds["username"],
+            api_key=creds["api_key"],
+            sender_id=creds.get("sender_id", ""),
+            sandbox=creds["sandbox"],
+            timeout=creds.get("request_timeout", 30),
+            rate_limiter=self._at_rate_limiter(creds),
+            base_url=creds.get("api_base_url", ""),
+        )
+
+        # ---- Drain loop -------------------------------------------------
+        time_budget = creds.get("drain_time_budget", 0)
+        deadline = time.monotonic() + time_budget
+        auto_commit = not getattr(threading.current_thread(), "testing", False)
+        batches = processed = 0
+
+        while True:
+            count = self._at_process_queue_batch(client, creds)
+            if not count:
+                break
+            batches += 1
+            processed += count
+            if auto_commit:
+                # Persist this batch's results and release its row locks
+                # before claiming the next one.
+                self.env.cr.commit()
+            if count < AT_BATCH_LIMIT or not time_budget:
+                break  # queue drained, or drain mode disabled
+            if time.monotonic() >= deadline:
+                if self.search_count(self._at_due_domain(), limit=1):
+                    self._at_trigger_queue_cron()
+                break
+
+        if batches:
+            _logger.info(
+                "sms_africastalking cron: %d record(s) processed in %d batch(es).",
+                processed,
+                batches,
+            )
+        else:
             _logger.debug("sms_africastalking cron: no queued records.")
-            return
+
+    @api.model
+    def _at_process_queue_batch(
+        self,
+        client: AfricasTalkingClient | AsyncAfricasTalkingClient,
+        creds: dict,
+    ) -> int:
+        """
+        Claim and dispatch one batch of up to ``AT_BATCH_LIMIT`` records.
+
+        Returns
+        -------
+        int
+            Number of records claimed (``0`` when the queue is empty).
+        """
+        queued = self._at_claim_queued(AT_BATCH_LIMIT)
+        if not queued:
+            return 0
 
         _logger.info(
             "sms_africastalking cron: processing %d queued record(s) "
@@ -218,25 +476,28 @@ class SmsSms(models.Model):
             creds.get("sender_id") or "(shared short-code)",
         )
 
-        client = AfricasTalkingClient(
-            username=creds["username"],
-            api_key=creds["api_key"],
-            sender_id=creds.get("sender_id", ""),
-            sandbox=creds["sandbox"],
-            timeout=creds.get("request_timeout", 30),
-        )
-
+        # The savepoint keeps the cursor usable for the safety net below when
+        # dispatch fails on a SQL error.  Chunk results are applied in their
+        # own savepoints inside _at_dispatch_all and never raise out of it,
+        # so rolling back here cannot undo results AT already returned.
         try:
-            self._at_dispatch_all(queued, client)
+            with self.env.cr.savepoint():
+                self._at_dispatch_all(
+                    queued,
+                    client,
+                    max_in_flight=creds.get("max_in_flight", 1),
+                    max_attempts=creds.get("retry_max_attempts", AT_RETRY_MAX_ATTEMPTS),
+                    transliterate=creds.get("transliterate_gsm7", False),
+                )
         except Exception:
             _logger.exception("sms_africastalking cron: unexpected error during dispatch.")
 
-        # Safety net: any record still 'queued' after dispatch failed to update
-        still_queued = queued.filtered(lambda s: s.state == "queued")
+        # Safety net: any record still 'dispatching' after dispatch failed to update
+        still_queued = queued.filtered(lambda s: s.state == "dispatching")
         if still_queued:
             _logger.error(
-                "sms_africastalking cron: %d record(s) still 'queued' after dispatch — "
-                "marking as error.",
+                "sms_africastalking cron: %d record(s) still 'dispatching' after "
+                "dispatch — marking as error.",
                 len(still_queued),
             )
             still_queued.write(
@@ -246,6 +507,137 @@ class SmsSms(models.Model):
                     "at_failure_reason": "Cron dispatch completed without updating this record.",
                 }
             )
+        return len(queued)
+
+    @api.model
+    def _at_rate_limiter(self, creds: dict) -> DispatchRateLimiter | None:
+        """
+        Return the rate limiter every AT call of this run must go through.
+
+        Without worker coordination the in-process limiter is shared by all
+        dispatch threads of this worker; with it, each call reserves its
+        budget in ``sms.at.rate.bucket`` so all workers share one budget.
+        """
+        recipients_rate = creds.get("rate_recipients_per_sec", 0)
+        requests_rate = creds.get("rate_requests_per_sec", 0)
+        if not recipients_rate and not requests_rate:
+            return None
+        if creds.get("rate_coordinate_workers"):
+            return DispatchRateLimiter(
+                recipients_rate,
+                requests_rate,
+                coordinator=PgRateCoordinator(self.env.registry),
+                key=f"sms_at:{creds['username']}",
+            )
+        return get_rate_limiter(recipients_rate, requests_rate)
+
+    @api.model
+    def _at_due_domain(self) -> list:
+        """Domain of queued records whose next attempt is due.
+
+        Records of a paused campaign are held back until it resumes.
+        """
+        return [
+            ("state", "=", "queued"),
+            "|",
+            ("at_next_attempt", "=", False),
+            ("at_next_attempt", "<=", fields.Datetime.now()),
+            ("at_campaign_id", "not any", [("state", "=", "paused")]),
+        ]
+
+    @api.model
+    def _at_due_sql(self, alias: str) -> SQL:
+        """SQL counterpart of :meth:`_at_due_domain` for table alias *alias*."""
+        return SQL(
+            """
+            %(t)s.state = 'queued'
+            AND (%(t)s.at_next_attempt IS NULL
+                 OR %(t)s.at_next_attempt <= (now() AT TIME ZONE 'UTC'))
+            AND (%(t)s.at_campaign_id IS NULL
+                 OR %(t)s.at_campaign_id NOT IN (
+                     SELECT id FROM sms_at_campaign WHERE state = 'paused'))
+            """,
+            t=SQL.identifier(alias),
+        )
+
+    @api.model
+    def _at_trigger_queue_cron(self) -> None:
+        """Ask ``ir.cron`` to run the queue processor again as soon as possible."""
+        cron = self.env.ref(_QUEUE_CRON_XMLID, raise_if_not_found=False)
+        if cron:
+            cron._trigger()
+
+    @api.model
+    def _at_claim_queued(self, limit: int) -> "SmsSms":
+        """
+        Atomically claim up to *limit* due queued records for this transaction.
+
+        Records waiting for a retry backoff (``at_next_attempt`` in the
+        future), or belonging to a paused campaign, are left alone.
+
+        The batch starts with every due row sharing the body of the oldest
+        due row (so no message waits behind newer ones) and is filled up
+        with further rows ordered by ``at_body_digest``, so identical bodies
+        are claimed together and the dispatcher gets full
+        ``AT_BATCH_LIMIT`` chunks instead of fragments.
+
+        A single ``UPDATE ... WHERE id IN (SELECT ... FOR UPDATE SKIP
+        LOCKED)`` moves the rows to ``state='dispatching'``.  Rows already
+        locked by another worker are skipped rather than waited on, so
+        concurrent runs never receive the same record.  The claim is part of
+        the caller's transaction: if the run crashes before committing, the
+        rows roll back to ``queued``.
+
+        Returns
+        -------
+        SmsSms
+            The claimed records (possibly empty).
+        """
+        self.flush_model(["state", "at_body_digest"])
+        self.env["sms.at.campaign"].flush_model(["state"])
+        table = SQL.identifier(self._table)
+        try:
+            with self.env.cr.savepoint():
+                self.env.cr.execute(
+                    SQL(
+                        """
+                        UPDATE %(table)s
+                           SET state = 'dispatching',
+                               write_date = (now() AT TIME ZONE 'UTC')
+                         WHERE id IN (
+                                SELECT q.id
+                                  FROM %(table)s AS q
+                                 WHERE %(q_due)s
+                              ORDER BY q.at_body_digest IS DISTINCT FROM (
+                                           SELECT h.at_body_digest
+                                             FROM %(table)s AS h
+                                            WHERE %(h_due)s
+                                         ORDER BY h.id
+                                            LIMIT 1),
+                                       q.at_body_digest,
+                                       q.id
+                                 LIMIT %(limit)s
+                                   FOR UPDATE SKIP LOCKED
+                               )
+                     RETURNING id
+                        """,
+                        table=table,
+                        q_due=self._at_due_sql("q"),
+                        h_due=self._at_due_sql("h"),
+                        limit=limit,
+                    )
+                )
+                ids = [row[0] for row in self.env.cr.fetchall()]
+        except SerializationFailure:
+            # Another worker committed a claim on rows visible in our
+            # snapshot; they are no longer ours to take.  Next run retries.
+            _logger.info(
+                "sms_africastalking cron: queue claim raced with another worker — "
+                "retrying on the next run."
+            )
+            return self.browse()
+        self.invalidate_model(["state", "write_date"])
+        return self.browse(sorted(ids))
 
     # ------------------------------------------------------------------
     #  Dispatch orchestration (called by cron)
@@ -254,79 +646,120 @@ class SmsSms(models.Model):
     def _at_dispatch_all(
         self,
         records: "SmsSms",
-        client: AfricasTalkingClient,
+        client: AfricasTalkingClient | AsyncAfricasTalkingClient,
+        max_in_flight: int = 1,
+        max_attempts: int = AT_RETRY_MAX_ATTEMPTS,
+        transliterate: bool = False,
     ) -> None:
         """
         Orchestrate full dispatch of *records* through *client*.
 
         Steps
         -----
-        1. Normalise phone numbers; mark invalid records as error immediately.
-        2. Group valid records by message body (AT requires one body per
-           API call to return per-recipient ``messageId`` values).
-        3. Chunk each body group by :data:`~services.AT_BATCH_LIMIT` and
-           call the AT API.
-
-        No ``time.sleep()`` is used here.  Rate limiting is achieved by the
-        cron cadence (one run per minute processes at most ``AT_BATCH_LIMIT``
-        records).
+        1. Read the E.164 numbers stored at create time.  Records without
+           one are normalised here and, if invalid, marked as error with
+           one write per failure class.
+        2. Group valid records by ``at_body_digest`` (AT requires one body
+           per API call to return per-recipient ``messageId`` values); the
+           body of each group is read from a single record.  Records created
+           before the digest existed are grouped by body.
+        3. Chunk each body group by :data:`~services.AT_BATCH_LIMIT`.  With
+           *transliterate*, each group's body is first passed through
+           :func:`~services.sms_encoding.transliterate_gsm7`, once per group;
+           the stored ``body`` is left as written.
+        4. Call the AT API for every chunk, keeping up to *max_in_flight*
+           calls in flight - on worker threads for an
+           :class:`~services.AfricasTalkingClient`, on an event loop for an
+           :class:`~services.africastalking_async.AsyncAfricasTalkingClient`.
+           This step only performs HTTP; it never touches the ORM.
+        5. Apply the results on this cursor, in chunk order, once the
+           responses are back.  Chunks hit by a retryable error are
+           re-queued with backoff until *max_attempts* is reached.  Each
+           chunk is applied in its own savepoint: if writing one chunk's
+           results fails, only that chunk is rolled back (its records stay
+           ``dispatching``) and the other chunks' results are kept.
+
+        Rate limiting is enforced by the client's
+        :class:`~services.rate_limiter.DispatchRateLimiter` (if any), which
+        every dispatch thread shares.
         """
-        # ---- Step 1: phone normalisation --------------------------------
+        # Load only what dispatch needs; bodies of digest-tagged records are
+        # read once per group in step 2.
+        records.fetch(["at_number_e164", "at_body_digest"])
+
+        # ---- Step 1: E.164 numbers --------------------------------------
+        # Numbers were normalised when the records were created; only
+        # records queued before that (no at_number_e164) are checked here.
+        failed = records._at_check_numbers()
+        valid_records: list[Any] = list(records - failed)
         # ORM proxy objects do not support arbitrary attribute assignment, so
-        # we track normalised numbers in a plain dict keyed by record ID.
-        normalised_map: dict[int, str] = {}
-        valid_records: list[Any] = []
-
-        for sms in records:
-            try:
-                normalised = normalize_e164(sms.number or "")
-            except PhoneNormalizeError as exc:
-                _logger.warning(
-                    "sms_africastalking: invalid number %r for record %d — %s",
-                    sms.number,
-                    sms.id,
-                    exc,
-                )
-                sms.write(
-                    {
-                        "state": "error",
-                        "failure_type": "sms_number_format",
-                        "at_failure_reason": str(exc)[:255],
-                    }
-                )
-                continue
-
-            normalised_map[sms.id] = normalised
-            valid_records.append(sms)
+        # we track the numbers in a plain dict keyed by record ID.
+        normalised_map: dict[int, str] = {
+            sms.id: sms.at_number_e164 for sms in valid_records
+        }
 
         if not valid_records:
             _logger.info("sms_africastalking: no valid numbers to dispatch.")
             return
 
         # ---- Step 2: group by body --------------------------------------
-        by_body: dict[str, list[Any]] = defaultdict(list)
+        by_key: dict[tuple[str, str], list[Any]] = defaultdict(list)
         for sms in valid_records:
-            by_body[sms.body].append(sms)
-
-        # ---- Step 3: chunk and send -------------------------------------
-        for body, sms_list in by_body.items():
+            if sms.at_body_digest:
+                by_key[("digest", sms.at_body_digest)].append(sms)
+            else:
+                by_key[("body", sms.body)].append(sms)
+
+        # ---- Step 3: chunk ----------------------------------------------
+        jobs: list[_ATChunkJob] = []
+        segments_saved = 0
+        for (kind, key), sms_list in by_key.items():
+            # A fresh browse() keeps the read to this one record's body.
+            body = self.browse(sms_list[0].id).body if kind == "digest" else key
+            if transliterate:
+                body, saved = transliterate_gsm7(body)
+                segments_saved += saved * len(sms_list)
             for i in range(0, len(sms_list), AT_BATCH_LIMIT):
                 chunk = sms_list[i : i + AT_BATCH_LIMIT]
-                self._at_send_chunk(chunk, body, client, normalised_map)
+                jobs.append(_ATChunkJob.from_chunk(chunk, body, normalised_map))
+        if segments_saved:
+            _logger.info(
+                "sms_africastalking: GSM-7 transliteration saved %d SMS segment(s).",
+                segments_saved,
+            )
 
-    def _at_send_chunk(
+        # ---- Step 4: send (HTTP only) -----------------------------------
+        outcomes = _send_jobs(jobs, client, max_in_flight)
+
+        # ---- Step 5: write results back ---------------------------------
+        for job, outcome in zip(jobs, outcomes):
+            try:
+                with self.env.cr.savepoint():
+                    self._at_apply_chunk_result(job, outcome, max_attempts=max_attempts)
+            except Exception:
+                _logger.exception(
+                    "sms_africastalking: could not record the outcome of a "
+                    "%d-number chunk; its records stay 'dispatching'.",
+                    len(job.numbers),
+                )
+
+    def _at_apply_chunk_result(
         self,
-        chunk: list[Any],
-        body: str,
-        client: AfricasTalkingClient,
-        normalised_map: dict,
+        job: "_ATChunkJob",
+        outcome: list[ATRecipientResult] | ATError,
+        max_attempts: int = AT_RETRY_MAX_ATTEMPTS,
     ) -> None:
         """
-        Send one chunk (<=AT_BATCH_LIMIT) of records sharing *body*.
+        Write the outcome of one AT call back to the chunk's ORM records.
+
+        Maps per-recipient results through the job's number --> [records]
+        mapping (handles duplicate numbers correctly).  Any number not
+        mentioned in the AT response is marked as an error.
 
-        Builds a number --> [records] mapping (handles duplicate numbers
-        correctly), calls the AT API, and writes results back to ORM records.
-        Any number not mentioned in the AT response is marked as an error.
+        Records receiving identical values are updated with one recordset
+        ``write()`` per distinct value set, and message IDs with a single
+        ``UPDATE ... FROM (VALUES ...)``, so a 1 000-recipient chunk costs a
+        handful of queries instead of one per record.
 
         Logging
         -------
@@ -340,57 +773,48 @@ class SmsSms(models.Model):
 
         Parameters
         ----------
-        chunk:
-            List of ``sms.sms`` browse records, all sharing the same body.
-        body:
-            Common SMS body text for this chunk.
-        client:
-            Configured :class:`~services.AfricasTalkingClient` instance.
-        normalised_map:
-            Dict mapping record id --> E.164 number string.
+        job:
+            The chunk that was sent.
+        outcome:
+            Per-recipient results, or the :class:`~services.ATError` raised
+            by the API call.
+        max_attempts:
+            Total attempts allowed for a retryable ``ATError`` before the
+            records are marked ``error`` for good.
         """
-        # Map normalised number --> list of records (handles duplicates correctly)
-        num_to_records: dict[str, list[Any]] = defaultdict(list)
-        for sms in chunk:
-            num_to_records[normalised_map[sms.id]].append(sms)
-
-        numbers = list(num_to_records.keys())
-
-        _logger.info(
-            "sms_africastalking: sending chunk — %d number(s), body %d char(s).",
-            len(numbers),
-            len(body),
-        )
+        num_to_records = job.num_to_records
 
-        try:
-            results: list[ATRecipientResult] = client.send(
-                to=numbers,
-                message=body,
-            )
-        except ATError as exc:
+        if isinstance(outcome, ATError):
             _logger.error(
                 "sms_africastalking: AT API error for %d number(s): %s",
-                len(numbers),
-                exc,
+                len(job.numbers),
+                outcome,
+            )
+            records = self.browse(
+                [sms.id for sms_list in num_to_records.values() for sms in sms_list]
+            )
+            if outcome.retryable:
+                records = records._at_schedule_retry(str(outcome), max_attempts)
+            records.write(
+                {
+                    "state": "error",
+                    "failure_type": "sms_server",
+                    "at_failure_reason": str(outcome)[:255],
+                }
             )
-            failure_reason = str(exc)[:255]
-            for sms_list in num_to_records.values():
-                for sms in sms_list:
-                    sms.write(
-                        {
-                            "state": "error",
-                            "failure_type": "sms_server",
-                            "at_failure_reason": failure_reason,
-                        }
-                    )
             return
 
         # ------------------------------------------------------------------
         #  Map per-recipient results back to ORM records
         # ------------------------------------------------------------------
+        # Records sharing an identical value set are written together;
+        # at_message_id is the only truly per-row value and is applied
+        # separately in a single statement.
+        buckets: dict[tuple, list[int]] = defaultdict(list)
+        message_ids: list[tuple[int, str]] = []
         responded: set[str] = set()
 
-        for result in results:
+        for result in outcome:
             number = result.number
             responded.add(number)
             target_records = num_to_records.get(number)
@@ -436,15 +860,22 @@ class SmsSms(models.Model):
                     result.status_code,
                 )
 
-            if result.message_id:
-                vals["at_message_id"] = result.message_id
-
+            key = _vals_key(vals)
             for sms in target_records:
-                sms.write(vals)
+                buckets[key].append(sms.id)
+                if result.message_id:
+                    message_ids.append((sms.id, result.message_id))
 
         # ------------------------------------------------------------------
         #  Mark numbers absent from AT response as server errors
         # ------------------------------------------------------------------
+        absent_key = _vals_key(
+            {
+                "state": "error",
+                "failure_type": "sms_server",
+                "at_failure_reason": "Number not present in AT response.",
+            }
+        )
         for number, sms_list in num_to_records.items():
             if number not in responded:
                 _logger.warning(
@@ -452,14 +883,90 @@ class SmsSms(models.Model):
                     "marking as sms_server error.",
                     number,
                 )
-                for sms in sms_list:
-                    sms.write(
-                        {
-                            "state": "error",
-                            "failure_type": "sms_server",
-                            "at_failure_reason": "Number not present in AT response.",
-                        }
-                    )
+                buckets[absent_key].extend(sms.id for sms in sms_list)
+
+        for key, ids in buckets.items():
+            self.browse(ids).write(dict(key))
+        self._at_write_message_ids(message_ids)
+
+    def _at_schedule_retry(self, reason: str, max_attempts: int) -> "SmsSms":
+        """
+        Re-queue records in *self* for a delayed retry after a temporary error.
+
+        Each record gets one more ``at_retry_count`` and an
+        ``at_next_attempt`` computed with jittered exponential backoff.
+        Records grouped by retry count share one write.
+
+        Returns
+        -------
+        SmsSms
+            The records that exhausted *max_attempts* and were **not**
+            re-queued; the caller decides how to fail them.
+        """
+        by_count: dict[int, list[int]] = defaultdict(list)
+        exhausted = self.browse()
+        for sms in self:
+            if sms.at_retry_count + 1 < max_attempts:
+                by_count[sms.at_retry_count + 1].append(sms.id)
+            else:
+                exhausted |= sms
+
+        now = fields.Datetime.now()
+        for attempt, ids in by_count.items():
+            delay = backoff_delay(attempt)
+            _logger.warning(
+                "sms_africastalking: %d record(s) re-queued for retry %d/%d "
+                "in %.0fs — %s",
+                len(ids),
+                attempt,
+                max_attempts - 1,
+                delay,
+                reason,
+            )
+            self.browse(ids).write(
+                {
+                    "state": "queued",
+                    "at_retry_count": attempt,
+                    "at_next_attempt": now + timedelta(seconds=delay),
+                    "at_failure_reason": reason[:255],
+                }
+            )
+        if exhausted:
+            _logger.error(
+                "sms_africastalking: %d record(s) gave up after %d attempt(s).",
+                len(exhausted),
+                max_attempts,
+            )
+        return exhausted
+
+    def _at_write_message_ids(self, pairs: list[tuple[int, str]]) -> None:
+        """
+        Set ``at_message_id`` on many records with one ``UPDATE`` statement.
+
+        Parameters
+        ----------
+        pairs:
+            ``(record_id, at_message_id)`` tuples.
+        """
+        if not pairs:
+            return
+        self.flush_model(["at_message_id"])
+        self.env.cr.execute(
+            SQL(
+                """
+                UPDATE %(table)s AS s
+                   SET at_message_id = v.message_id
+                  FROM (VALUES %(values)s) AS v(id, message_id)
+                 WHERE s.id = v.id
+                """,
+                table=SQL.identifier(self._table),
+                values=SQL(", ").join(
+                    SQL("(%s, %s)", record_id, message_id)
+                    for record_id, message_id in pairs
+                ),
+            )
+        )
+        self.invalidate_model(["at_message_id"])
 
     # ------------------------------------------------------------------
     #  Retry button
@@ -500,7 +1007,14 @@ class SmsSms(models.Model):
             "sms_africastalking: Retrying failed SMS\n  Count: %d", len(failed)
         )
 
-        failed.write({"state": "outgoing", "at_failure_reason": False})
+        failed.write(
+            {
+                "state": "outgoing",
+                "at_failure_reason": False,
+                "at_retry_count": 0,
+                "at_next_attempt": False,
+            }
+        )
         failed._send()  # AT provider: marks them 'queued'; IAP: sends immediately
 
         now_queued = failed.filtered(lambda s: s.state == "queued")
@@ -545,6 +1059,107 @@ class SmsSms(models.Model):
 # ---------------------------------------------------------------------------
 
 
+@dataclass
+class _ATChunkJob:
+    """One AT API call: a body and up to AT_BATCH_LIMIT distinct numbers."""
+
+    body: str
+    num_to_records: dict[str, list[Any]]
+    numbers: list[str]
+
+    @classmethod
+    def from_chunk(
+        cls, chunk: list[Any], body: str, normalised_map: dict
+    ) -> "_ATChunkJob":
+        # Map normalised number --> list of records (handles duplicates correctly)
+        num_to_records: dict[str, list[Any]] = defaultdict(list)
+        for sms in chunk:
+            num_to_records[normalised_map[sms.id]].append(sms)
+        return cls(
+            body=body,
+            num_to_records=num_to_records,
+            numbers=list(num_to_records.keys()),
+        )
+
+
+def _send_job(
+    job: _ATChunkJob, client: AfricasTalkingClient
+) -> list[ATRecipientResult] | ATError:
+    """
+    Perform the AT call for *job*; return the results or the ``ATError``.
+
+    Never raises: any other exception (a client-side ``ValueError``, an
+    unexpected AT response, a rate-coordinator DB error, ...) is wrapped in
+    a non-retryable ``ATError``, so one failing chunk never discards the
+    outcomes of chunks AT already accepted.
+
+    Safe to run on a worker thread: touches no ORM state.
+    """
+    _logger.info(
+        "sms_africastalking: sending chunk — %d number(s), body %d char(s).",
+        len(job.numbers),
+        len(job.body),
+    )
+    try:
+        return client.send(to=job.numbers, message=job.body)
+    except ATError as exc:
+        return exc
+    except Exception as exc:
+        _logger.exception("sms_africastalking: unexpected error while sending a chunk.")
+        return ATError(f"Unexpected dispatch error: {exc}")
+
+
+def _send_jobs(
+    jobs: list[_ATChunkJob],
+    client: AfricasTalkingClient | AsyncAfricasTalkingClient,
+    max_in_flight: int,
+) -> list[list[ATRecipientResult] | ATError]:
+    """
+    Send every job, at most *max_in_flight* at a time.
+
+    Outcomes are returned in the same order as *jobs*, whatever order the
+    responses arrive in, so results map back to records deterministically.
+    """
+    if isinstance(client, AsyncAfricasTalkingClient):
+        return asyncio.run(_send_jobs_async(jobs, client, max_in_flight))
+
+    if max_in_flight <= 1 or len(jobs) <= 1:
+        return [_send_job(job, client) for job in jobs]
+
+    # Never run more threads than the keep-alive pool has slots per host.
+    workers = min(max_in_flight, len(jobs), DEFAULT_MAX_PER_HOST)
+    _logger.info(
+        "sms_africastalking: dispatching %d chunk(s) with %d call(s) in flight.",
+        len(jobs),
+        workers,
+    )
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="sms_at_dispatch"
+    ) as executor:
+        return list(executor.map(lambda job: _send_job(job, client), jobs))
+
+
+async def _send_jobs_async(
+    jobs: list[_ATChunkJob],
+    client: AsyncAfricasTalkingClient,
+    max_in_flight: int,
+) -> list[list[ATRecipientResult] | ATError]:
+    """Event-loop counterpart of :func:`_send_jobs` (one loop per batch)."""
+    _logger.info(
+        "sms_africastalking: dispatching %d chunk(s) on asyncio, "
+        "up to %d call(s) in flight.",
+        len(jobs),
+        max_in_flight,
+    )
+    try:
+        return await client.send_many(
+            [(job.numbers, job.body) for job in jobs], max_in_flight=max_in_flight
+        )
+    finally:
+        # Stream connections are bound to this loop; close them with it.
+        await client.aclose()
+
+
 def _parse_cost_float(cost_str: str) -> float:
     """
     Parse an AT cost string into a plain float.
@@ -569,6 +1184,11 @@ def _parse_cost_float(cost_str: str) -> float:
     return 0.0
 
 
+def _vals_key(vals: dict[str, Any]) -> tuple:
+    """Hashable, order-independent key for a write() value dict."""
+    return tuple(sorted(vals.items()))
+
+
 def _at_failure_description(result: ATRecipientResult) -> str:
     """Build a human-readable failure string from an ATRecipientResult."""
     description = f"{result.status} (code {result.status_code})"
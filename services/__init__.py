@@ -8,9 +8,13 @@ services/
 Pure-Python helpers used by Odoo models.  No Odoo imports live here so
 every module in this package is independently unit-testable.
 """
+from .africastalking_async import AsyncAfricasTalkingClient  # noqa: F401
 from .africastalking_client import (  # noqa: F401
     AT_BATCH_LIMIT,
     AT_BUFFERED_STATUSES,
+    AT_DEFAULT_RECIPIENTS_PER_SEC,
+    AT_DEFAULT_REQUESTS_PER_SEC,
+    AT_RETRY_MAX_ATTEMPTS,
     AT_SUCCESS_STATUSES,
     ATAuthError,
     ATError,
@@ -19,14 +23,40 @@ from .africastalking_client import (  # noqa: F401
     AfricasTalkingClient,
     LIVE_URL,
     SANDBOX_URL,
+    backoff_delay,
+)
+from .http_pool import (  # noqa: F401
+    ConnectionPool,
+    RequestOutcomeUnknown,
+    get_shared_pool,
 )
 from .phone_normalizer import (  # noqa: F401
+    ERROR_DESCRIPTIONS as PHONE_ERROR_DESCRIPTIONS,
+    PhoneError,
     PhoneNormalizeError,
     normalize_e164,
+    normalize_many as normalize_e164_many,
     try_normalize_e164,
 )
+from .rate_limiter import (  # noqa: F401
+    DispatchRateLimiter,
+    TokenBucket,
+    get_rate_limiter,
+)
+from .template_render import (  # noqa: F401
+    CompiledTemplate,
+    body_digest,
+    compile_template,
+    contact_columns,
+)
 from .sms_encoding import (  # noqa: F401
+    ENCODING_GSM7,
+    ENCODING_UCS2,
+    SmsBatchStats,
     SmsStats,
     analyse as analyse_sms,
+    analyse_many as analyse_sms_many,
     is_gsm7,
+    split_segments,
+    straddles_boundary,
 )
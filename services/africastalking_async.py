@@ -0,0 +1,383 @@
+# services/africastalking_async.py
+
+
+"""
+services/africastalking_async.py
+=================================
+
+asyncio-native Africa's Talking client.
+
+:class:`AsyncAfricasTalkingClient` has the same ``send()`` /
+``get_balance()`` contract as
+:class:`~services.africastalking_client.AfricasTalkingClient` - same
+:class:`~services.africastalking_client.ATRecipientResult` results, same
+``ATAuthError`` / ``ATValidationError`` / ``ATError`` exceptions - but its
+methods are coroutines, so a single thread can keep dozens of AT calls in
+flight::
+
+    async with AsyncAfricasTalkingClient(username, api_key) as client:
+        outcomes = await client.send_many(batches, max_in_flight=32)
+
+HTTP/1.1 is spoken directly over ``asyncio`` streams (no third-party
+dependency).  Keep-alive connections are pooled per client; a client, and its
+connections, belong to the event loop they were first used on.
+
+No Odoo imports — independently unit-testable.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import ssl
+import time
+import urllib.parse
+from typing import Any, Sequence
+
+from .africastalking_client import (
+    DEFAULT_TIMEOUT,
+    ATError,
+    ATRecipientResult,
+    _ATClientBase,
+)
+from .http_pool import DEFAULT_IDLE_TIMEOUT, RequestOutcomeUnknown
+from .rate_limiter import DispatchRateLimiter
+
+_logger = logging.getLogger(__name__)
+
+#: Maximum simultaneous connections per host for one async client.
+DEFAULT_ASYNC_MAX_PER_HOST: int = 64
+
+# A server closing an idle keep-alive socket surfaces as one of these while
+# the next request is written, or as _RemoteClosed when not a single response
+# byte arrives; retried once on reused connections only.  Failures after the
+# first response byte raise RequestOutcomeUnknown and are never replayed.
+_STALE_CONNECTION_ERRORS = (
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+_Connection = tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+class _RemoteClosed(ConnectionError):
+    """The server closed the connection before sending a status line."""
+
+
+class _AsyncConnectionPool:
+    """Keep-alive pool of asyncio stream connections, bounded per host."""
+
+    def __init__(
+        self,
+        *,
+        max_per_host: int = DEFAULT_ASYNC_MAX_PER_HOST,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+    ) -> None:
+        self.max_per_host = max_per_host
+        self.idle_timeout = idle_timeout
+        self._idle: dict[tuple, list[tuple[_Connection, float]]] = {}
+        self._slots: dict[tuple, asyncio.Semaphore] = {}
+        self._ssl_context = ssl.create_default_context()
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        body: bytes = b"",
+        headers: dict[str, str],
+    ) -> tuple[int, bytes]:
+        parts = urllib.parse.urlsplit(url)
+        scheme = parts.scheme
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, parts.hostname, port)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        head = [f"{method} {path} HTTP/1.1", f"Host: {parts.netloc}"]
+        head.extend(f"{name}: {value}" for name, value in headers.items())
+        head.append(f"Content-Length: {len(body)}")
+        request_bytes = ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body
+
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = self._slots[key] = asyncio.Semaphore(self.max_per_host)
+        async with slot:
+            conn, reused = await self._checkout(key)
+            try:
+                return await self._exchange(key, conn, request_bytes)
+            except (_RemoteClosed, *_STALE_CONNECTION_ERRORS):
+                if not reused:
+                    raise
+                _logger.debug("AT async pool: stale connection to %s - reconnecting.", key[1])
+                conn = await self._connect(key)
+                return await self._exchange(key, conn, request_bytes)
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for (_reader, writer), _used in conns:
+                writer.close()
+
+    # ------------------------------------------------------------------
+    #  Internal helpers
+    # ------------------------------------------------------------------
+
+    async def _checkout(self, key: tuple) -> tuple[_Connection, bool]:
+        now = time.monotonic()
+        conns = self._idle.get(key) or []
+        while conns:
+            conn, last_used = conns.pop()
+            if now - last_used <= self.idle_timeout and not conn[0].at_eof():
+                return conn, True
+            conn[1].close()
+        return await self._connect(key), False
+
+    async def _connect(self, key: tuple) -> _Connection:
+        scheme, host, port = key
+        if scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme: {scheme!r}")
+        return await asyncio.open_connection(
+            host, port, ssl=self._ssl_context if scheme == "https" else None
+        )
+
+    async def _exchange(
+        self, key: tuple, conn: _Connection, request_bytes: bytes
+    ) -> tuple[int, bytes]:
+        reader, writer = conn
+        try:
+            writer.write(request_bytes)
+            await writer.drain()
+        except BaseException:
+            writer.close()
+            raise
+
+        # The server may have the whole request now: apart from a close with
+        # nothing received, a failure leaves the outcome unknown.
+        try:
+            status, keep_alive, body = await _read_response(reader)
+        except _RemoteClosed:
+            writer.close()
+            raise
+        except (OSError, ValueError, asyncio.IncompleteReadError) as exc:
+            writer.close()
+            raise RequestOutcomeUnknown(str(exc) or type(exc).__name__) from exc
+        except BaseException:
+            writer.close()
+            raise
+        if keep_alive:
+            self._idle.setdefault(key, []).append((conn, time.monotonic()))
+        else:
+            writer.close()
+        return status, body
+
+
+async def _read_response(reader: asyncio.StreamReader) -> tuple[int, bool, bytes]:
+    """Read one HTTP/1.x response; return ``(status, keep_alive, body)``."""
+    status_line = await reader.readline()
+    if not status_line:
+        raise _RemoteClosed("Connection closed before a response was received.")
+    version, _, rest = status_line.decode("latin-1").partition(" ")
+    status = int(rest.split(" ", 1)[0])
+
+    headers: dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        chunks: list[bytes] = []
+        while True:
+            size = int((await reader.readline()).split(b";", 1)[0], 16)
+            if size == 0:
+                # Skip optional trailers up to the terminating blank line.
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()  # CRLF after each chunk
+        return status, keep_alive, b"".join(chunks)
+
+    if "content-length" in headers:
+        return status, keep_alive, await reader.readexactly(int(headers["content-length"]))
+
+    # No framing: body runs until the server closes the connection.
+    return status, False, await reader.read()
+
+
+class AsyncAfricasTalkingClient(_ATClientBase):
+    """
+    asyncio variant of :class:`~services.AfricasTalkingClient`.
+
+    Parameters
+    ----------
+    username, api_key, sender_id, sandbox, timeout, base_url:
+        As for :class:`~services.AfricasTalkingClient`.
+    rate_limiter:
+        Optional limiter consulted before every :meth:`send`.  The wait is
+        awaited, so rate limiting never blocks the event loop.
+    max_per_host:
+        Maximum simultaneous connections this client opens to one host.
+    """
+
+    def __init__(
+        self,
+        username: str,
+        api_key: str,
+        *,
+        sender_id: str = "",
+        sandbox: bool = False,
+        timeout: int = DEFAULT_TIMEOUT,
+        rate_limiter: DispatchRateLimiter | None = None,
+        max_per_host: int = DEFAULT_ASYNC_MAX_PER_HOST,
+        base_url: str = "",
+    ) -> None:
+        super().__init__(
+            username,
+            api_key,
+            sender_id=sender_id,
+            sandbox=sandbox,
+            timeout=timeout,
+            rate_limiter=rate_limiter,
+            base_url=base_url,
+        )
+        self._pool = _AsyncConnectionPool(max_per_host=max_per_host)
+
+    async def __aenter__(self) -> "AsyncAfricasTalkingClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close every pooled connection."""
+        await self._pool.close()
+
+    # ------------------------------------------------------------------
+    #  Messaging API
+    # ------------------------------------------------------------------
+
+    async def send(self, to: list[str], message: str) -> list[ATRecipientResult]:
+        """
+        Send *message* to every phone number in *to*.
+
+        Caller must chunk recipient list to <= AT_BATCH_LIMIT before calling.
+
+        Raises
+        ------
+        ATAuthError, ATValidationError, ATError, ValueError
+        """
+        self._check_send_args(to, message)
+
+        if self.rate_limiter is not None:
+            # reserve() may hit the database when workers are coordinated,
+            # so it runs off the event loop; the wait itself is awaited.
+            wait = await asyncio.to_thread(self.rate_limiter.reserve, len(to))
+            if wait > 0:
+                _logger.debug("AT rate limiter: waiting %.3fs before send.", wait)
+                await asyncio.sleep(wait)
+
+        _logger.debug(
+            "AT async POST %s  sandbox=%s  sender_id=%r",
+            self._url,
+            self.sandbox,
+            self.sender_id or "(shared short-code)",
+        )
+        status, body = await self._request(
+            "POST",
+            self._url,
+            body=self._build_payload(to, message),
+            headers=self._post_headers(),
+        )
+        self._check_post_status(status, body)
+        return self._parse_messaging(self._decode_messaging(body))
+
+    async def send_many(
+        self,
+        batches: Sequence[tuple[list[str], str]],
+        *,
+        max_in_flight: int,
+    ) -> list[list[ATRecipientResult] | ATError]:
+        """
+        Send many ``(to, message)`` batches with at most *max_in_flight*
+        concurrent calls.
+
+        Returns one entry per batch, in input order: the results, or the
+        :class:`~services.ATError` that batch raised.  Never raises for a
+        single batch: any other exception is wrapped in a non-retryable
+        :class:`~services.ATError`, so one failing batch neither cancels the
+        others in flight nor loses the results of batches already accepted.
+        """
+        semaphore = asyncio.Semaphore(max(max_in_flight, 1))
+
+        async def _one(to: list[str], message: str) -> Any:
+            async with semaphore:
+                _logger.info(
+                    "sms_africastalking: sending chunk — %d number(s), body %d char(s).",
+                    len(to),
+                    len(message),
+                )
+                try:
+                    return await self.send(to, message)
+                except ATError as exc:
+                    return exc
+                except Exception as exc:
+                    _logger.exception(
+                        "sms_africastalking: unexpected error while sending a chunk."
+                    )
+                    return ATError(f"Unexpected dispatch error: {exc}")
+
+        return list(await asyncio.gather(*(_one(to, msg) for to, msg in batches)))
+
+    # ------------------------------------------------------------------
+    #  Balance / User API
+    # ------------------------------------------------------------------
+
+    async def get_balance(self) -> str:
+        """
+        Retrieve the current AT account balance.
+
+        Raises
+        ------
+        ATAuthError
+            On HTTP 401.
+        ATError
+            On HTTP 5xx, timeout or network failure.
+        """
+        full_url, headers = self._balance_request()
+        _logger.debug("AT async GET balance  url=%s  sandbox=%s", self._balance_url, self.sandbox)
+        status, body = await self._request("GET", full_url, headers=headers)
+        self._check_balance_status(status, body)
+        return self._parse_balance(body)
+
+    # ------------------------------------------------------------------
+    #  Internal helpers
+    # ------------------------------------------------------------------
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        *,
+        body: bytes = b"",
+        headers: dict[str, str],
+    ) -> tuple[int, str]:
+        """Async counterpart of ``AfricasTalkingClient._request``."""
+        try:
+            status, raw = await asyncio.wait_for(
+                self._pool.request(method, url, body=body, headers=headers),
+                timeout=self.timeout,
+            )
+        except RequestOutcomeUnknown as exc:
+            raise self._outcome_unknown_error(exc) from exc
+        except asyncio.TimeoutError as exc:
+            raise self._timeout_error() from exc
+        except (OSError, ValueError, asyncio.IncompleteReadError) as exc:
+            raise self._connection_error(exc) from exc
+        return status, raw.decode("utf-8", errors="replace")
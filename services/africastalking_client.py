@@ -26,14 +26,17 @@ Until approved, use the shared short-code and advise recipients to check *456#.
 
 from __future__ import annotations
 
+import http.client
 import json
 import logging
-import urllib.error
+import random
 import urllib.parse
-import urllib.request
 from dataclasses import dataclass
 from typing import Any
 
+from .http_pool import ConnectionPool, RequestOutcomeUnknown, get_shared_pool
+from .rate_limiter import DispatchRateLimiter
+
 _logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -57,17 +60,32 @@ BALANCE_SANDBOX_URL = "https://api.sandbox.africastalking.com/version1/user"
 #: Hard maximum recipients per AT API call (AT platform limit).
 AT_BATCH_LIMIT: int = 1_000
 
-#: Rate-limiting: recipients per API call before sleeping.
+#: Rate-limiting: recipients allowed per :data:`AT_RATE_LIMIT_SLEEP` window.
 #: Keeping this at 1 000 uses AT's full capacity.  Reduce (e.g. to 50) if
 #: you experience throttling errors on very high-volume sends.
 AT_RATE_LIMIT_BATCH: int = 1_000
 
-#: Seconds to sleep between successive AT API calls during a batch send.
+#: Rate-limiting window in seconds.
 AT_RATE_LIMIT_SLEEP: float = 1.0
 
+#: Default recipient budget for :class:`~services.rate_limiter.DispatchRateLimiter`.
+AT_DEFAULT_RECIPIENTS_PER_SEC: float = AT_RATE_LIMIT_BATCH / AT_RATE_LIMIT_SLEEP
+
+#: Default API-call budget for :class:`~services.rate_limiter.DispatchRateLimiter`.
+AT_DEFAULT_REQUESTS_PER_SEC: float = 10.0
+
 #: Default HTTP timeout in seconds.
 DEFAULT_TIMEOUT: int = 30
 
+#: Maximum delivery attempts (first try included) for retryable failures.
+AT_RETRY_MAX_ATTEMPTS: int = 5
+
+#: Backoff before the first retry, in seconds; doubles on each attempt.
+AT_RETRY_BASE_DELAY: float = 30.0
+
+#: Upper bound for a single backoff delay, in seconds.
+AT_RETRY_MAX_DELAY: float = 1_800.0
+
 #: AT status strings that map to a successful Odoo send state at dispatch time.
 AT_SUCCESS_STATUSES: frozenset[str] = frozenset({"Success", "Sent", "Delivered"})
 
@@ -110,6 +128,29 @@ class ATValidationError(ATError):
     """Raised when AT returns HTTP 400."""
 
 
+def backoff_delay(
+    attempt: int,
+    *,
+    base: float = AT_RETRY_BASE_DELAY,
+    cap: float = AT_RETRY_MAX_DELAY,
+    rng=random.random,
+) -> float:
+    """
+    Jittered exponential backoff before retry number *attempt* (1-based).
+
+    The nominal delay ``base * 2 ** (attempt - 1)`` (capped at *cap*) is
+    halved and the other half drawn at random, so retries of many chunks
+    that failed together are spread out instead of hitting AT at once.
+
+    >>> backoff_delay(1, rng=lambda: 0.0)
+    15.0
+    >>> backoff_delay(3, rng=lambda: 1.0)
+    120.0
+    """
+    nominal = min(cap, base * 2 ** max(attempt - 1, 0))
+    return nominal / 2 + rng() * nominal / 2
+
+
 # ---------------------------------------------------------------------------
 #  Result dataclass
 # ---------------------------------------------------------------------------
@@ -144,23 +185,14 @@ class ATRecipientResult:
 # ---------------------------------------------------------------------------
 
 
-class AfricasTalkingClient:
+class _ATClientBase:
     """
-    Thin HTTP client for the Africa's Talking Messaging and User APIs.
+    Transport-independent half of the AT clients.
 
-    Parameters
-    ----------
-    username:
-        AT account username.  Use ``"sandbox"`` for testing.
-    api_key:
-        AT API key from your AT dashboard.
-    sender_id:
-        Registered alphanumeric sender ID.  Leave blank for shared short-code.
-        Required to bypass Safaricom promotional filter in Kenya.
-    sandbox:
-        When ``True`` all requests go to the AT sandbox endpoints.
-    timeout:
-        Per-request HTTP timeout in seconds.
+    Holds the configuration, builds requests and turns HTTP responses into
+    results or :class:`ATError` subclasses.  :class:`AfricasTalkingClient`
+    and :class:`~services.africastalking_async.AsyncAfricasTalkingClient`
+    only add the I/O, so both share one contract and one error mapping.
     """
 
     def __init__(
@@ -171,6 +203,8 @@ class AfricasTalkingClient:
         sender_id: str = "",
         sandbox: bool = False,
         timeout: int = DEFAULT_TIMEOUT,
+        rate_limiter: DispatchRateLimiter | None = None,
+        base_url: str = "",
     ) -> None:
         if not username:
             raise ATAuthError("Africa's Talking username is required.", retryable=False)
@@ -182,97 +216,139 @@ class AfricasTalkingClient:
         self.sender_id = (sender_id or "").strip()
         self.sandbox = sandbox
         self.timeout = timeout
-        self._url = SANDBOX_URL if sandbox else LIVE_URL
-        self._balance_url = BALANCE_SANDBOX_URL if sandbox else BALANCE_LIVE_URL
+        if base_url:
+            # Alternative API root, e.g. a local stand-in server for load tests.
+            root = base_url.rstrip("/")
+            self._url = f"{root}/version1/messaging"
+            self._balance_url = f"{root}/version1/user"
+        else:
+            self._url = SANDBOX_URL if sandbox else LIVE_URL
+            self._balance_url = BALANCE_SANDBOX_URL if sandbox else BALANCE_LIVE_URL
+        self.rate_limiter = rate_limiter
 
     # ------------------------------------------------------------------
-    #  Messaging API
+    #  Request building
     # ------------------------------------------------------------------
 
-    def send(self, to: list[str], message: str) -> list[ATRecipientResult]:
-        """
-        Send *message* to every phone number in *to*.
-
-        Caller must chunk recipient list to <= AT_BATCH_LIMIT before calling.
-
-        Raises
-        ------
-        ATAuthError, ATValidationError, ATError, ValueError
-        """
+    @staticmethod
+    def _check_send_args(to: list[str], message: str) -> None:
         if not to:
             raise ValueError("Recipient list 'to' must not be empty.")
         if not message or not message.strip():
             raise ValueError("Message body must not be blank.")
 
-        payload = self._build_payload(to, message)
-        raw = self._post(self._url, payload)
-        return self._parse_messaging(raw)
+    def _build_payload(self, to: list[str], message: str) -> bytes:
+        data: dict[str, str] = {
+            "username": self.username,
+            "to": ",".join(to),
+            "message": message,
+        }
+        if self.sender_id:
+            data["from"] = self.sender_id
+        return urllib.parse.urlencode(data).encode("utf-8")
+
+    def _post_headers(self) -> dict[str, str]:
+        return {
+            "Accept": "application/json",
+            "ApiKey": self.api_key,
+            "Content-Type": "application/x-www-form-urlencoded",
+        }
+
+    def _balance_request(self) -> tuple[str, dict[str, str]]:
+        params = urllib.parse.urlencode({"username": self.username})
+        headers = {
+            "Accept": "application/json",
+            "ApiKey": self.api_key,
+        }
+        return f"{self._balance_url}?{params}", headers
 
     # ------------------------------------------------------------------
-    #  Balance / User API
+    #  Response handling
     # ------------------------------------------------------------------
 
-    def get_balance(self) -> str:
-        """
-        Retrieve the current AT account balance.
+    def _timeout_error(self) -> ATError:
+        _logger.error("AT request timed out after %ds.", self.timeout)
+        return ATError(
+            f"Africa's Talking API timed out after {self.timeout}s.",
+            retryable=True,
+        )
 
-        Returns
-        -------
-        str
-            Balance string with currency code, e.g. ``"KES 1023.5000"``.
+    @staticmethod
+    def _connection_error(exc: BaseException) -> ATError:
+        _logger.error("AT connection error: %s", exc)
+        return ATError(
+            f"Could not reach Africa's Talking API: {exc}",
+            retryable=True,
+        )
 
-        Raises
-        ------
-        ATAuthError
-            On HTTP 401.
-        ATError
-            On HTTP 5xx, timeout or network failure.
-        """
-        params = urllib.parse.urlencode({"username": self.username})
-        full_url = f"{self._balance_url}?{params}"
-
-        req = urllib.request.Request(
-            full_url,
-            headers={
-                "Accept": "application/json",
-                "ApiKey": self.api_key,
-            },
-            method="GET",
+    @staticmethod
+    def _outcome_unknown_error(exc: BaseException) -> ATError:
+        _logger.error("AT connection failed after the request was sent: %s", exc)
+        return ATError(
+            "Connection to Africa's Talking failed after the request was sent "
+            f"({exc}); it may have been processed, so it is not retried.",
+            retryable=False,
         )
 
-        _logger.debug("AT GET balance  url=%s  sandbox=%s", self._balance_url, self.sandbox)
+    @staticmethod
+    def _check_post_status(status: int, body: str) -> None:
+        if status < 400:
+            return
+        _logger.error("AT HTTP %d - %s", status, body[:500])
+        if status == 401:
+            raise ATAuthError(
+                "Africa's Talking rejected the API key (HTTP 401).",
+                http_status=401,
+                raw_body=body,
+                retryable=False,
+            )
+        if status == 400:
+            raise ATValidationError(
+                f"Africa's Talking rejected the request (HTTP 400): {body[:200]}",
+                http_status=400,
+                raw_body=body,
+                retryable=False,
+            )
+        raise ATError(
+            f"Africa's Talking returned HTTP {status}: {body[:200]}",
+            http_status=status,
+            raw_body=body,
+            retryable=status >= 500,
+        )
 
+    @staticmethod
+    def _check_balance_status(status: int, body: str) -> None:
+        if status < 400:
+            return
+        _logger.error("AT balance HTTP %d - %s", status, body[:300])
+        if status == 401:
+            raise ATAuthError(
+                "Africa's Talking rejected the API key (HTTP 401). "
+                "Check your username and API key in Settings.",
+                http_status=401,
+                raw_body=body,
+                retryable=False,
+            )
+        raise ATError(
+            f"Africa's Talking balance endpoint returned HTTP {status}: {body[:200]}",
+            http_status=status,
+            raw_body=body,
+            retryable=status >= 500,
+        )
+
+    @staticmethod
+    def _decode_messaging(body: str) -> dict[str, Any]:
         try:
-            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
-                body = resp.read().decode("utf-8")
-        except urllib.error.HTTPError as exc:
-            raw = exc.read().decode("utf-8", errors="replace")
-            _logger.error("AT balance HTTP %d - %s", exc.code, raw[:300])
-            if exc.code == 401:
-                raise ATAuthError(
-                    "Africa's Talking rejected the API key (HTTP 401). "
-                    "Check your username and API key in Settings.",
-                    http_status=401,
-                    raw_body=raw,
-                    retryable=False,
-                ) from exc
-            raise ATError(
-                f"Africa's Talking balance endpoint returned HTTP {exc.code}: {raw[:200]}",
-                http_status=exc.code,
-                raw_body=raw,
-                retryable=exc.code >= 500,
-            ) from exc
-        except TimeoutError as exc:
-            raise ATError(
-                f"Balance request timed out after {self.timeout}s.",
-                retryable=True,
-            ) from exc
-        except urllib.error.URLError as exc:
+            return json.loads(body)
+        except json.JSONDecodeError as exc:
+            _logger.error("AT non-JSON response: %s", body[:500])
             raise ATError(
-                f"Could not reach Africa's Talking API: {exc.reason}",
-                retryable=True,
+                "Africa's Talking returned a non-JSON response.",
+                raw_body=body,
+                retryable=False,
             ) from exc
 
+    def _parse_balance(self, body: str) -> str:
         try:
             data = json.loads(body)
         except json.JSONDecodeError as exc:
@@ -288,88 +364,6 @@ class AfricasTalkingClient:
         _logger.info("AT balance: %s (sandbox=%s)", balance, self.sandbox)
         return str(balance)
 
-    # ------------------------------------------------------------------
-    #  Internal helpers
-    # ------------------------------------------------------------------
-
-    def _build_payload(self, to: list[str], message: str) -> bytes:
-        data: dict[str, str] = {
-            "username": self.username,
-            "to": ",".join(to),
-            "message": message,
-        }
-        if self.sender_id:
-            data["from"] = self.sender_id
-        return urllib.parse.urlencode(data).encode("utf-8")
-
-    def _post(self, url: str, payload: bytes) -> dict[str, Any]:
-        req = urllib.request.Request(
-            url,
-            data=payload,
-            headers={
-                "Accept": "application/json",
-                "ApiKey": self.api_key,
-                "Content-Type": "application/x-www-form-urlencoded",
-            },
-            method="POST",
-        )
-
-        _logger.debug(
-            "AT POST %s  sandbox=%s  sender_id=%r",
-            url,
-            self.sandbox,
-            self.sender_id or "(shared short-code)",
-        )
-
-        try:
-            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
-                body = resp.read().decode("utf-8")
-        except urllib.error.HTTPError as exc:
-            raw = exc.read().decode("utf-8", errors="replace")
-            _logger.error("AT HTTP %d - %s", exc.code, raw[:500])
-            if exc.code == 401:
-                raise ATAuthError(
-                    "Africa's Talking rejected the API key (HTTP 401).",
-                    http_status=401,
-                    raw_body=raw,
-                    retryable=False,
-                ) from exc
-            if exc.code == 400:
-                raise ATValidationError(
-                    f"Africa's Talking rejected the request (HTTP 400): {raw[:200]}",
-                    http_status=400,
-                    raw_body=raw,
-                    retryable=False,
-                ) from exc
-            raise ATError(
-                f"Africa's Talking returned HTTP {exc.code}: {raw[:200]}",
-                http_status=exc.code,
-                raw_body=raw,
-                retryable=exc.code >= 500,
-            ) from exc
-        except TimeoutError as exc:
-            _logger.error("AT request timed out after %ds.", self.timeout)
-            raise ATError(
-                f"Africa's Talking API timed out after {self.timeout}s.",
-                retryable=True,
-            ) from exc
-        except urllib.error.URLError as exc:
-            _logger.error("AT connection error: %s", exc.reason)
-            raise ATError(
-                f"Could not reach Africa's Talking API: {exc.reason}",
-                retryable=True,
-            ) from exc
-
-        try:
-            return json.loads(body)
-        except json.JSONDecodeError as exc:
-            _logger.error("AT non-JSON response: %s", body[:500])
-            raise ATError(
-                "Africa's Talking returned a non-JSON response.",
-                raw_body=body,
-                retryable=False,
-            ) from exc
-
     @staticmethod
     def _parse_messaging(data: dict[str, Any]) -> list[ATRecipientResult]:
         """Extract Recipients from the AT messaging response envelope."""
@@ -397,3 +391,159 @@ class AfricasTalkingClient:
             )
 
         return results
+
+
+class AfricasTalkingClient(_ATClientBase):
+    """
+    Thin HTTP client for the Africa's Talking Messaging and User APIs.
+
+    Parameters
+    ----------
+    username:
+        AT account username.  Use ``"sandbox"`` for testing.
+    api_key:
+        AT API key from your AT dashboard.
+    sender_id:
+        Registered alphanumeric sender ID.  Leave blank for shared short-code.
+        Required to bypass Safaricom promotional filter in Kenya.
+    sandbox:
+        When ``True`` all requests go to the AT sandbox endpoints.
+    timeout:
+        Per-request HTTP timeout in seconds.
+    pool:
+        Keep-alive connection pool.  Defaults to the process-wide pool so
+        TLS connections are reused across calls and across cron runs.
+    rate_limiter:
+        Optional limiter consulted before every :meth:`send`; blocks the
+        calling thread until the call fits the configured budget.
+    base_url:
+        Overrides the AT API root (``<base_url>/version1/messaging`` and
+        ``<base_url>/version1/user``), e.g. to point at a local stand-in
+        server.  *sandbox* is ignored when set.
+    """
+
+    def __init__(
+        self,
+        username: str,
+        api_key: str,
+        *,
+        sender_id: str = "",
+        sandbox: bool = False,
+        timeout: int = DEFAULT_TIMEOUT,
+        pool: ConnectionPool | None = None,
+        rate_limiter: DispatchRateLimiter | None = None,
+        base_url: str = "",
+    ) -> None:
+        super().__init__(
+            username,
+            api_key,
+            sender_id=sender_id,
+            sandbox=sandbox,
+            timeout=timeout,
+            rate_limiter=rate_limiter,
+            base_url=base_url,
+        )
+        self._pool = pool if pool is not None else get_shared_pool()
+
+    # ------------------------------------------------------------------
+    #  Messaging API
+    # ------------------------------------------------------------------
+
+    def send(self, to: list[str], message: str) -> list[ATRecipientResult]:
+        """
+        Send *message* to every phone number in *to*.
+
+        Caller must chunk recipient list to <= AT_BATCH_LIMIT before calling.
+
+        Raises
+        ------
+        ATAuthError, ATValidationError, ATError, ValueError
+        """
+        self._check_send_args(to, message)
+
+        if self.rate_limiter is not None:
+            waited = self.rate_limiter.acquire(len(to))
+            if waited:
+                _logger.debug("AT rate limiter: waited %.3fs before send.", waited)
+
+        payload = self._build_payload(to, message)
+        raw = self._post(self._url, payload)
+        return self._parse_messaging(raw)
+
+    # ------------------------------------------------------------------
+    #  Balance / User API
+    # ------------------------------------------------------------------
+
+    def get_balance(self) -> str:
+        """
+        Retrieve the current AT account balance.
+
+        Returns
+        -------
+        str
+            Balance string with currency code, e.g. ``"KES 1023.5000"``.
+
+        Raises
+        ------
+        ATAuthError
+            On HTTP 401.
+        ATError
+            On HTTP 5xx, timeout or network failure.
+        """
+        full_url, headers = self._balance_request()
+
+        _logger.debug("AT GET balance  url=%s  sandbox=%s", self._balance_url, self.sandbox)
+
+        status, body = self._request("GET", full_url, headers=headers)
+        self._check_balance_status(status, body)
+        return self._parse_balance(body)
+
+    # ------------------------------------------------------------------
+    #  Internal helpers
+    # ------------------------------------------------------------------
+
+    def _request(
+        self,
+        method: str,
+        url: str,
+        *,
+        body: bytes | None = None,
+        headers: dict[str, str],
+    ) -> tuple[int, str]:
+        """
+        Perform one request over the keep-alive pool.
+
+        Returns ``(http_status, decoded_body)`` for every HTTP response,
+        including 4xx / 5xx; only transport failures raise.
+
+        Raises
+        ------
+        ATError
+            Retryable, on timeout or network failure before the request was
+            sent; not retryable when the connection failed afterwards.
+        """
+        try:
+            resp = self._pool.request(
+                method, url, body=body, headers=headers, timeout=self.timeout
+            )
+        except RequestOutcomeUnknown as exc:
+            raise self._outcome_unknown_error(exc) from exc
+        except TimeoutError as exc:
+            raise self._timeout_error() from exc
+        except (OSError, http.client.HTTPException) as exc:
+            raise self._connection_error(exc) from exc
+        return resp.status, resp.body.decode("utf-8", errors="replace")
+
+    def _post(self, url: str, payload: bytes) -> dict[str, Any]:
+        _logger.debug(
+            "AT POST %s  sandbox=%s  sender_id=%r",
+            url,
+            self.sandbox,
+            self.sender_id or "(shared short-code)",
+        )
+
+        status, body = self._request(
+            "POST", url, body=payload, headers=self._post_headers()
+        )
+        self._check_post_status(status, body)
+        return self._decode_messaging(body)
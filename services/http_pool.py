@@ -0,0 +1,374 @@
+# services/http_pool.py
+
+
+"""
+services/http_pool.py
+======================
+
+Thread-safe keep-alive connection pool for the Africa's Talking client.
+
+``urllib.request.urlopen`` opens (and closes) a new TCP + TLS connection for
+every request.  For a cron run that pushes dozens of 1 000-recipient chunks
+the handshake becomes a measurable share of each chunk's wall time.  This
+module keeps idle ``http.client`` connections open and hands them back out to
+later requests for the same ``(scheme, host, port)``.
+
+Lifetime
+--------
+A single process-wide pool (:func:`get_shared_pool`) is shared by every
+:class:`~services.africastalking_client.AfricasTalkingClient`, so connections
+survive across cron runs executed by the same Odoo worker process.
+
+Limits
+------
+``max_per_host``
+    Maximum connections (in use + idle) per host.  Callers beyond the limit
+    wait for a free slot, bounded by the request timeout.
+``max_idle``
+    Maximum idle connections kept across all hosts; the least recently
+    used connection is closed first.
+``idle_timeout``
+    Idle connections older than this many seconds are closed instead of
+    reused - AT's load balancers drop idle keep-alive sockets after ~60 s.
+
+Stale connections and replays
+-----------------------------
+A request on a reused connection is retried once on a fresh one only when
+the server provably never saw it: writing the request failed, or the server
+closed the socket without sending a single response byte.  A connection
+failure after that point leaves the outcome unknown - AT may already have
+accepted the messages - so it raises :class:`RequestOutcomeUnknown` instead
+of sending the request again.
+
+Proxies
+-------
+Like ``urllib``, the pool honours the ``https_proxy`` / ``http_proxy`` /
+``no_proxy`` environment variables: HTTPS goes through a ``CONNECT`` tunnel,
+plain HTTP is sent to the proxy in absolute form.
+
+No Odoo imports — independently unit-testable.
+"""
+
+from __future__ import annotations
+
+import base64
+import http.client
+import logging
+import ssl
+import threading
+import time
+import urllib.parse
+import urllib.request
+from dataclasses import dataclass
+
+_logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------------------------
+#  Defaults
+# ---------------------------------------------------------------------------
+
+#: Maximum open connections per (scheme, host, port).
+DEFAULT_MAX_PER_HOST: int = 16
+
+#: Maximum idle connections kept across all hosts.
+DEFAULT_MAX_IDLE: int = 16
+
+#: Seconds after which an idle connection is discarded instead of reused.
+DEFAULT_IDLE_TIMEOUT: float = 50.0
+
+# Errors that indicate the server silently closed an idle keep-alive socket.
+# :meth:`ConnectionPool._exchange` only lets them through while the request
+# is being written or before any response byte arrived, and they are only
+# retried on a *reused* connection; a fresh connection failing this way is a
+# genuine network error.
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+class RequestOutcomeUnknown(Exception):
+    """
+    The connection failed after the request was sent.
+
+    The server may or may not have processed the request, so it must not be
+    sent again automatically.  The original error is chained as
+    ``__cause__``.
+    """
+
+
+@dataclass(frozen=True)
+class PooledResponse:
+    """Fully-read HTTP response returned by :meth:`ConnectionPool.request`."""
+
+    status: int
+    reason: str
+    body: bytes
+
+
+class ConnectionPool:
+    """
+    Bounded pool of keep-alive ``http.client`` connections.
+
+    Parameters
+    ----------
+    max_per_host:
+        Maximum simultaneous connections per host.
+    max_idle:
+        Maximum idle connections retained across all hosts.
+    idle_timeout:
+        Idle connections older than this (seconds) are closed on next use.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_per_host: int = DEFAULT_MAX_PER_HOST,
+        max_idle: int = DEFAULT_MAX_IDLE,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+    ) -> None:
+        if max_per_host < 1:
+            raise ValueError("max_per_host must be at least 1.")
+        self.max_per_host = max_per_host
+        self.max_idle = max(0, max_idle)
+        self.idle_timeout = idle_timeout
+
+        self._lock = threading.Lock()
+        # key --> list of (connection, last_used) - most recently used last
+        self._idle: dict[tuple, list[tuple[http.client.HTTPConnection, float]]] = {}
+        self._slots: dict[tuple, threading.BoundedSemaphore] = {}
+        self._ssl_context = ssl.create_default_context()
+
+    # ------------------------------------------------------------------
+    #  Public API
+    # ------------------------------------------------------------------
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        body: bytes | None = None,
+        headers: dict[str, str] | None = None,
+        timeout: float,
+    ) -> PooledResponse:
+        """
+        Perform one HTTP request over a pooled connection.
+
+        The response body is always read in full so the connection can be
+        returned to the pool.
+
+        Raises
+        ------
+        TimeoutError
+            When no connection slot frees up, or the server does not start
+            answering, within *timeout* seconds.
+        RequestOutcomeUnknown
+            When the connection fails after the request was sent.
+        OSError, http.client.HTTPException
+            On connection or protocol failures before the request was sent.
+        """
+        parts = urllib.parse.urlsplit(url)
+        proxy = _proxy_for(parts.scheme, parts.hostname)
+        key = (parts.scheme, parts.hostname, parts.port, proxy)
+        if proxy and parts.scheme == "http":
+            # Plain HTTP through a proxy uses the absolute request form.
+            path = url
+            headers = {**(headers or {}), **_proxy_headers(proxy)}
+        else:
+            path = parts.path or "/"
+            if parts.query:
+                path = f"{path}?{parts.query}"
+
+        slot = self._slot(key)
+        if not slot.acquire(timeout=timeout):
+            raise TimeoutError(
+                f"No free connection to {parts.hostname} within {timeout}s "
+                f"(max_per_host={self.max_per_host})."
+            )
+        try:
+            conn, reused = self._checkout(key, timeout)
+            try:
+                return self._exchange(key, conn, method, path, body, headers, timeout)
+            except _STALE_CONNECTION_ERRORS:
+                if not reused:
+                    raise
+                _logger.debug("AT pool: stale keep-alive connection to %s - reconnecting.", key[1])
+                conn = self._connect(key, timeout)
+                return self._exchange(key, conn, method, path, body, headers, timeout)
+        finally:
+            slot.release()
+
+    def clear(self) -> None:
+        """Close every idle connection."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn, _used in conns:
+                conn.close()
+
+    # ------------------------------------------------------------------
+    #  Internal helpers
+    # ------------------------------------------------------------------
+
+    def _slot(self, key: tuple) -> threading.BoundedSemaphore:
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = self._slots[key] = threading.BoundedSemaphore(self.max_per_host)
+            return slot
+
+    def _exchange(
+        self,
+        key: tuple,
+        conn: http.client.HTTPConnection,
+        method: str,
+        path: str,
+        body: bytes | None,
+        headers: dict[str, str] | None,
+        timeout: float,
+    ) -> PooledResponse:
+        try:
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            conn.request(method, path, body=body, headers=headers or {})
+        except BaseException:
+            conn.close()
+            raise
+
+        # From here on the server may have received the whole request.  Only
+        # a clean close with nothing received (RemoteDisconnected) or a
+        # timeout waiting for the status line keep their own type; any other
+        # failure makes the outcome unknown.
+        try:
+            resp = conn.getresponse()
+        except (http.client.RemoteDisconnected, TimeoutError):
+            conn.close()
+            raise
+        except (OSError, http.client.HTTPException) as exc:
+            conn.close()
+            raise RequestOutcomeUnknown(str(exc)) from exc
+        except BaseException:
+            conn.close()
+            raise
+        try:
+            data = resp.read()
+        except (OSError, http.client.HTTPException) as exc:
+            conn.close()
+            raise RequestOutcomeUnknown(str(exc)) from exc
+        except BaseException:
+            conn.close()
+            raise
+
+        if resp.will_close:
+            conn.close()
+        else:
+            self._checkin(key, conn)
+        return PooledResponse(status=resp.status, reason=resp.reason, body=data)
+
+    def _checkout(self, key: tuple, timeout: float) -> tuple[http.client.HTTPConnection, bool]:
+        """Return ``(connection, reused)``; reuses the freshest idle socket."""
+        now = time.monotonic()
+        expired: list[http.client.HTTPConnection] = []
+        conn = None
+        with self._lock:
+            conns = self._idle.get(key) or []
+            while conns:
+                candidate, last_used = conns.pop()
+                if now - last_used <= self.idle_timeout:
+                    conn = candidate
+                    break
+                expired.append(candidate)
+        for stale in expired:
+            stale.close()
+        if conn is not None:
+            return conn, True
+        return self._connect(key, timeout), False
+
+    def _checkin(self, key: tuple, conn: http.client.HTTPConnection) -> None:
+        evicted: list[http.client.HTTPConnection] = []
+        with self._lock:
+            self._idle.setdefault(key, []).append((conn, time.monotonic()))
+            total = sum(len(conns) for conns in self._idle.values())
+            while total > self.max_idle:
+                # Close the least recently used idle connection across hosts.
+                oldest_key = min(
+                    (k for k, conns in self._idle.items() if conns),
+                    key=lambda k: self._idle[k][0][1],
+                )
+                evicted.append(self._idle[oldest_key].pop(0)[0])
+                total -= 1
+        for old in evicted:
+            old.close()
+
+    def _connect(self, key: tuple, timeout: float) -> http.client.HTTPConnection:
+        scheme, host, port, proxy = key
+        if scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme: {scheme!r}")
+        if proxy:
+            proxy_parts = urllib.parse.urlsplit(proxy)
+            proxy_port = proxy_parts.port or 80
+            if scheme == "http":
+                return http.client.HTTPConnection(
+                    proxy_parts.hostname, proxy_port, timeout=timeout
+                )
+            # Plain connection to the proxy; TLS starts after CONNECT.
+            conn = http.client.HTTPSConnection(
+                proxy_parts.hostname,
+                proxy_port,
+                timeout=timeout,
+                context=self._ssl_context,
+            )
+            conn.set_tunnel(host, port, headers=_proxy_headers(proxy))
+            return conn
+        if scheme == "https":
+            return http.client.HTTPSConnection(
+                host, port, timeout=timeout, context=self._ssl_context
+            )
+        return http.client.HTTPConnection(host, port, timeout=timeout)
+
+
+# ---------------------------------------------------------------------------
+#  Proxy support
+# ---------------------------------------------------------------------------
+
+
+def _proxy_for(scheme: str, host: str | None) -> str | None:
+    """Return the proxy URL ``urllib`` would use for *host*, or ``None``."""
+    proxy = urllib.request.getproxies().get(scheme)
+    if not proxy or not host or urllib.request.proxy_bypass(host):
+        return None
+    if "://" not in proxy:
+        proxy = f"http://{proxy}"
+    return proxy
+
+
+def _proxy_headers(proxy: str) -> dict[str, str]:
+    """``Proxy-Authorization`` header for credentials embedded in *proxy*."""
+    parts = urllib.parse.urlsplit(proxy)
+    if parts.username is None:
+        return {}
+    credentials = urllib.parse.unquote(parts.username)
+    if parts.password is not None:
+        credentials += ":" + urllib.parse.unquote(parts.password)
+    token = base64.b64encode(credentials.encode()).decode("ascii")
+    return {"Proxy-Authorization": f"Basic {token}"}
+
+
+# ---------------------------------------------------------------------------
+#  Process-wide shared pool
+# ---------------------------------------------------------------------------
+
+_shared_pool: ConnectionPool | None = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_shared_pool() -> ConnectionPool:
+    """Return the process-wide pool, creating it on first use."""
+    global _shared_pool
+    if _shared_pool is None:
+        with _shared_pool_lock:
+            if _shared_pool is None:
+                _shared_pool = ConnectionPool()
+    return _shared_pool
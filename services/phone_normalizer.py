@@ -19,17 +19,39 @@ Supported input formats
 -----------------------
 * Already correct - ``+254712345678``         --> ``+254712345678``
 * Missing leading + - ``254712345678``         --> ``+254712345678``
-* Local Kenyan 07xx / 01xx - ``0712345678``    --> **rejected** (no country code)
+* Local Kenyan 07xx / 01xx - ``0712345678``    --> ``+254712345678`` with
+  default country ``"254"``; **rejected** without a default country
 * Spaces, dashes, parentheses stripped first   - ``+254 712-345 678`` --> ``+254712345678``
 * Short numbers (< 7 digits after country)     --> rejected
 
-Callers that need to handle local numbers should prepend the country calling
-code *before* storing the number on ``mailing.contact.mobile``.
+Local numbers
+-------------
+When a *default_country* calling code is configured
+(``sms_africastalking.default_country_code``), numbers in national format
+are normalised: the trunk prefix is dropped and the calling code prepended,
+e.g. ``0712345678`` --> ``+254712345678`` for ``"254"``.
+:data:`NATIONAL_PREFIX_RULES` holds the trunk prefix and national number
+lengths of the East African countries served; a national number of the
+wrong length is rejected rather than guessed.  Other calling codes get the
+generic rule (drop one leading ``0``).  Only when no default country is
+configured are local numbers rejected for lacking a country code.
+
+Bulk normalisation
+------------------
+:func:`normalize_many` normalises a whole batch without raising: it returns
+the normalised numbers and a parallel ``array('B')`` of :class:`PhoneError`
+codes.  Results are memoised per raw string (:data:`CACHE_SIZE` entries), so
+numbers repeated across campaigns and retries are only parsed once per
+process.
 """
 
 from __future__ import annotations
 
+import functools
 import re
+from array import array
+from enum import IntEnum
+from typing import Iterable, NamedTuple
 
 # Strip every character except digits and a leading +
 _STRIP_RE = re.compile(r"[^\d+]")
@@ -37,11 +59,119 @@ _STRIP_RE = re.compile(r"[^\d+]")
 _E164_RE = re.compile(r"^\+?\d{7,15}$")
 
 
+#: Failure classes carried by :attr:`PhoneNormalizeError.code`.
+ERROR_EMPTY = "empty"
+ERROR_NO_DIGITS = "no_digits"
+ERROR_LOCAL_FORMAT = "local_format"
+ERROR_INVALID = "invalid"
+
+#: Record-independent description per failure class, suitable for writing
+#: the same reason to many records at once.
+ERROR_DESCRIPTIONS: dict[str, str] = {
+    ERROR_EMPTY: "Phone number is empty.",
+    ERROR_NO_DIGITS: "No digits found in phone number.",
+    ERROR_LOCAL_FORMAT: (
+        "Phone number is in local format (starts with 0). "
+        "Prepend the country calling code (e.g. +254 for Kenya), or set a "
+        "default country code in the SMS settings."
+    ),
+    ERROR_INVALID: "Phone number could not be normalised to E.164.",
+}
+
+
+class NationalRule(NamedTuple):
+    """How national-format numbers of one country map to E.164."""
+
+    trunk_prefix: str
+    """Prefix dialled before national numbers (removed on expansion)."""
+
+    lengths: tuple[int, ...]
+    """Valid national significant number lengths (after the trunk prefix)."""
+
+
+#: Calling code --> national numbering rule, for the countries served.
+#: Countries without a trunk prefix (e.g. Burundi, 257) are left out: their
+#: local numbers cannot be told apart from international ones.
+NATIONAL_PREFIX_RULES: dict[str, NationalRule] = {
+    "254": NationalRule("0", (9,)),     # Kenya        07xx / 01xx
+    "255": NationalRule("0", (9,)),     # Tanzania     06xx / 07xx
+    "256": NationalRule("0", (9,)),     # Uganda       07xx
+    "250": NationalRule("0", (9,)),     # Rwanda       07xx
+    "251": NationalRule("0", (9,)),     # Ethiopia     09xx / 07xx
+    "211": NationalRule("0", (9,)),     # South Sudan  09xx
+    "252": NationalRule("0", (8, 9)),   # Somalia
+    "243": NationalRule("0", (9,)),     # DR Congo     08xx / 09xx
+    "260": NationalRule("0", (9,)),     # Zambia       09xx / 07xx
+    "265": NationalRule("0", (7, 9)),   # Malawi
+}
+
+_GENERIC_RULE = NationalRule("0", ())
+
+
+def clean_country_code(value: str | None) -> str:
+    """
+    Return the digits of a calling code such as ``"+254"``, or ``""``.
+
+    >>> clean_country_code(" +254 ")
+    '254'
+    >>> clean_country_code("Kenya")
+    ''
+    """
+    digits = "".join(ch for ch in (value or "") if ch.isascii() and ch.isdigit())
+    return digits if 1 <= len(digits) <= 3 else ""
+
+
+class PhoneError(IntEnum):
+    """
+    Compact failure class of a normalisation, as stored by :func:`normalize_many`.
+
+    ``OK`` (0) means the number was normalised; every other member maps to
+    one of the ``ERROR_*`` string codes through :attr:`code`.
+    """
+
+    OK = 0
+    EMPTY = 1
+    NO_DIGITS = 2
+    LOCAL_FORMAT = 3
+    INVALID = 4
+
+    @property
+    def code(self) -> str:
+        """The matching ``ERROR_*`` string code (``""`` for ``OK``)."""
+        return _ERROR_CODES[self]
+
+    @property
+    def description(self) -> str:
+        """Record-independent description, from :data:`ERROR_DESCRIPTIONS`."""
+        return ERROR_DESCRIPTIONS.get(self.code, "")
+
+
+_ERROR_CODES: dict[PhoneError, str] = {
+    PhoneError.OK: "",
+    PhoneError.EMPTY: ERROR_EMPTY,
+    PhoneError.NO_DIGITS: ERROR_NO_DIGITS,
+    PhoneError.LOCAL_FORMAT: ERROR_LOCAL_FORMAT,
+    PhoneError.INVALID: ERROR_INVALID,
+}
+
+#: Distinct raw numbers whose normalisation is memoised per process.
+CACHE_SIZE: int = 65_536
+
+
 class PhoneNormalizeError(ValueError):
-    """Raised when a phone number cannot be normalised to E.164."""
+    """
+    Raised when a phone number cannot be normalised to E.164.
 
+    :attr:`code` holds the failure class (one of the ``ERROR_*`` constants)
+    so callers can group failures without parsing the message.
+    """
 
-def normalize_e164(raw: str) -> str:
+    def __init__(self, message: str, *, code: str = ERROR_INVALID) -> None:
+        super().__init__(message)
+        self.code = code
+
+
+def normalize_e164(raw: str, default_country: str = "") -> str:
     """
     Normalise *raw* to an E.164 phone number string.
 
@@ -52,6 +182,9 @@ def normalize_e164(raw: str) -> str:
     ----------
     raw:
         Raw phone number string from any source.
+    default_country:
+        Calling code (digits only, e.g. ``"254"``) used to expand numbers
+        in national format; empty rejects them.
 
     Returns
     -------
@@ -71,21 +204,111 @@ def normalize_e164(raw: str) -> str:
     '+254712345678'
     >>> normalize_e164("+254 712 345 678")
     '+254712345678'
+    >>> normalize_e164("0712 345 678", default_country="254")
+    '+254712345678'
     >>> normalize_e164("0712345678")
     Traceback (most recent call last):
         ...
     PhoneNormalizeError: ...
     """
-    if not raw or not raw.strip():
-        raise PhoneNormalizeError("Phone number is empty.")
+    candidate, error = _normalize(raw, default_country)
+    if error is PhoneError.OK:
+        return candidate
 
-    # Preserve a leading + before stripping non-digits
+    if error is PhoneError.EMPTY:
+        raise PhoneNormalizeError("Phone number is empty.", code=ERROR_EMPTY)
     raw = raw.strip()
+    if error is PhoneError.NO_DIGITS:
+        raise PhoneNormalizeError(
+            f"No digits found in phone number: {raw!r}", code=ERROR_NO_DIGITS
+        )
+    if error is PhoneError.LOCAL_FORMAT:
+        raise PhoneNormalizeError(
+            f"Phone number {raw!r} appears to be in local format (starts with 0). "
+            "Prepend the country calling code (e.g. +254 for Kenya) before storing.",
+            code=ERROR_LOCAL_FORMAT,
+        )
+    raise PhoneNormalizeError(
+        f"Phone number {raw!r} could not be normalised to E.164 "
+        f"(result {candidate!r} does not match the expected pattern).",
+        code=ERROR_INVALID,
+    )
+
+
+def try_normalize_e164(raw: str, default_country: str = "") -> str | None:
+    """
+    Like :func:`normalize_e164` but returns ``None`` instead of raising.
+
+    Convenient for filtering rather than exception-based flow control.
+
+    >>> try_normalize_e164("+254712345678")
+    '+254712345678'
+    >>> try_normalize_e164("bad number") is None
+    True
+    """
+    candidate, error = _normalize(raw, default_country)
+    return candidate if error is PhoneError.OK else None
+
+
+def normalize_many(
+    raws: Iterable[str | None], default_country: str = ""
+) -> tuple[list[str], array]:
+    """
+    Normalise many numbers at once, without raising.
+
+    Parameters
+    ----------
+    raws:
+        Raw phone numbers; ``None`` / ``False`` count as empty.
+    default_country:
+        Calling code used to expand national-format numbers, as in
+        :func:`normalize_e164`.
+
+    Returns
+    -------
+    tuple[list[str], array]
+        ``(numbers, errors)``, both aligned with *raws*: the E.164 number
+        (``""`` on failure) and an ``array('B')`` of :class:`PhoneError`
+        values (``0`` on success).
+
+    Examples
+    --------
+    >>> numbers, errors = normalize_many(["+254 712 345 678", "0712345678", None])
+    >>> numbers
+    ['+254712345678', '', '']
+    >>> [PhoneError(e).name for e in errors]
+    ['OK', 'LOCAL_FORMAT', 'EMPTY']
+    >>> normalize_many(["0712345678", "071234567"], default_country="254")[0]
+    ['+254712345678', '']
+    """
+    results = [_normalize(raw or "", default_country) for raw in raws]
+    numbers = [number if not error else "" for number, error in results]
+    return numbers, array("B", [error for _number, error in results])
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _normalize(raw: str, default_country: str = "") -> tuple[str, PhoneError]:
+    """
+    ``(candidate, error)`` for *raw*; *candidate* is the E.164 number on
+    success and the rejected candidate (or ``""``) otherwise.
+    """
+    if not raw:
+        return "", PhoneError.EMPTY
+
+    # Fast path: already a clean E.164 string
+    if raw[0] == "+" and 8 <= len(raw) <= 16 and raw.isascii() and raw[1:].isdigit():
+        return raw, PhoneError.OK
+
+    raw = raw.strip()
+    if not raw:
+        return "", PhoneError.EMPTY
+
+    # Preserve a leading + before stripping non-digits
     has_plus = raw.startswith("+")
     digits = _STRIP_RE.sub("", raw)
 
     if not digits:
-        raise PhoneNormalizeError(f"No digits found in phone number: {raw!r}")
+        return "", PhoneError.NO_DIGITS
 
     # Reassemble with leading + if present or if it looks like a full
     # international number (>= 10 digits, does not start with 0)
@@ -93,36 +316,19 @@ def normalize_e164(raw: str) -> str:
         # Strip any accidental duplicate + that might appear after stripping
         candidate = f"+{digits.lstrip('+')}"
     elif digits.startswith("0"):
-        # Local format - we cannot determine the country code
-        raise PhoneNormalizeError(
-            f"Phone number {raw!r} appears to be in local format (starts with 0). "
-            "Prepend the country calling code (e.g. +254 for Kenya) before storing."
-        )
+        # Local format - expand with the default country, if any
+        if not default_country:
+            return "", PhoneError.LOCAL_FORMAT
+        rule = NATIONAL_PREFIX_RULES.get(default_country, _GENERIC_RULE)
+        national = digits[len(rule.trunk_prefix) :]
+        candidate = f"+{default_country}{national}"
+        if national.startswith("0") or (rule.lengths and len(national) not in rule.lengths):
+            return candidate, PhoneError.INVALID
     else:
         # Assume the country code is already present without the +
         candidate = f"+{digits}"
 
     if not _E164_RE.match(candidate):
-        raise PhoneNormalizeError(
-            f"Phone number {raw!r} could not be normalised to E.164 "
-            f"(result {candidate!r} does not match the expected pattern)."
-        )
-
-    return candidate
+        return candidate, PhoneError.INVALID
 
-
-def try_normalize_e164(raw: str) -> str | None:
-    """
-    Like :func:`normalize_e164` but returns ``None`` instead of raising.
-
-    Convenient for filtering rather than exception-based flow control.
-
-    >>> try_normalize_e164("+254712345678")
-    '+254712345678'
-    >>> try_normalize_e164("bad number") is None
-    True
-    """
-    try:
-        return normalize_e164(raw)
-    except PhoneNormalizeError:
-        return None
+    return candidate, PhoneError.OK
@@ -0,0 +1,197 @@
+# services/rate_limiter.py
+
+
+"""
+services/rate_limiter.py
+=========================
+
+Token-bucket rate limiting for Africa's Talking dispatch.
+
+Two budgets are enforced independently:
+
+* **recipients / second** - each API call consumes one token per recipient.
+* **requests / second**   - each API call consumes one token.
+
+A call proceeds immediately when both buckets hold enough tokens; otherwise
+the caller sleeps just long enough for the buckets to refill.  Buckets may go
+into debt, so a 1 000-recipient call is never refused outright - it simply
+delays the *next* caller.
+
+Sharing
+-------
+:func:`get_rate_limiter` returns one process-wide limiter per configuration,
+so every dispatch thread in an Odoo worker draws from the same buckets.
+
+Cross-worker coordination
+-------------------------
+Pass a *coordinator* callable to :class:`DispatchRateLimiter` to replace the
+in-process buckets with shared state (e.g. a Postgres row updated with an
+atomic upsert).  The coordinator is called as::
+
+    wait_seconds = coordinator(key, amount, rate, capacity)
+
+and must atomically refill, debit and return the wait time for bucket *key*.
+
+No Odoo imports — independently unit-testable.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable
+
+#: ``(key, amount, rate, capacity) -> seconds to wait``
+Coordinator = Callable[[str, float, float, float], float]
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Parameters
+    ----------
+    rate:
+        Tokens added per second.  ``0`` or less disables limiting.
+    capacity:
+        Maximum burst size.  Defaults to one second's worth of tokens.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(rate, 1.0))
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1.0) -> float:
+        """
+        Debit *amount* tokens now and return the seconds to wait before use.
+
+        Never blocks.  Returns ``0.0`` when the tokens were available.
+        """
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class DispatchRateLimiter:
+    """
+    Combined recipients/sec and requests/sec limiter for AT API calls.
+
+    Parameters
+    ----------
+    recipients_per_sec:
+        Recipient budget.  ``0`` disables this limit.
+    requests_per_sec:
+        API-call budget.  ``0`` disables this limit.
+    burst_recipients:
+        Recipient bucket capacity; defaults to the larger of one second's
+        budget and one full AT batch so a single call never goes into debt.
+    coordinator:
+        Optional shared-state backend (see module docstring).  When set, it
+        replaces the in-process buckets.
+    key:
+        Bucket name prefix passed to the coordinator.
+    """
+
+    def __init__(
+        self,
+        recipients_per_sec: float,
+        requests_per_sec: float,
+        *,
+        burst_recipients: float | None = None,
+        coordinator: Coordinator | None = None,
+        key: str = "at",
+    ) -> None:
+        self.recipients_per_sec = float(recipients_per_sec)
+        self.requests_per_sec = float(requests_per_sec)
+        self._recipient_capacity = float(
+            burst_recipients
+            if burst_recipients is not None
+            else max(recipients_per_sec, 1_000)
+        )
+        self._request_capacity = max(float(requests_per_sec), 1.0)
+        self._coordinator = coordinator
+        self._key = key
+        self._recipients = TokenBucket(recipients_per_sec, self._recipient_capacity)
+        self._requests = TokenBucket(requests_per_sec, self._request_capacity)
+
+    def reserve(self, recipients: int) -> float:
+        """Debit one request and *recipients* tokens; return seconds to wait."""
+        if self._coordinator is None:
+            return max(
+                self._recipients.reserve(recipients),
+                self._requests.reserve(1),
+            )
+
+        wait = 0.0
+        if self.recipients_per_sec > 0:
+            wait = self._coordinator(
+                f"{self._key}:recipients",
+                recipients,
+                self.recipients_per_sec,
+                self._recipient_capacity,
+            )
+        if self.requests_per_sec > 0:
+            wait = max(
+                wait,
+                self._coordinator(
+                    f"{self._key}:requests",
+                    1,
+                    self.requests_per_sec,
+                    self._request_capacity,
+                ),
+            )
+        return wait
+
+    def acquire(self, recipients: int) -> float:
+        """Block until a call to *recipients* numbers may proceed.
+
+        Returns the number of seconds slept.
+        """
+        wait = self.reserve(recipients)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+# ---------------------------------------------------------------------------
+#  Process-wide registry
+# ---------------------------------------------------------------------------
+
+_limiters: dict[tuple[float, float], DispatchRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(
+    recipients_per_sec: float, requests_per_sec: float
+) -> DispatchRateLimiter:
+    """
+    Return the in-process limiter shared by every thread for this config.
+
+    Changing the configured rates yields a fresh limiter; the old one is
+    simply no longer handed out.
+    """
+    config = (float(recipients_per_sec), float(requests_per_sec))
+    with _limiters_lock:
+        limiter = _limiters.get(config)
+        if limiter is None:
+            limiter = _limiters[config] = DispatchRateLimiter(*config)
+        return limiter
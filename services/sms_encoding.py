@@ -26,12 +26,37 @@ UCS-2 (Unicode) encoding
 * Single-part message capacity: **70** characters.
 * Multi-part segment capacity: **67** characters per part.
 
+Batch analysis
+--------------
+:func:`analyse_many` measures a whole campaign's rendered bodies at once and
+returns compact ``array`` columns (encoding flag, units, segments) instead of
+one :class:`SmsStats` per recipient; identical bodies are measured once.
+
+Splitting
+---------
+:func:`split_segments` returns the actual parts of a multi-part message:
+GSM-7 parts never separate an ESC pair and UCS-2 parts never separate a
+UTF-16 surrogate pair, so a part may carry one unit less than its capacity.
+When that happens the message needs one more part than :func:`analyse`'s
+arithmetic count; :func:`straddles_boundary` detects those bodies.
+
+Transliteration
+---------------
+A single curly quote or en dash turns a whole body into UCS-2 and more than
+doubles its segment count.  :func:`transliterate_gsm7` maps common Unicode
+lookalikes (smart quotes, dashes, ellipsis, exotic spaces, accented letters
+outside GSM-7) to GSM-7 equivalents with one ``str.translate`` call, and
+keeps the result only when it is GSM-7 and saves at least one segment.
+
 Reference: ETSI TS 123 038 (3GPP TS 23.038)
 """
 
 from __future__ import annotations
 
+import unicodedata
+from array import array
 from dataclasses import dataclass
+from typing import Callable, Iterable, Mapping
 
 # ---------------------------------------------------------------------------
 #  GSM-7 character tables
@@ -57,6 +82,64 @@ _GSM7_EXTENDED: frozenset[str] = frozenset("[]{}\\^~|€\f")
 # Combined set - all characters that can be encoded in GSM-7
 _GSM7_ALL: frozenset[str] = _GSM7_BASIC | _GSM7_EXTENDED
 
+# ---------------------------------------------------------------------------
+#  Lookup tables for the single-pass classifier
+# ---------------------------------------------------------------------------
+#
+# Deleting every basic character with ``translate`` leaves only the
+# characters that cost more than one unit or are not GSM-7 at all.  The body
+# is GSM-7 iff that remainder consists of extension characters only, and its
+# length is then the number of extra ESC units.  ASCII bodies (the common
+# case) go through ``bytes.translate``, which is a plain C table lookup.
+
+# str.translate table indexed by codepoint: basic --> deleted, anything else
+# kept (codepoints past the end raise IndexError, which translate treats as
+# "leave unchanged").  A dense list is faster to index than a dict.
+_DELETE_BASIC: list[str | None] = [
+    None if chr(cp) in _GSM7_BASIC else chr(cp)
+    for cp in range(max(map(ord, _GSM7_BASIC)) + 1)
+]
+
+# bytes.translate delete-sets restricted to ASCII
+_ASCII_BASIC: bytes = "".join(sorted(ch for ch in _GSM7_BASIC if ch.isascii())).encode("ascii")
+_ASCII_EXTENDED: bytes = "".join(sorted(ch for ch in _GSM7_EXTENDED if ch.isascii())).encode("ascii")
+
+# ---------------------------------------------------------------------------
+#  Transliteration table
+# ---------------------------------------------------------------------------
+
+#: Unicode lookalikes --> GSM-7 replacement (may be empty or several chars).
+TRANSLITERATIONS: dict[str, str] = {
+    # Quotes and primes
+    "\u2018": "'", "\u2019": "'", "\u201a": "'", "\u201b": "'",
+    "\u2032": "'", "\u2039": "'", "\u203a": "'", "`": "'", "\u00b4": "'",
+    "\u201c": '"', "\u201d": '"', "\u201e": '"', "\u201f": '"',
+    "\u2033": '"', "\u00ab": '"', "\u00bb": '"',
+    # Dashes, hyphens and minus
+    "\u2010": "-", "\u2011": "-", "\u2012": "-", "\u2013": "-",
+    "\u2014": "-", "\u2015": "-", "\u2212": "-",
+    # Punctuation
+    "\u2026": "...", "\u2022": "-", "\u00b7": ".", "\u2044": "/",
+    "\u00d7": "x", "\u02c6": "^", "\u02dc": "~",
+    # Spaces, and invisible characters that are dropped
+    "\u00a0": " ", "\u2007": " ", "\u202f": " ", "\u205f": " ",
+    "\u3000": " ", "\t": " ",
+    **{chr(cp): " " for cp in range(0x2000, 0x200B)},
+    "\u200b": "", "\u200c": "", "\u200d": "", "\u2060": "", "\ufeff": "",
+    "\u00ad": "",
+    # Ligatures
+    "\u0153": "oe", "\u0152": "OE", "\ufb01": "fi", "\ufb02": "fl",
+}
+
+# Accented Latin letters outside GSM-7 --> their unaccented base letter
+# (``á`` --> ``a``, ``Ş`` --> ``S``); GSM-7's own accented letters are kept.
+for _cp in range(0x00C0, 0x0250):
+    _ch = chr(_cp)
+    _base = unicodedata.normalize("NFD", _ch)[0]
+    if _ch not in _GSM7_ALL and _base != _ch and _base.isascii() and _base.isalpha():
+        TRANSLITERATIONS.setdefault(_ch, _base)
+del _cp, _ch, _base
+
 # ---------------------------------------------------------------------------
 #  Thresholds
 # ---------------------------------------------------------------------------
@@ -66,6 +149,11 @@ _GSM7_MULTI = 153
 _UCS2_SINGLE = 70
 _UCS2_MULTI = 67
 
+# Encoding flags used by :func:`analyse_many`
+ENCODING_GSM7 = 0
+ENCODING_UCS2 = 1
+ENCODING_NAMES: tuple[str, str] = ("gsm7", "ucs2")
+
 
 # ---------------------------------------------------------------------------
 #  Public API
@@ -120,31 +208,293 @@ def analyse(body: str) -> SmsStats:
     """
     if not body:
         return SmsStats(encoding="gsm7", units=0, segments=0, chars=0)
+    flag, units, segments = _measure(body)
+    return SmsStats(
+        encoding=ENCODING_NAMES[flag], units=units, segments=segments, chars=len(body)
+    )
 
-    chars = len(body)
 
-    # Check whether every character fits in GSM-7
-    is_gsm7 = all(ch in _GSM7_ALL for ch in body)
+@dataclass(frozen=True)
+class SmsBatchStats:
+    """
+    Result of :func:`analyse_many`: one entry per body, as compact arrays.
 
-    if is_gsm7:
-        # Count extended chars as 2 units each
-        units = sum(2 if ch in _GSM7_EXTENDED else 1 for ch in body)
-        if units <= _GSM7_SINGLE:
-            segments = 1
-        else:
-            # Ceiling division
-            segments = -(-units // _GSM7_MULTI)
-        return SmsStats(encoding="gsm7", units=units, segments=segments, chars=chars)
+    The arrays support the buffer protocol, so ``numpy.frombuffer`` can wrap
+    them without copying when NumPy is available.
+    """
+
+    encodings: array
+    """``array('B')`` of :data:`ENCODING_GSM7` / :data:`ENCODING_UCS2` flags."""
+
+    units: array
+    """``array('I')`` of encoding units per body."""
+
+    segments: array
+    """``array('I')`` of SMS parts per body."""
+
+    distinct: int
+    """Number of distinct bodies actually analysed."""
+
+    def __len__(self) -> int:
+        return len(self.segments)
+
+    @property
+    def total_segments(self) -> int:
+        """SMS parts needed to send every body - the billable message count."""
+        return sum(self.segments)
+
+    @property
+    def ucs2_count(self) -> int:
+        """Number of bodies that need UCS-2."""
+        return self.encodings.count(ENCODING_UCS2)
+
+
+def analyse_many(bodies: Iterable[str | None]) -> SmsBatchStats:
+    """
+    Analyse many bodies at once, e.g. every rendered message of a campaign.
+
+    Identical bodies are analysed only once, and no per-body
+    :class:`SmsStats` is allocated.  Empty (or ``None``) bodies count as
+    GSM-7 with 0 units and 0 segments, like :func:`analyse`.
+
+    Parameters
+    ----------
+    bodies:
+        Message bodies, in recipient order.
+
+    Returns
+    -------
+    SmsBatchStats
+        Arrays aligned with *bodies*.
+
+    Examples
+    --------
+    >>> batch = analyse_many(["Hi Ann", "Hi Ann", "Hi 🌍", ""])
+    >>> list(batch.encodings), list(batch.segments), batch.distinct
+    ([0, 0, 1, 0], [1, 1, 1, 0], 3)
+    >>> batch.total_segments, batch.ucs2_count
+    (3, 1)
+    """
+    bodies = list(bodies)
+    memo = dict.fromkeys(bodies)
+    for body in memo:
+        memo[body] = _measure(body) if body else (ENCODING_GSM7, 0, 0)
+    if bodies:
+        flags, units, segments = zip(*map(memo.__getitem__, bodies))
     else:
-        # UCS-2: every character is one unit but capacity is much lower
-        units = chars
-        if units <= _UCS2_SINGLE:
-            segments = 1
-        else:
-            segments = -(-units // _UCS2_MULTI)
-        return SmsStats(encoding="ucs2", units=units, segments=segments, chars=chars)
+        flags = units = segments = ()
+    return SmsBatchStats(
+        encodings=array("B", flags),
+        units=array("I", units),
+        segments=array("I", segments),
+        distinct=len(memo),
+    )
 
 
 def is_gsm7(body: str) -> bool:
     """Return ``True`` when *body* can be encoded entirely in GSM-7."""
-    return all(ch in _GSM7_ALL for ch in body)
+    return _gsm7_escapes(body) is not None
+
+
+def make_transliteration_table(
+    overrides: Mapping[str, str] | None = None,
+) -> dict[int, str]:
+    """
+    Build a ``str.translate`` table from :data:`TRANSLITERATIONS`.
+
+    Parameters
+    ----------
+    overrides:
+        Extra or replacement mappings, character --> replacement text.
+
+    Examples
+    --------
+    >>> "x→y".translate(make_transliteration_table({"→": "->"}))
+    'x->y'
+    """
+    mapping = dict(TRANSLITERATIONS)
+    if overrides:
+        mapping.update(overrides)
+    return str.maketrans(mapping)
+
+
+_DEFAULT_TRANSLITERATION: dict[int, str] = make_transliteration_table()
+
+
+def transliterate_gsm7(
+    body: str, table: Mapping[int, str] | None = None
+) -> tuple[str, int]:
+    """
+    Replace Unicode lookalikes in *body* with GSM-7 equivalents.
+
+    The transliterated text is only used when it is entirely GSM-7 and
+    needs fewer segments than *body*; otherwise *body* is returned
+    unchanged (e.g. a body with an emoji stays UCS-2 anyway).  GSM-7
+    bodies are returned as-is after a single scan.
+
+    Parameters
+    ----------
+    body:
+        Message body.
+    table:
+        ``str.translate`` table from :func:`make_transliteration_table`;
+        defaults to :data:`TRANSLITERATIONS`.
+
+    Returns
+    -------
+    tuple[str, int]
+        ``(body to send, segments saved)``.
+
+    Examples
+    --------
+    >>> transliterate_gsm7("Don’t miss it – Friday… " + "x" * 60)
+    ("Don't miss it - Friday... xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx", 1)
+    >>> transliterate_gsm7("Don’t miss it!")
+    ('Don’t miss it!', 0)
+    >>> transliterate_gsm7("Hi 🌍 – see you")
+    ('Hi 🌍 – see you', 0)
+    """
+    if not body or _gsm7_escapes(body) is not None:
+        return body, 0
+    # Not GSM-7: a UCS-2 body is always at least one segment.
+    before = _measure(body)[2]
+    translated = body.translate(table if table is not None else _DEFAULT_TRANSLITERATION)
+    if not translated or _gsm7_escapes(translated) is None:
+        return body, 0
+    saved = before - _measure(translated)[2]
+    if saved <= 0:
+        return body, 0
+    return translated, saved
+
+
+def split_segments(body: str) -> list[str]:
+    """
+    Split *body* into the parts it is sent as.
+
+    A body that fits a single SMS is returned as one part.  Longer bodies
+    are packed greedily into parts of :data:`_GSM7_MULTI` GSM-7 units or
+    :data:`_UCS2_MULTI` UTF-16 code units; an extension character (2 units)
+    or an astral character such as an emoji (2 UTF-16 units) that does not
+    fit in the current part starts the next one.
+
+    Parameters
+    ----------
+    body:
+        Plain-text message body.
+
+    Returns
+    -------
+    list[str]
+        The parts, in order; ``"".join(parts) == body``.  Empty for an
+        empty body.
+
+    Examples
+    --------
+    >>> split_segments("Hello")
+    ['Hello']
+    >>> [len(part) for part in split_segments("a" * 161)]
+    [153, 8]
+    >>> [len(part) for part in split_segments("a" * 152 + "€" + "b" * 10)]
+    [152, 11]
+    >>> [len(part) for part in split_segments("é" * 66 + "🌍" + "ü" * 10)]
+    [66, 11]
+    """
+    if not body:
+        return []
+    escapes = _gsm7_escapes(body)
+    if escapes is not None:
+        if len(body) + escapes <= _GSM7_SINGLE:
+            return [body]
+        if not escapes:
+            return _slices(body, _GSM7_MULTI)
+        return _pack(body, _GSM7_MULTI, _GSM7_EXTENDED.__contains__)
+
+    # UCS-2 (UTF-16 on the wire): astral characters take a surrogate pair.
+    code_units = len(body.encode("utf-16-le")) // 2
+    if code_units <= _UCS2_SINGLE:
+        return [body]
+    if code_units == len(body):
+        return _slices(body, _UCS2_MULTI)
+    return _pack(body, _UCS2_MULTI, _is_astral)
+
+
+def straddles_boundary(body: str) -> bool:
+    """
+    Return ``True`` when *body* needs more parts than :func:`analyse` counts.
+
+    This happens when an ESC pair or surrogate pair would straddle a part
+    boundary and is pushed into the next part, or when astral characters
+    (counted once by :func:`analyse`) push a UCS-2 body past a capacity.
+
+    Examples
+    --------
+    >>> straddles_boundary("a" * 152 + "€" + "b" * 152)
+    True
+    >>> straddles_boundary("a" * 152 + "€")
+    False
+    """
+    return len(split_segments(body)) > analyse(body).segments
+
+
+def _slices(body: str, size: int) -> list[str]:
+    return [body[i : i + size] for i in range(0, len(body), size)]
+
+
+def _is_astral(ch: str) -> bool:
+    return ch > "\uffff"
+
+
+def _pack(body: str, capacity: int, is_double: Callable[[str], bool]) -> list[str]:
+    """Greedily pack *body* into parts of *capacity* units without splitting 2-unit chars."""
+    parts: list[str] = []
+    start = used = 0
+    for index, ch in enumerate(body):
+        cost = 2 if is_double(ch) else 1
+        if used + cost > capacity:
+            parts.append(body[start:index])
+            start, used = index, 0
+        used += cost
+    parts.append(body[start:])
+    return parts
+
+
+def _measure(body: str) -> tuple[int, int, int]:
+    """``(encoding flag, units, segments)`` of a non-empty *body*."""
+    chars = len(body)
+    escapes = _gsm7_escapes(body)
+
+    if escapes is not None:
+        # Extended chars count as 2 units each
+        units = chars + escapes
+        if units <= _GSM7_SINGLE:
+            return ENCODING_GSM7, units, 1
+        # Ceiling division
+        return ENCODING_GSM7, units, -(-units // _GSM7_MULTI)
+
+    # UCS-2: every character is one unit but capacity is much lower
+    if chars <= _UCS2_SINGLE:
+        return ENCODING_UCS2, chars, 1
+    return ENCODING_UCS2, chars, -(-chars // _UCS2_MULTI)
+
+
+def _gsm7_escapes(body: str) -> int | None:
+    """
+    Number of extension-table characters in *body*, or ``None`` if *body*
+    is not GSM-7 encodable.
+
+    Examples
+    --------
+    >>> _gsm7_escapes("Price: 5€ [promo]")
+    3
+    >>> _gsm7_escapes("naïve") is None
+    True
+    """
+    if body.isascii():
+        rest = body.encode("ascii").translate(None, _ASCII_BASIC)
+        if rest and rest.translate(None, _ASCII_EXTENDED):
+            return None
+        return len(rest)
+    rest_str = body.translate(_DELETE_BASIC)
+    if rest_str and not _GSM7_EXTENDED.issuperset(rest_str):
+        return None
+    return len(rest_str)
@@ -0,0 +1,10 @@
+# tests/__init__.py
+
+from . import test_africastalking_async
+from . import test_http_pool
+from . import test_phone_normalizer
+from . import test_rate_limiter
+from . import test_sms_at_campaign
+from . import test_sms_at_delivery_report
+from . import test_sms_encoding
+from . import test_sms_sms_dispatch
@@ -0,0 +1,108 @@
+# tests/test_africastalking_async.py
+
+"""
+tests/test_africastalking_async.py
+===================================
+
+Stale-connection retry of the asyncio client's connection pool, and
+``send_many`` outcomes.
+"""
+
+import asyncio
+
+from odoo.tests.common import BaseCase
+
+from odoo.addons.sms_africastalking_provider.services.africastalking_async import (
+    AsyncAfricasTalkingClient,
+    _AsyncConnectionPool,
+)
+from odoo.addons.sms_africastalking_provider.services.africastalking_client import (
+    ATError,
+)
+from odoo.addons.sms_africastalking_provider.services.http_pool import (
+    RequestOutcomeUnknown,
+)
+
+
+async def _exchange_twice(script):
+    """
+    Send two requests through one pool to a server answering the n-th
+    request as ``script(n)`` says (``"ok"``, ``"close"`` or ``"truncate"``).
+
+    Returns ``(second outcome, requests seen, connections seen)``.
+    """
+    seen = {"requests": 0, "connections": 0}
+
+    async def handle(reader, writer):
+        seen["connections"] += 1
+        while await reader.readline():
+            length = 0
+            while (line := await reader.readline()) not in (b"\r\n", b""):
+                name, _, value = line.partition(b":")
+                if name.strip().lower() == b"content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+            seen["requests"] += 1
+            action = script(seen["requests"])
+            if action == "close":
+                break
+            size = 10 if action == "truncate" else 2
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\nok" % size)
+            await writer.drain()
+            if action == "truncate":
+                break
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    url = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}/"
+    pool = _AsyncConnectionPool()
+    try:
+        await pool.request("POST", url, body=b"x", headers={})
+        try:
+            outcome = await pool.request("POST", url, body=b"x", headers={})
+        except Exception as exc:  # noqa: BLE001 - returned for assertions
+            outcome = exc
+    finally:
+        await pool.close()
+        server.close()
+    return outcome, seen["requests"], seen["connections"]
+
+
+class TestAsyncConnectionPool(BaseCase):
+
+    def test_reused_connection_closed_before_answer_is_retried(self):
+        outcome, requests, connections = asyncio.run(
+            _exchange_twice(lambda n: "close" if n == 2 else "ok")
+        )
+        self.assertEqual(outcome, (200, b"ok"))
+        self.assertEqual((requests, connections), (3, 2))
+
+    def test_failure_after_response_started_is_not_replayed(self):
+        outcome, requests, _connections = asyncio.run(
+            _exchange_twice(lambda n: "truncate" if n == 2 else "ok")
+        )
+        self.assertIsInstance(outcome, RequestOutcomeUnknown)
+        self.assertEqual(requests, 2)
+
+
+class TestSendMany(BaseCase):
+
+    def test_one_failing_batch_keeps_the_others(self):
+        client = AsyncAfricasTalkingClient("sandbox", "key")
+
+        async def send(to, message):
+            if message == "boom":
+                raise KeyError(message)
+            await asyncio.sleep(0)
+            return to
+
+        client.send = send
+        outcomes = asyncio.run(
+            client.send_many(
+                [(["+1"], "a"), (["+2"], "boom"), (["+3"], "c")], max_in_flight=2
+            )
+        )
+        self.assertEqual(outcomes[0], ["+1"])
+        self.assertIsInstance(outcomes[1], ATError)
+        self.assertFalse(outcomes[1].retryable)
+        self.assertEqual(outcomes[2], ["+3"])
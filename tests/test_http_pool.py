@@ -0,0 +1,138 @@
+# tests/test_http_pool.py
+
+"""
+tests/test_http_pool.py
+========================
+
+``ConnectionPool`` reuse and stale-connection retry, against a scripted
+local HTTP server.
+"""
+
+import http.client
+import os
+import socketserver
+import threading
+from unittest.mock import patch
+
+from odoo.tests.common import BaseCase
+
+from odoo.addons.sms_africastalking_provider.services.africastalking_client import (
+    AfricasTalkingClient,
+    ATError,
+)
+from odoo.addons.sms_africastalking_provider.services.http_pool import (
+    ConnectionPool,
+    RequestOutcomeUnknown,
+    _proxy_for,
+)
+
+_OK = b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok"
+# Announces 10 body bytes but sends 2 before closing.
+_TRUNCATED = b"HTTP/1.1 200 OK\r\nContent-Length: 10\r\n\r\nok"
+
+
+class _ScriptedServer(socketserver.ThreadingTCPServer):
+    """
+    Keep-alive HTTP server answering the n-th request (1-based) as
+    ``script(n)`` says: ``"ok"``, ``"close"`` (drop the connection without
+    answering) or ``"truncate"`` (drop it half-way through the body).
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, script):
+        self.script = script
+        self.requests = 0
+        self.connections = 0
+        self.lock = threading.Lock()
+        super().__init__(("127.0.0.1", 0), _ScriptedHandler)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/version1/messaging"
+
+
+class _ScriptedHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        while self.rfile.readline():
+            length = 0
+            while (line := self.rfile.readline()) not in (b"\r\n", b""):
+                name, _, value = line.partition(b":")
+                if name.strip().lower() == b"content-length":
+                    length = int(value)
+            self.rfile.read(length)
+            with server.lock:
+                server.requests += 1
+                action = server.script(server.requests)
+            if action == "close":
+                return
+            self.wfile.write(_TRUNCATED if action == "truncate" else _OK)
+            self.wfile.flush()
+            if action == "truncate":
+                return
+
+
+class TestConnectionPool(BaseCase):
+
+    def _serve(self, script):
+        server = _ScriptedServer(script)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        pool = ConnectionPool()
+        self.addCleanup(pool.clear)
+        return server, pool
+
+    def test_connection_reused(self):
+        server, pool = self._serve(lambda n: "ok")
+        for _i in range(3):
+            resp = pool.request("POST", server.url, body=b"x", timeout=5)
+            self.assertEqual((resp.status, resp.body), (200, b"ok"))
+        self.assertEqual(server.connections, 1)
+
+    def test_reused_connection_closed_before_answer_is_retried(self):
+        server, pool = self._serve(lambda n: "close" if n == 2 else "ok")
+        pool.request("POST", server.url, body=b"x", timeout=5)
+        resp = pool.request("POST", server.url, body=b"x", timeout=5)
+        self.assertEqual(resp.body, b"ok")
+        self.assertEqual(server.connections, 2)
+
+    def test_fresh_connection_closed_before_answer_is_not_retried(self):
+        server, pool = self._serve(lambda n: "close")
+        with self.assertRaises(http.client.RemoteDisconnected):
+            pool.request("POST", server.url, body=b"x", timeout=5)
+        self.assertEqual(server.requests, 1)
+
+    def test_failure_after_response_started_is_not_replayed(self):
+        server, pool = self._serve(lambda n: "truncate" if n == 2 else "ok")
+        pool.request("POST", server.url, body=b"x", timeout=5)
+        with self.assertRaises(RequestOutcomeUnknown):
+            pool.request("POST", server.url, body=b"x", timeout=5)
+        self.assertEqual(server.requests, 2)
+
+    def test_client_reports_unknown_outcome_as_not_retryable(self):
+        server, pool = self._serve(lambda n: "truncate")
+        client = AfricasTalkingClient(
+            "sandbox",
+            "key",
+            base_url=server.url.removesuffix("/version1/messaging"),
+            pool=pool,
+        )
+        with self.assertRaises(ATError) as caught:
+            client.send(["+254712345678"], "Hello")
+        self.assertFalse(caught.exception.retryable)
+        self.assertEqual(server.requests, 1)
+
+    def test_proxy_from_environment(self):
+        env = {"https_proxy": "proxy.example:3128", "no_proxy": "localhost"}
+        with patch.dict(os.environ, env, clear=True):
+            self.assertEqual(
+                _proxy_for("https", "api.africastalking.com"),
+                "http://proxy.example:3128",
+            )
+            self.assertIsNone(_proxy_for("https", "localhost"))
+            self.assertIsNone(_proxy_for("http", "api.africastalking.com"))
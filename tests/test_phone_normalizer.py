@@ -0,0 +1,47 @@
+# tests/test_phone_normalizer.py
+
+"""
+tests/test_phone_normalizer.py
+===============================
+
+Bulk normalisation with ``normalize_many``.
+"""
+
+from odoo.tests.common import BaseCase
+
+from odoo.addons.sms_africastalking_provider.services.phone_normalizer import (
+    PhoneError,
+    normalize_many,
+)
+
+
+class TestNormalizeMany(BaseCase):
+
+    def test_results_are_aligned_with_input(self):
+        numbers, errors = normalize_many(
+            ["+254 712-345 678", "254712345678", "0712345678", None, "abc", "+12"]
+        )
+        self.assertEqual(numbers, ["+254712345678", "+254712345678", "", "", "", ""])
+        self.assertEqual(
+            [PhoneError(error) for error in errors],
+            [
+                PhoneError.OK,
+                PhoneError.OK,
+                PhoneError.LOCAL_FORMAT,
+                PhoneError.EMPTY,
+                PhoneError.NO_DIGITS,
+                PhoneError.INVALID,
+            ],
+        )
+
+    def test_default_country_expands_national_numbers(self):
+        numbers, errors = normalize_many(
+            ["0712345678", "071234567", "+256712345678"], default_country="254"
+        )
+        self.assertEqual(numbers, ["+254712345678", "", "+256712345678"])
+        self.assertEqual(list(errors), [PhoneError.OK, PhoneError.INVALID, PhoneError.OK])
+
+    def test_repeated_numbers(self):
+        numbers, errors = normalize_many(["0712345678"] * 3, default_country="254")
+        self.assertEqual(numbers, ["+254712345678"] * 3)
+        self.assertEqual(list(errors), [PhoneError.OK] * 3)
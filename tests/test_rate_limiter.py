@@ -0,0 +1,71 @@
+# tests/test_rate_limiter.py
+
+"""
+tests/test_rate_limiter.py
+===========================
+
+``TokenBucket`` and ``DispatchRateLimiter`` arithmetic, on a fake clock.
+"""
+
+from odoo.tests.common import BaseCase
+
+from odoo.addons.sms_africastalking_provider.services.rate_limiter import (
+    DispatchRateLimiter,
+    TokenBucket,
+)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTokenBucket(BaseCase):
+
+    def test_burst_then_wait(self):
+        clock = _Clock()
+        bucket = TokenBucket(10, capacity=10, clock=clock)
+        self.assertEqual(bucket.reserve(10), 0.0)
+        # 5 tokens in debt at 10 tokens/s.
+        self.assertAlmostEqual(bucket.reserve(5), 0.5)
+
+    def test_refill_is_capped_at_capacity(self):
+        clock = _Clock()
+        bucket = TokenBucket(10, capacity=10, clock=clock)
+        bucket.reserve(10)
+        clock.now = 60.0
+        self.assertEqual(bucket.reserve(10), 0.0)
+        self.assertAlmostEqual(bucket.reserve(1), 0.1)
+
+    def test_zero_rate_disables_limiting(self):
+        bucket = TokenBucket(0)
+        self.assertEqual(bucket.reserve(1_000_000), 0.0)
+
+
+class TestDispatchRateLimiter(BaseCase):
+
+    def test_coordinator_receives_both_buckets(self):
+        calls = []
+
+        def coordinator(key, amount, rate, capacity):
+            calls.append((key, amount, rate, capacity))
+            return 0.25 if key.endswith(":requests") else 0.0
+
+        limiter = DispatchRateLimiter(500, 5, coordinator=coordinator, key="sms_at:u")
+        self.assertEqual(limiter.reserve(200), 0.25)
+        self.assertEqual(
+            calls,
+            [
+                ("sms_at:u:recipients", 200, 500.0, 1_000.0),
+                ("sms_at:u:requests", 1, 5.0, 5.0),
+            ],
+        )
+
+    def test_in_process_wait_is_the_larger_of_both_limits(self):
+        limiter = DispatchRateLimiter(1_000, 1)
+        self.assertEqual(limiter.reserve(1_000), 0.0)
+        # Second call: the request bucket (1/s) is the binding limit.
+        self.assertGreater(limiter.reserve(1), 0.9)
@@ -0,0 +1,91 @@
+# tests/test_sms_at_campaign.py
+
+"""
+tests/test_sms_at_campaign.py
+==============================
+
+``sms.at.campaign`` state transitions.
+"""
+
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged("post_install", "-at_install")
+class TestSmsAtCampaign(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.mailing_list = cls.env["mailing.list"].create({"name": "AT campaign list"})
+        cls.template = cls.env["sms.at.template"].create(
+            {
+                "name": "AT campaign template",
+                "body": "Hello",
+                "mailing_list_ids": [(6, 0, cls.mailing_list.ids)],
+            }
+        )
+
+    def _create_campaign(self):
+        return self.env["sms.at.campaign"].create(
+            {
+                "name": "AT campaign",
+                "template_id": self.template.id,
+                "body": self.template.body,
+                "mailing_list_ids": [(6, 0, self.mailing_list.ids)],
+                "state": "running",
+            }
+        )
+
+    def test_cancel_marks_pending_messages_canceled(self):
+        campaign = self._create_campaign()
+        sms = self.env["sms.sms"].create(
+            [
+                {
+                    "number": "+254712345678",
+                    "body": "Hello",
+                    "state": state,
+                    "at_campaign_id": campaign.id,
+                }
+                for state in ("outgoing", "queued", "sent")
+            ]
+        )
+
+        campaign.action_cancel()
+
+        self.assertEqual(campaign.state, "cancel")
+        self.assertEqual(sms.mapped("state"), ["canceled", "canceled", "sent"])
+
+    def test_contacts_paged_on_normalised_mobile(self):
+        self.env["mailing.contact"].create(
+            [
+                {"name": name, "mobile": mobile, "list_ids": [(6, 0, self.mailing_list.ids)]}
+                for name, mobile in (
+                    ("Amina", "+254 712 345 678"),
+                    ("Amina (copy)", "254712345678"),
+                    ("Baraka", "+254712345679"),
+                    ("Chege", "+254712345680"),
+                    ("Dudu", "12345"),
+                    ("Dudu (copy)", " 12345 "),
+                )
+            ]
+        )
+        campaign = self._create_campaign()
+
+        first = campaign._fetch_contact_batch(2)
+        self.assertEqual([row[4] for row in first], ["+254712345678", "+254712345679"])
+        self.assertEqual(first[0][1], "Amina")
+        campaign.mobile_cursor = first[-1][4]
+        self.assertEqual(
+            [row[4] for row in campaign._fetch_contact_batch(2)], ["+254712345680"]
+        )
+
+        campaign.mobile_cursor = False
+        while campaign._render_next_batch(limit=2):
+            pass
+
+        self.assertEqual(campaign.rendered_count, 4)
+        self.assertEqual(
+            sorted(campaign.sms_ids.mapped("number")),
+            ["+254712345678", "+254712345679", "+254712345680", "12345"],
+        )
+        self.assertEqual(campaign.mobile_cursor, "+254712345680")
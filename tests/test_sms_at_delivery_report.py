@@ -0,0 +1,63 @@
+# tests/test_sms_at_delivery_report.py
+
+"""
+tests/test_sms_at_delivery_report.py
+=====================================
+
+Batched application of staged delivery-report callbacks.
+"""
+
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged("post_install", "-at_install")
+class TestSmsAtDeliveryReport(TransactionCase):
+
+    def setUp(self):
+        super().setUp()
+        self.Report = self.env["sms.at.delivery.report"]
+        self.sms = self.env["sms.sms"].create(
+            [
+                {
+                    "number": f"+2547123456{index:02d}",
+                    "body": "Hello",
+                    "state": "sent",
+                    "at_message_id": f"ATXid_{index}",
+                }
+                for index in range(3)
+            ]
+        )
+
+    def test_latest_report_per_message_wins(self):
+        self.Report._stage("ATXid_0", "Buffered", "", "+254712345600")
+        self.Report._stage("ATXid_0", "Delivered", "", "+254712345600")
+        self.Report._stage("ATXid_1", "Failed", "", "+254712345601")
+        self.Report._stage("ATXid_2", "Rejected", "DeliveryFailure", "+254712345602")
+        self.Report._stage("ATXid_unknown", "Delivered", "", "+254712345699")
+
+        consumed, updated = self.Report._apply_batch()
+
+        self.assertEqual((consumed, updated), (5, 3))
+        self.assertFalse(self.Report.search_count([]))
+        first, second, third = self.sms
+        self.assertEqual((first.state, first.delivery_status), ("sent", "Delivered"))
+        self.assertFalse(first.at_failure_reason)
+        self.assertEqual((second.state, second.at_failure_reason), ("error", "Failed"))
+        self.assertEqual(second.failure_type, "sms_server")
+        self.assertEqual(third.at_failure_reason, "DeliveryFailure")
+
+    def test_unknown_status_keeps_state(self):
+        self.Report._stage("ATXid_0", "SomethingNew", "", "+254712345600")
+
+        self.Report._apply_batch()
+
+        self.assertEqual(self.sms[0].state, "sent")
+        self.assertEqual(self.sms[0].delivery_status, "SomethingNew")
+
+    def test_batch_limit(self):
+        for index in range(3):
+            self.Report._stage(f"ATXid_{index}", "Delivered", "", "")
+
+        self.assertEqual(self.Report._apply_batch(limit=2), (2, 2))
+        self.assertEqual(self.Report._apply_batch(limit=2), (1, 1))
+        self.assertEqual(self.sms.mapped("delivery_status"), ["Delivered"] * 3)
@@ -0,0 +1,42 @@
+# tests/test_sms_encoding.py
+
+"""
+tests/test_sms_encoding.py
+===========================
+
+``split_segments`` part boundaries.
+"""
+
+from odoo.tests.common import BaseCase
+
+from odoo.addons.sms_africastalking_provider.services.sms_encoding import (
+    analyse,
+    split_segments,
+)
+
+
+class TestSplitSegments(BaseCase):
+
+    def assertParts(self, body, lengths):
+        parts = split_segments(body)
+        self.assertEqual("".join(parts), body)
+        self.assertEqual([len(part) for part in parts], lengths)
+
+    def test_single_part(self):
+        self.assertEqual(split_segments(""), [])
+        self.assertParts("a" * 160, [160])
+        self.assertParts("ж" * 70, [70])
+
+    def test_gsm7_multipart(self):
+        self.assertParts("a" * 161, [153, 8])
+        self.assertEqual(len(split_segments("a" * 161)), analyse("a" * 161).segments)
+
+    def test_escape_pair_is_never_split(self):
+        # "€" costs 2 GSM-7 units and would straddle the 153-unit boundary.
+        self.assertParts("a" * 152 + "€" + "b" * 10, [152, 11])
+
+    def test_ucs2_multipart(self):
+        self.assertParts("ж" * 71, [67, 4])
+
+    def test_surrogate_pair_is_never_split(self):
+        self.assertParts("é" * 66 + "🌍" + "ü" * 10, [66, 11])
@@ -0,0 +1,164 @@
+# tests/test_sms_sms_dispatch.py
+
+"""
+tests/test_sms_sms_dispatch.py
+===============================
+
+Queue claim, retry scheduling and result write-back of ``sms.sms``.
+"""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from odoo import fields
+from odoo.tests import TransactionCase, tagged
+from odoo.tools import SQL, mute_logger
+
+from odoo.addons.sms_africastalking_provider.services.africastalking_client import (
+    ATError,
+    ATRecipientResult,
+)
+
+
+class _FakeClient:
+    """Accepts every number, or raises *error* on every call."""
+
+    def __init__(self, error=None):
+        self.error = error
+
+    def send(self, to, message):
+        if self.error is not None:
+            raise self.error
+        return [
+            ATRecipientResult(number, "Success", f"ATXid_{number}", 101, "KES 0.8000")
+            for number in to
+        ]
+
+
+@tagged("post_install", "-at_install")
+class TestSmsDispatch(TransactionCase):
+
+    def _create_sms(self, count=1, body="Hello", **vals):
+        return self.env["sms.sms"].create(
+            [
+                {
+                    "number": f"+2547123456{index:02d}",
+                    "body": body,
+                    "state": "queued",
+                    **vals,
+                }
+                for index in range(count)
+            ]
+        )
+
+    # ------------------------------------------------------------------
+    #  Claim
+    # ------------------------------------------------------------------
+
+    def test_claim_takes_only_due_records(self):
+        due = self._create_sms(2)
+        later = self._create_sms(
+            at_next_attempt=fields.Datetime.now() + timedelta(hours=1)
+        )
+        outgoing = self._create_sms(state="outgoing")
+        template = self.env["sms.at.template"].create({"name": "T", "body": "Hello"})
+        paused = self.env["sms.at.campaign"].create(
+            {"name": "C", "template_id": template.id, "body": "Hello", "state": "paused"}
+        )
+        held = self._create_sms(at_campaign_id=paused.id)
+
+        claimed = self.env["sms.sms"]._at_claim_queued(100)
+
+        self.assertEqual(claimed & (due | later | outgoing | held), due)
+        self.assertEqual(set(due.mapped("state")), {"dispatching"})
+        self.assertEqual((later | held).mapped("state"), ["queued", "queued"])
+        self.assertEqual(outgoing.state, "outgoing")
+        self.assertFalse(self.env["sms.sms"]._at_claim_queued(100) & due)
+
+    # ------------------------------------------------------------------
+    #  Retry scheduling
+    # ------------------------------------------------------------------
+
+    def test_schedule_retry_requeues_with_backoff(self):
+        sms = self._create_sms(state="dispatching")
+        now = fields.Datetime.now()
+        exhausted = sms._at_schedule_retry("HTTP 503", max_attempts=3)
+
+        self.assertFalse(exhausted)
+        self.assertEqual(sms.state, "queued")
+        self.assertEqual(sms.at_retry_count, 1)
+        self.assertGreaterEqual(sms.at_next_attempt, now)
+        self.assertEqual(sms.at_failure_reason, "HTTP 503")
+
+    def test_schedule_retry_returns_exhausted_records(self):
+        sms = self._create_sms(state="dispatching", at_retry_count=2)
+        exhausted = sms._at_schedule_retry("HTTP 503", max_attempts=3)
+
+        self.assertEqual(exhausted, sms)
+        self.assertEqual(sms.state, "dispatching")
+        self.assertEqual(sms.at_retry_count, 2)
+
+    # ------------------------------------------------------------------
+    #  Dispatch and result write-back
+    # ------------------------------------------------------------------
+
+    def _process(self, client):
+        return self.env["sms.sms"]._at_process_queue_batch(
+            client, {"sandbox": True, "retry_max_attempts": 3}
+        )
+
+    def test_dispatch_success(self):
+        sms = self._create_sms(2)
+        self._process(_FakeClient())
+
+        self.assertEqual(sms.mapped("state"), ["sent", "sent"])
+        self.assertEqual(
+            sms.mapped("at_message_id"),
+            [f"ATXid_{number}" for number in sms.mapped("at_number_e164")],
+        )
+
+    def test_retryable_error_requeues(self):
+        sms = self._create_sms()
+        self._process(_FakeClient(ATError("HTTP 503", http_status=503, retryable=True)))
+
+        self.assertEqual(sms.state, "queued")
+        self.assertEqual(sms.at_retry_count, 1)
+        self.assertTrue(sms.at_next_attempt)
+
+    def test_retryable_error_gives_up_after_max_attempts(self):
+        sms = self._create_sms(at_retry_count=2)
+        self._process(_FakeClient(ATError("HTTP 503", http_status=503, retryable=True)))
+
+        self.assertEqual(sms.state, "error")
+        self.assertEqual(sms.failure_type, "sms_server")
+
+    def test_non_retryable_error_fails(self):
+        sms = self._create_sms()
+        self._process(_FakeClient(ATError("Outcome unknown", retryable=False)))
+
+        self.assertEqual(sms.state, "error")
+        self.assertEqual(sms.at_retry_count, 0)
+
+    def test_failed_result_write_keeps_other_chunks(self):
+        first = self._create_sms(body="First")
+        second = self._create_sms(body="Second")
+        SmsSms = type(self.env["sms.sms"])
+        write_message_ids = SmsSms._at_write_message_ids
+
+        def failing_write(records, pairs):
+            if pairs and pairs[0][0] in first.ids:
+                records.env.cr.execute(SQL("SELECT 1 / 0"))
+            return write_message_ids(records, pairs)
+
+        with (
+            patch.object(SmsSms, "_at_write_message_ids", failing_write),
+            mute_logger("odoo.sql_db", "odoo.addons.sms_africastalking_provider.models.sms_sms"),
+        ):
+            self._process(_FakeClient())
+
+        # The chunk AT accepted stays sent; the other is failed by the
+        # safety net instead of being rolled back to 'queued' and re-sent.
+        self.assertEqual(second.state, "sent")
+        self.assertTrue(second.at_message_id)
+        self.assertEqual(first.state, "error")
+        self.assertEqual(first.failure_type, "sms_server")